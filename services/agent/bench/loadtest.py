@@ -0,0 +1,346 @@
+"""
+SSE load generator for the agent stream endpoint.
+
+Opens N concurrent POST /api/v1/chat/{nonce}/stream sessions, parses the SSE
+stream and records time-to-first-chunk, inter-chunk gaps, total turn time and
+outcome (end / error / stopped / HTTP 409 / other HTTP / exception). Prints
+a percentile report and writes a JSON artifact that can be compared against
+a previous run.
+
+Usage (from services/agent):
+    # Against a running stand-in (python -m bench.standin) or real agent
+    uv run python -m bench.loadtest --url http://127.0.0.1:8011 -c 50 -n 500
+
+    # Spawn the stand-in automatically and compare with a baseline artifact
+    uv run python -m bench.loadtest --spawn-standin -c 50 -n 500 \\
+        --output bench-results/head.json --compare bench-results/base.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+DEFAULT_MESSAGE = "치킨집 창업할 때 상권 분석은 어떻게 해야 하나요?"
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class TurnResult:
+    """Measurements of a single streamed turn."""
+
+    outcome: str
+    status_code: int | None = None
+    ttft: float | None = None
+    total: float = 0.0
+    chunks: int = 0
+    gaps: list[float] = field(default_factory=list)
+
+
+# =============================================================================
+# SSE client
+# =============================================================================
+
+
+async def run_turn(client: httpx.AsyncClient, nonce: str, message: str) -> TurnResult:
+    """Send one message and consume its SSE stream."""
+    started = time.perf_counter()
+    result = TurnResult(outcome="exception")
+    last_chunk_at = None
+
+    try:
+        async with client.stream(
+            "POST",
+            f"/api/v1/chat/{nonce}/stream",
+            json={"content": message},
+        ) as response:
+            result.status_code = response.status_code
+            if response.status_code == 409:
+                result.outcome = "http_409"
+                return result
+            if response.status_code != 200:
+                result.outcome = f"http_{response.status_code}"
+                return result
+
+            event_name = None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event_name = line[6:].strip()
+                    continue
+                if line or event_name is None:
+                    continue
+
+                # Blank line terminates an event
+                now = time.perf_counter()
+                if event_name == "chunk":
+                    if result.ttft is None:
+                        result.ttft = now - started
+                    else:
+                        result.gaps.append(now - last_chunk_at)
+                    last_chunk_at = now
+                    result.chunks += 1
+                elif event_name in ("end", "error", "stopped"):
+                    result.outcome = event_name
+                event_name = None
+    except httpx.HTTPError:
+        result.outcome = "exception"
+    finally:
+        result.total = time.perf_counter() - started
+
+    return result
+
+
+async def run_load(
+    url: str,
+    concurrency: int,
+    requests: int,
+    message: str,
+    shared_sessions: int,
+    timeout: float,
+) -> tuple[list[TurnResult], float]:
+    """
+    Run `requests` turns with at most `concurrency` in flight.
+
+    Args:
+        shared_sessions: When > 0, pick nonces from a pool of this size so
+            concurrent turns can collide on the generation guard (409s)
+
+    Returns:
+        Tuple of (results, wall-clock seconds)
+    """
+    session_pool = [str(uuid.uuid4()) for _ in range(shared_sessions)]
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=url, timeout=httpx.Timeout(timeout), limits=limits
+    ) as client:
+
+        async def worker() -> TurnResult:
+            async with semaphore:
+                nonce = random.choice(session_pool) if session_pool else str(uuid.uuid4())
+                return await run_turn(client, nonce, message)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(worker() for _ in range(requests)))
+        return list(results), time.perf_counter() - started
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def distribution(values: list[float]) -> dict:
+    """Summary statistics for a latency sample (seconds)."""
+    summary = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    summary["max"] = max(values) if values else None
+    summary["mean"] = sum(values) / len(values) if values else None
+    summary["count"] = len(values)
+    return summary
+
+
+def summarize(results: list[TurnResult], wall_time: float) -> dict:
+    """Aggregate turn results into the report structure."""
+    outcomes: dict[str, int] = {}
+    for result in results:
+        outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+
+    total = len(results)
+    completed = [r for r in results if r.outcome == "end"]
+    return {
+        "requests": total,
+        "wall_time": wall_time,
+        "turns_per_second": len(completed) / wall_time if wall_time else 0,
+        "outcomes": outcomes,
+        "error_rate": (total - len(completed)) / total if total else 0,
+        "conflict_rate": outcomes.get("http_409", 0) / total if total else 0,
+        "ttft": distribution([r.ttft for r in completed if r.ttft is not None]),
+        "chunk_gap": distribution([gap for r in completed for gap in r.gaps]),
+        "total": distribution([r.total for r in completed]),
+    }
+
+
+def _ms(value: float | None) -> str:
+    return f"{value * 1000:9.1f}" if value is not None else "        -"
+
+
+def print_report(summary: dict) -> None:
+    """Print a human-readable percentile table."""
+    print(
+        f"\nrequests={summary['requests']} wall={summary['wall_time']:.1f}s "
+        f"turns/s={summary['turns_per_second']:.2f} "
+        f"errors={summary['error_rate']:.1%} 409s={summary['conflict_rate']:.1%}"
+    )
+    print(f"outcomes: {summary['outcomes']}")
+    header = "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    print(f"\n{'(ms)':<12}{header}{'max':>10}{'mean':>10}")
+    for name in ("ttft", "chunk_gap", "total"):
+        dist = summary[name]
+        cells = "".join(f" {_ms(dist[f'p{p}'])}" for p in PERCENTILES)
+        print(f"{name:<12}{cells} {_ms(dist['max'])} {_ms(dist['mean'])}")
+
+
+def print_comparison(summary: dict, baseline: dict) -> None:
+    """Print relative change of key percentiles against a baseline artifact."""
+    base = baseline["summary"]
+    print(f"\nvs baseline {baseline.get('commit', '?')} ({baseline.get('created_at', '?')}):")
+    for name in ("ttft", "chunk_gap", "total"):
+        for key in ("p50", "p95", "p99"):
+            old, new = base[name].get(key), summary[name].get(key)
+            if old and new:
+                print(
+                    f"  {name}.{key}: {_ms(old).strip()} → {_ms(new).strip()} ms "
+                    f"({(new - old) / old:+.1%})"
+                )
+    print(
+        f"  turns/s: {base['turns_per_second']:.2f} → {summary['turns_per_second']:.2f}"
+        f"  error_rate: {base['error_rate']:.1%} → {summary['error_rate']:.1%}"
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+
+async def _wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Agent at {url} did not become healthy")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    standin = None
+    url = args.url
+    if args.spawn_standin:
+        url = f"http://127.0.0.1:{args.standin_port}"
+        standin = subprocess.Popen(
+            [sys.executable, "-m", "bench.standin", "--port", str(args.standin_port)]
+            + args.standin_args
+        )
+
+    try:
+        await _wait_until_healthy(url)
+        if args.warmup:
+            await run_load(
+                url, min(args.concurrency, args.warmup), args.warmup, args.message, 0, args.timeout
+            )
+        results, wall_time = await run_load(
+            url,
+            args.concurrency,
+            args.requests,
+            args.message,
+            args.shared_sessions,
+            args.timeout,
+        )
+    finally:
+        if standin is not None:
+            standin.terminate()
+            standin.wait(timeout=10)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "params": {
+            "url": url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "shared_sessions": args.shared_sessions,
+            "standin": args.spawn_standin,
+            "standin_args": args.standin_args,
+        },
+        "summary": summarize(results, wall_time),
+        "turns": [asdict(r) for r in results] if args.include_turns else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE load test for the agent service")
+    parser.add_argument("--url", default="http://127.0.0.1:8001")
+    parser.add_argument("-c", "--concurrency", type=int, default=20)
+    parser.add_argument("-n", "--requests", type=int, default=100)
+    parser.add_argument("--message", default=DEFAULT_MESSAGE)
+    parser.add_argument(
+        "--shared-sessions",
+        type=int,
+        default=0,
+        help="Reuse nonces from a pool of this size (provokes 409s)",
+    )
+    parser.add_argument("--warmup", type=int, default=5, help="Warm-up turns (not recorded)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument(
+        "--spawn-standin",
+        action="store_true",
+        help="Start bench.standin in a subprocess and target it",
+    )
+    parser.add_argument("--standin-port", type=int, default=8011)
+    parser.add_argument(
+        "--standin-args",
+        nargs=argparse.REMAINDER,
+        default=[],
+        help="Remaining arguments are passed to bench.standin",
+    )
+    parser.add_argument("--output", help="Write the JSON artifact to this path")
+    parser.add_argument("--compare", help="Baseline JSON artifact to compare against")
+    parser.add_argument(
+        "--include-turns",
+        action="store_true",
+        help="Include per-turn measurements in the artifact",
+    )
+    args = parser.parse_args()
+
+    artifact = asyncio.run(main_async(args))
+    print_report(artifact["summary"])
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(artifact["summary"], json.load(f))
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(artifact, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Microbenchmarks for pure hot-path functions of the agent.
+
+Covers format_docs, reduce_docs, rewrite_citations, CitationRewriter, sse_event and
+sse_json_event with production-sized inputs (Korean post bodies of a few
+thousand characters, ~20 retrieved documents, ~1.5k character answers).
+
+Usage (from services/agent):
+    uv run python -m bench.microbench
+    uv run python -m bench.microbench --output bench-results/micro.json --compare base.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+from langchain_core.documents import Document
+
+from src.api.chat import sse_event, sse_json_event
+from src.graph.nodes import CitationRewriter, format_docs, rewrite_citations
+from src.graph.state import reduce_docs
+from src.schemas.chat import SSEChunkData
+
+BODY = "창업 초기에는 상권 분석과 메뉴 구성이 가장 중요합니다. " * 100
+
+
+def _documents(count: int) -> list[Document]:
+    return [
+        Document(
+            id=str(i),
+            page_content=BODY,
+            metadata={"source": f"https://cafe.naver.com/cjdckddus/{i}", "title": f"글 {i}"},
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def bench(fn: Callable[[], object], repeat: int, number: int) -> dict:
+    """
+    Time `fn` in `repeat` rounds of `number` calls each.
+
+    Returns:
+        Per-call statistics in microseconds
+    """
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter_ns() - started) / number / 1000)
+    return {
+        "min_us": min(rounds),
+        "median_us": statistics.median(rounds),
+        "max_us": max(rounds),
+        "calls": repeat * number,
+    }
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Benchmark cases keyed by name."""
+    docs_5 = _documents(5)
+    docs_20 = _documents(20)
+    existing = _documents(12)
+    answer = ("창플의 조언에 따르면 상권을 먼저 보세요 [1]. 메뉴는 단순하게 [2][3]. " * 25) + "[7]"
+    mapping = {i: f"https://cafe.naver.com/cjdckddus/{i}" for i in range(1, 6)}
+    answer_chunks = [answer[i : i + 7] for i in range(0, len(answer), 7)]
+    chunk = SSEChunkData(content="상권 분석은 ")
+
+    def stream_citations() -> str:
+        rewriter = CitationRewriter(mapping)
+        return "".join(rewriter.feed(c) for c in answer_chunks) + rewriter.flush()
+
+    return {
+        "format_docs[5]": lambda: format_docs(docs_5),
+        "format_docs[20]": lambda: format_docs(docs_20),
+        "reduce_docs[append 4 to 12]": lambda: reduce_docs(existing, docs_5[:4]),
+        "reduce_docs[replace]": lambda: reduce_docs(existing, {"documents": docs_5}),
+        "rewrite_citations[1.5k chars]": lambda: rewrite_citations(answer, mapping),
+        "CitationRewriter[1.5k, 7-char]": stream_citations,
+        "sse_event": lambda: sse_event("chunk", '{"content": "상권 분석은 "}', "42"),
+        "sse_json_event[model]": lambda: sse_json_event("chunk", chunk, "42"),
+        "sse_json_event[dict]": lambda: sse_json_event("status", {"message": "분석 중"}, "42"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agent hot-path microbenchmarks")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--filter", default="", help="Only run cases containing this text")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous JSON results to compare medians against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    print(f"{'case':<32}{'min µs':>10}{'median µs':>12}{'max µs':>10}")
+    for name, fn in cases().items():
+        if args.filter and args.filter not in name:
+            continue
+        stats = bench(fn, args.repeat, args.number)
+        results[name] = stats
+        line = f"{name:<32}{stats['min_us']:>10.2f}{stats['median_us']:>12.2f}{stats['max_us']:>10.2f}"
+        if name in baseline:
+            old = baseline[name]["median_us"]
+            line += f"  ({(stats['median_us'] - old) / old:+.1%} vs baseline)"
+        print(line)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
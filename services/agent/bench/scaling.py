@@ -0,0 +1,145 @@
+"""
+Streams-per-core scaling of the multi-worker server mode.
+
+Starts the stand-in agent with 1, 2, 4, ... workers (up to the CPU count),
+drives each with the same SSE load and reports completed turns/s, streamed
+chunks/s and per-worker efficiency relative to the single-worker run. The
+default cpu-bound profile keeps provider latency near zero so the server's
+own work (SSE encoding, graph bookkeeping) is what saturates the cores.
+
+Admission limits are raised for the stand-in so that they do not cap the
+offered load.
+
+Usage (from services/agent):
+    uv run python -m bench.scaling --workers 1 2 4 8 -c 200 -n 2000 \\
+        --output bench-results/scaling.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench.loadtest import DEFAULT_MESSAGE, _git_commit, _wait_until_healthy, run_load, summarize
+
+CPU_PROFILE = Path(__file__).parent / "profiles" / "cpu-bound.json"
+
+
+async def measure(args: argparse.Namespace, workers: int) -> dict:
+    """Run the load against a stand-in with `workers` processes."""
+    env = {
+        **os.environ,
+        "ADMISSION_MAX_INFLIGHT": str(args.concurrency),
+        "ADMISSION_MAX_QUEUE": str(args.concurrency),
+    }
+    standin = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "bench.standin",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(workers),
+            "--profile",
+            args.profile,
+            "--retrieval-ms",
+            "5",
+            "--core-ms",
+            "1",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        await _wait_until_healthy(url)
+        await run_load(url, args.concurrency, args.warmup, DEFAULT_MESSAGE, 0, args.timeout)
+        results, wall_time = await run_load(
+            url, args.concurrency, args.requests, DEFAULT_MESSAGE, 0, args.timeout
+        )
+    finally:
+        standin.terminate()
+        standin.wait(timeout=30)
+
+    summary = summarize(results, wall_time)
+    chunks = sum(r.chunks for r in results if r.outcome == "end")
+    summary["chunks_per_second"] = chunks / wall_time if wall_time else 0
+    return summary
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    cpus = os.cpu_count() or 1
+    runs = {}
+    for workers in args.workers:
+        if workers > cpus:
+            print(f"skipping {workers} workers ({cpus} CPUs)")
+            continue
+        print(f"running {workers} worker(s)...")
+        runs[workers] = await measure(args, workers)
+
+    base = runs.get(min(runs)) if runs else None
+    for workers, summary in runs.items():
+        per_worker = summary["turns_per_second"] / workers
+        summary["turns_per_second_per_worker"] = per_worker
+        summary["efficiency"] = (
+            per_worker / base["turns_per_second"] if base and base["turns_per_second"] else None
+        )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "cpus": cpus,
+        "params": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "profile": args.profile,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(artifact: dict) -> None:
+    print(f"\n{artifact['cpus']} CPUs, concurrency={artifact['params']['concurrency']}")
+    print(
+        f"{'workers':>8}{'turns/s':>10}{'chunks/s':>11}{'per worker':>12}"
+        f"{'eff.':>8}{'p95 ms':>9}"
+    )
+    for workers, run in artifact["runs"].items():
+        p95 = run["total"]["p95"]
+        efficiency = run["efficiency"]
+        print(
+            f"{workers:>8}{run['turns_per_second']:>10.1f}{run['chunks_per_second']:>11.0f}"
+            f"{run['turns_per_second_per_worker']:>12.1f}"
+            f"{efficiency if efficiency is not None else 0:>8.0%}"
+            f"{p95 * 1000 if p95 else 0:>9.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agent multi-worker scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("-c", "--concurrency", type=int, default=200)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--profile", default=str(CPU_PROFILE), help="Latency profile JSON")
+    parser.add_argument("--output", help="Write the JSON artifact to this path")
+    args = parser.parse_args()
+
+    artifact = asyncio.run(main_async(args))
+    print_report(artifact)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(artifact, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
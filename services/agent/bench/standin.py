@@ -0,0 +1,292 @@
+"""
+Agent service wired to local stand-in backends.
+
+Runs the real FastAPI routes and LangGraph graph, but replaces every external
+dependency so load tests need no network or credentials:
+
+- Gemini chat models → src.providers.fake.FakeChatModel (LLM_PROVIDER=fake)
+  driven by a latency profile (bench/profiles/*.json)
+- Pinecone retriever → StandInRetriever (fixed latency, deterministic ids)
+- Core REST API → an in-process ASGI app served through httpx.ASGITransport
+- Redis → InMemoryRedis
+- Postgres checkpointer → langgraph's in-memory saver
+
+Usage (from services/agent):
+    uv run python -m bench.standin --port 8011 --profile bench/profiles/gemini-flash.json
+    uv run python -m bench.standin --workers 4   # one stand-in app per worker process
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.providers.fake import FILLER
+
+POST_ID_POOL = 500
+DEFAULT_PROFILE = Path(__file__).parent / "profiles" / "gemini-flash.json"
+OPTIONS_ENV = "BENCH_STANDIN_OPTIONS"
+
+
+@dataclass
+class StandInOptions:
+    """Stand-in configuration (delays in seconds)."""
+
+    profile: str = str(DEFAULT_PROFILE)
+    retrieval_delay: float = 0.15
+    core_delay: float = 0.01
+    docs_per_query: int = 4
+
+
+# =============================================================================
+# In-memory Redis
+# =============================================================================
+
+
+class InMemoryRedis:
+    """Subset of redis.asyncio.Redis used by the agent, kept in a dict."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[str, float | None]] = {}
+
+    def _live(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> str | None:
+        return self._live(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self._data[key] = (str(value), time.monotonic() + ex if ex else None)
+        return True
+
+    async def setex(self, key: str, ttl: int, value: Any) -> bool:
+        return await self.set(key, value, ex=ttl)
+
+    async def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._data[key] = (str(value), None)
+        return value
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        self._data.clear()
+
+
+# =============================================================================
+# Retriever
+# =============================================================================
+
+
+class StandInRetriever(BaseRetriever):
+    """Retriever returning deterministic post ids after a fixed delay."""
+
+    delay: float = 0.15
+    k: int = 4
+
+    def _documents(self, query: str) -> list[Document]:
+        seed = int(hashlib.md5(query.encode("utf-8")).hexdigest(), 16)
+        rng = random.Random(seed)
+        post_ids = rng.sample(range(1, POST_ID_POOL + 1), self.k)
+        top_score = rng.uniform(0.4, 0.75)
+        return [
+            Document(
+                id=str(post_id),
+                page_content=FILLER * 4,
+                metadata={
+                    "title": f"글 {post_id}",
+                    "summary": FILLER * 2,
+                    "keywords": ["상권 분석", "메뉴 구성", f"브랜드{post_id % 20}"],
+                    "score": round(top_score - 0.04 * rank, 4),
+                    "rank": rank,
+                },
+            )
+            for rank, post_id in enumerate(post_ids)
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        time.sleep(self.delay)
+        return self._documents(query)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        await asyncio.sleep(self.delay)
+        return self._documents(query)
+
+
+# =============================================================================
+# Core stub
+# =============================================================================
+
+
+def create_core_stub(options: StandInOptions) -> FastAPI:
+    """In-process stand-in for the Core internal APIs used by the agent."""
+    core = FastAPI()
+    content = FILLER * 60
+
+    @core.get("/api/v1/scraper/internal/allowed-authors/")
+    async def allowed_authors():
+        await asyncio.sleep(options.core_delay)
+        return {"authors": ["창플"]}
+
+    @core.get("/api/v1/scraper/internal/brands/")
+    async def brands():
+        await asyncio.sleep(options.core_delay)
+        return {
+            "brands": [
+                {"name": f"브랜드{i}", "description": FILLER, "aliases": [f"brand{i}"]}
+                for i in range(20)
+            ]
+        }
+
+    @core.get("/api/v1/scraper/internal/generation/")
+    async def generation():
+        return {"ingest_generation": 1, "index_generation": 1, "index_namespace": ""}
+
+    @core.get("/api/v1/scraper/internal/posts/{post_id}/")
+    async def post(post_id: int):
+        await asyncio.sleep(options.core_delay)
+        return {
+            "post_id": post_id,
+            "title": f"글 {post_id}",
+            "content": content,
+            "url": f"https://cafe.naver.com/cjdckddus/{post_id}",
+        }
+
+    @core.post("/api/v1/content/internal/attachment/")
+    async def attachment():
+        await asyncio.sleep(options.core_delay)
+        return {"contents": []}
+
+    @core.post("/api/v1/chat/internal/messages/bulk/")
+    async def save_messages():
+        await asyncio.sleep(options.core_delay)
+        return {"saved": 2}
+
+    return core
+
+
+# =============================================================================
+# App
+# =============================================================================
+
+
+def install_standins(options: StandInOptions) -> None:
+    """Select the fake LLM provider and patch in the stand-in retriever and saver."""
+    from src.config import get_settings
+    from src.graph import builder, nodes
+    from src.providers.models import clear_model_cache
+
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["EMBEDDING_PROVIDER"] = "fake"
+    os.environ["FAKE_LATENCY_PROFILE"] = options.profile
+    os.environ["POST_SNAPSHOT_DIR"] = ""
+    get_settings.cache_clear()
+    clear_model_cache()
+
+    def get_vector_store_retriever(allowed_authors: list[str], k: int = 4):
+        return StandInRetriever(delay=options.retrieval_delay, k=options.docs_per_query)
+
+    nodes.get_vector_store_retriever = get_vector_store_retriever
+    builder.PooledAsyncPostgresSaver = lambda pool: MemorySaver()
+    builder.reset_app()
+
+
+def create_app(options: StandInOptions | None = None) -> FastAPI:
+    """Create the agent app backed by stand-ins."""
+    from src.api.router import api_router
+
+    options = options or StandInOptions()
+    install_standins(options)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.pool = None
+        app.state.redis = InMemoryRedis()
+        app.state.httpx = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_core_stub(options)),
+            base_url="http://core",
+        )
+        yield
+        await app.state.httpx.aclose()
+        await app.state.redis.aclose()
+
+    app = FastAPI(title="Changple Agent (stand-in)", lifespan=lifespan)
+    app.include_router(api_router)
+    return app
+
+
+def create_app_from_env() -> FastAPI:
+    """App factory for worker processes (options passed via BENCH_STANDIN_OPTIONS)."""
+    return create_app(StandInOptions(**json.loads(os.environ.get(OPTIONS_ENV, "{}"))))
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--profile", default=str(DEFAULT_PROFILE), help="Latency profile JSON")
+    parser.add_argument("--retrieval-ms", type=float, default=150)
+    parser.add_argument("--core-ms", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes")
+    args = parser.parse_args()
+
+    options = StandInOptions(
+        profile=args.profile,
+        retrieval_delay=args.retrieval_ms / 1000,
+        core_delay=args.core_ms / 1000,
+    )
+    if args.workers == 1:
+        uvicorn.run(create_app(options), host=args.host, port=args.port, log_level="warning")
+        return
+
+    os.environ[OPTIONS_ENV] = json.dumps(asdict(options))
+    os.environ["AGENT_WORKERS"] = str(args.workers)
+    uvicorn.run(
+        "bench.standin:create_app_from_env",
+        factory=True,
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Per-turn CPU and event counts of the graph streaming protocols.
+
+Runs the real graph against the stand-ins (zero provider latency by
+default) and consumes each turn two ways:
+
+- events: app.astream_events(version="v2") with the name-matching filter
+  the SSE endpoint used before stream_graph
+- stream: src.api.chat.stream_graph (stream_mode messages/custom/updates)
+
+Both encode the SSE events they would send, so the difference is the cost
+of producing and filtering the raw graph events.
+
+Usage (from services/agent):
+    uv run python -m bench.streambench --turns 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from langchain_core.messages import HumanMessage
+
+from bench.loadtest import DEFAULT_MESSAGE
+from bench.standin import InMemoryRedis, StandInOptions, create_core_stub, install_standins
+
+ZERO_PROFILE = Path(__file__).parent / "profiles" / "zero.json"
+
+LEGACY_STATUS_NODES = {
+    "generate_queries": "generating_queries",
+    "retrieve_documents": "retrieving",
+    "documents_handler": "filtering",
+}
+
+
+async def consume_events(app, input_data: dict, config: dict) -> int:
+    """Legacy consumer; returns the number of SSE events."""
+    from src.api.chat import RESPONSE_NODES, sse_json_event
+
+    sent = 0
+    async for event in app.astream_events(input_data, config=config, version="v2"):
+        event_type = event.get("event")
+        event_name = event.get("name", "")
+        node_name = event.get("metadata", {}).get("langgraph_node", "")
+
+        if event_type == "on_chain_start":
+            status = LEGACY_STATUS_NODES.get(event_name)
+            if status is None and event_name in RESPONSE_NODES:
+                status = "generating"
+            if status:
+                sse_json_event("status", {"message": status}, str(sent))
+                sent += 1
+
+        if event_type == "on_chat_model_stream" and node_name in RESPONSE_NODES:
+            chunk = event.get("data", {}).get("chunk")
+            if chunk and chunk.content:
+                sse_json_event("chunk", {"content": chunk.content}, str(sent))
+                sent += 1
+    return sent
+
+
+async def consume_stream(app, input_data: dict, config: dict) -> int:
+    """stream_graph consumer; returns the number of SSE events."""
+    from src.api.chat import sse_json_event, stream_graph
+
+    sent = 0
+    async for kind, value in stream_graph(app, input_data, config):
+        sse_json_event(kind, {"value": str(value)}, str(sent))
+        sent += 1
+    return sent
+
+
+async def count_raw(app, protocol: str) -> int:
+    """Raw graph events produced for one turn by a protocol."""
+    input_data = {"messages": [HumanMessage(content=DEFAULT_MESSAGE)]}
+    if protocol == "events":
+        stream = app.astream_events(input_data, config=_fresh(), version="v2")
+    else:
+        stream = app.astream(
+            input_data, config=_fresh(), stream_mode=["messages", "custom", "updates"]
+        )
+    return sum([1 async for _ in stream])
+
+
+def _fresh() -> dict:
+    return {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+
+async def measure(app, consumer, turns: int) -> dict:
+    """Run `turns` sequential turns and return per-turn averages."""
+    sent_total = 0
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for _ in range(turns):
+        input_data = {"messages": [HumanMessage(content=DEFAULT_MESSAGE)]}
+        sent_total += await consumer(app, input_data, _fresh())
+    return {
+        "cpu_ms_per_turn": (time.process_time() - cpu_started) / turns * 1000,
+        "wall_ms_per_turn": (time.perf_counter() - wall_started) / turns * 1000,
+        "sse_events_per_turn": sent_total / turns,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    from src.graph.builder import get_app
+
+    options = StandInOptions(profile=args.profile, retrieval_delay=0, core_delay=0)
+    install_standins(options)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_core_stub(options)), base_url="http://core"
+    ) as client:
+        app = await get_app(None, client, InMemoryRedis())
+        consumers = {"events": consume_events, "stream": consume_stream}
+
+        results = {}
+        for name, consumer in consumers.items():
+            await measure(app, consumer, 2)  # warm-up
+            results[name] = await measure(app, consumer, args.turns)
+            results[name]["raw_events_per_turn"] = await count_raw(app, name)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Graph streaming protocol benchmark")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--profile", default=str(ZERO_PROFILE), help="Latency profile JSON")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print(f"\n{'protocol':<10}{'cpu ms/turn':>13}{'wall ms/turn':>14}{'raw ev':>9}{'sse ev':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<10}{r['cpu_ms_per_turn']:>13.2f}{r['wall_ms_per_turn']:>14.2f}"
+            f"{r['raw_events_per_turn']:>9.0f}{r['sse_events_per_turn']:>9.0f}"
+        )
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,26 @@ set -e
 
 echo "Starting Changple Agent Service..."
 
+if [ "${SERVER_MODE:-development}" = "production" ]; then
+    # One worker per core unless set; exported so per-worker pool sizing
+    # (src.main.per_worker) splits the connection budgets correctly
+    export AGENT_WORKERS="${AGENT_WORKERS:-$(nproc)}"
+    GRACEFUL_SHUTDOWN_SECONDS="${GRACEFUL_SHUTDOWN_SECONDS:-120}"
+
+    # Aggregate Prometheus metrics across workers
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+    echo "Production mode: $AGENT_WORKERS workers, ${GRACEFUL_SHUTDOWN_SECONDS}s drain"
+
+    # On SIGTERM uvicorn stops accepting connections and lets in-flight
+    # SSE streams finish for up to GRACEFUL_SHUTDOWN_SECONDS
+    exec uv run uvicorn src.main:app --host 0.0.0.0 --port 8001 \
+        --workers "$AGENT_WORKERS" \
+        --timeout-graceful-shutdown "$GRACEFUL_SHUTDOWN_SECONDS" \
+        --timeout-keep-alive 75
+fi
+
 # Run uvicorn with reload in development
 exec uv run uvicorn src.main:app --host 0.0.0.0 --port 8001 --reload
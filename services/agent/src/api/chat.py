@@ -5,17 +5,24 @@ Replaces WebSocket with POST-based SSE for simpler client implementation
 and better compatibility with standard HTTP infrastructure.
 """
 
+import asyncio
 import json
 import logging
+import time
 import uuid
+from contextlib import aclosing
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from starlette.background import BackgroundTask
 
 from src.api.dependencies import Core, HttpxClient, Pool, RedisServiceDep
+from src.config import get_settings
 from src.graph.builder import get_app
+from src.graph.callbacks import MetricsCallbackHandler
 from src.graph.memory import manage_memory
+from src.graph.nodes import CitationRewriter
 from src.graph.prompts import STATUS_MESSAGES
 from src.schemas.chat import (
     ChatSendRequest,
@@ -26,6 +33,17 @@ from src.schemas.chat import (
     SSEStatusData,
     SSEStoppedData,
 )
+from src.services.admission import AdmissionRejected, Ticket, get_admission
+from src.services.attachments import AttachmentContext, load_attachment_context
+from src.services.metrics import (
+    ACTIVE_GENERATIONS,
+    PREFLIGHT_DURATION,
+    TURN_DURATION,
+    TURN_FIRST_TOKEN,
+    TURNS,
+    observe_dependency,
+)
+from src.tracing import TRACE_CONTEXT_KEY, open_span, run_in_context
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +78,136 @@ def sse_json_event(event: str, data: dict | object, event_id: str | None = None)
     return sse_event(event, json_str, event_id)
 
 
+async def stream_graph(app, input_data: dict, config: dict, status: str | None = None):
+    """
+    Run one graph turn and yield what the SSE stream needs.
+
+    Uses stream_mode messages (LLM tokens), custom (node statuses written via
+    get_stream_writer) and updates (node outputs, for source documents)
+    instead of astream_events, which builds an event for every runnable.
+
+    Statuses are de-duplicated (parallel nodes such as retrieve_documents
+    report the same one) and unknown status keys are dropped.
+
+    respond_with_docs writes its citation → URL mapping before streaming;
+    its tokens are passed through a CitationRewriter, so [n] markers reach
+    the client as markdown links (matching the saved answer).
+
+    Args:
+        app: Compiled LangGraph application
+        input_data: Graph input
+        config: Run config
+        status: Status the client is already showing (not repeated)
+
+    Yields:
+        ("status", STATUS_MESSAGES key), ("chunk", text) from response nodes,
+        or ("sources", list of source document dicts)
+    """
+    rewriter: CitationRewriter | None = None
+    async for mode, payload in app.astream(
+        input_data, config=config, stream_mode=["messages", "custom", "updates"]
+    ):
+        if mode == "messages":
+            message, metadata = payload
+            # Only streamed tokens; whole messages from node outputs are skipped
+            if (
+                metadata.get("langgraph_node") in RESPONSE_NODES
+                and isinstance(message, AIMessageChunk)
+                and message.content
+            ):
+                content = message.content
+                if rewriter and metadata.get("langgraph_node") == "respond_with_docs":
+                    content = rewriter.feed(content)
+                if content:
+                    yield "chunk", content
+
+        elif mode == "custom":
+            if isinstance(payload, dict) and "status" in payload:
+                if payload["status"] != status and payload["status"] in STATUS_MESSAGES:
+                    status = payload["status"]
+                    yield "status", status
+            elif isinstance(payload, dict) and "citations" in payload:
+                rewriter = CitationRewriter(payload["citations"])
+
+        elif mode == "updates":
+            for node_name, output in payload.items():
+                if node_name in RESPONSE_NODES and isinstance(output, dict):
+                    if rewriter and node_name == "respond_with_docs":
+                        tail = rewriter.flush()
+                        rewriter = None
+                        if tail:
+                            yield "chunk", tail
+                    if output.get("source_documents"):
+                        yield "sources", output["source_documents"]
+
+
+async def timed_step(timings: dict[str, float], step: str, awaitable):
+    """Await one pre-flight step, recording its duration in `timings` and metrics."""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = time.perf_counter() - started
+        PREFLIGHT_DURATION.labels(step).observe(timings[step])
+
+
+async def fetch_attachments(core_client, request: ChatSendRequest) -> AttachmentContext:
+    """
+    Get user-attached content if content_ids were provided.
+
+    With settings.attachment_retrieval_enabled only the passages relevant to
+    the message are kept, plus seed documents retrieved with the attachments'
+    vectors; otherwise the full text of every attachment is used.
+    """
+    if not request.content_ids:
+        return AttachmentContext()
+    logger.debug(f"[SSE] Fetching attached content: {request.content_ids}")
+    if get_settings().attachment_retrieval_enabled:
+        return await load_attachment_context(core_client, request.content_ids, request.content)
+    return AttachmentContext(
+        text=await core_client.get_content_text_formatted(request.content_ids)
+    )
+
+
+async def load_thread(pool, httpx_client, redis_client, config: dict):
+    """Get the LangGraph app and the thread's latest checkpoint."""
+    app = await get_app(pool, httpx_client, redis_client)
+    return app, await app.checkpointer.aget(config)
+
+
+async def compact_thread(app, config: dict, existing_messages: list) -> None:
+    """Compact the thread's messages if they exceed the memory budget."""
+    msg_count = len(existing_messages)
+    logger.debug(f"[SSE] Checkpoint has {msg_count} messages")
+    compacted = await manage_memory(existing_messages)
+    if compacted is not None:
+        logger.info(f"[SSE] Compacted {msg_count} messages → {len(compacted)}")
+        await app.aupdate_state(config, {"messages": compacted}, as_node="__start__")
+
+
+async def wait_for_admission(ticket: Ticket):
+    """
+    Wait until the ticket is admitted or the maximum wait elapses.
+
+    Yields:
+        SSEStatusData with the queue position, every admission_status_interval
+    """
+    settings = get_settings()
+    deadline = time.monotonic() + settings.admission_max_wait_seconds
+    while not ticket.admitted:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        position = ticket.position()
+        wait = ticket.estimated_wait()
+        yield SSEStatusData(
+            message=STATUS_MESSAGES["queued"].format(position=position, wait=round(wait)),
+            queue_position=position,
+            estimated_wait_seconds=round(wait, 1),
+        )
+        await ticket.wait(min(settings.admission_status_interval, remaining))
+
+
 @router.post("/{nonce}/stream")
 async def send_and_stream(
     nonce: str,
@@ -73,11 +221,13 @@ async def send_and_stream(
     Send a chat message and stream the response via SSE.
 
     Returns a text/event-stream with the following events:
-    - status: Processing status updates
+    - status: Processing status updates (with queue position while waiting)
     - chunk: Streaming response text chunks
     - end: Final response with source documents
     - stopped: Generation was stopped by user
     - error: Error occurred during processing
+
+    Responds 503 without streaming when the admission queue is full.
     """
     # Validate nonce
     try:
@@ -90,114 +240,183 @@ async def send_and_stream(
 
     # Check concurrent generation guard
     generating_key = f"{GENERATING_KEY_PREFIX}{session_nonce}"
-    is_generating = await redis_service.client.exists(generating_key)
+    async with observe_dependency("redis", "generating_guard"):
+        is_generating = await redis_service.client.exists(generating_key)
     if is_generating:
+        TURNS.labels("conflict").inc()
         raise HTTPException(status_code=409, detail="이미 응답을 생성하고 있습니다.")
 
+    # Admission: take a slot or a place in the queue, or fail fast
+    admission = get_admission()
+    user_key = (
+        f"user:{request.user_id}" if request.user_id is not None else f"session:{session_nonce}"
+    )
+    try:
+        ticket = admission.reserve(user_key)
+    except AdmissionRejected:
+        TURNS.labels("rejected").inc()
+        retry_after = max(1, round(admission.estimated_wait(admission.queued)))
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     logger.info(f"[SSE] Starting stream for session={session_nonce[:8]}... content={request.content[:50]!r}")
 
+    turn_started = time.perf_counter()
+
     async def event_generator():
         event_counter = 0
-
-        # Set concurrent generation guard
-        await redis_service.client.setex(generating_key, GENERATING_KEY_TTL, "1")
-
+        outcome = "error"
+        first_chunk_sent = False
+        analyzing_sent = False
+        ACTIVE_GENERATIONS.inc()
+        config = {"configurable": {"thread_id": session_nonce}}
+        timings: dict[str, float] = {}
+        preflight: list[asyncio.Task] = []
+        analyzing = SSEStatusData(message=STATUS_MESSAGES["analyzing"])
+
+        span, trace_context = open_span("chat.turn", **{"chat.session": session_nonce[:8]})
         try:
-            # Clear any existing stop flag
-            await redis_service.clear_stop_flag(session_nonce)
-
-            # Get user-attached content if content_ids provided
-            user_attached_content = None
-            if request.content_ids:
-                logger.debug(f"[SSE] Fetching attached content: {request.content_ids}")
-                user_attached_content = await core_client.get_content_text_formatted(
-                    request.content_ids
+            if ticket.admitted:
+                analyzing_sent = True
+                event_counter += 1
+                yield sse_json_event("status", analyzing, str(event_counter))
+
+            # Redis bookkeeping before queueing: the stop flag must be clear
+            # while waiting, and the guard set for the whole turn
+            await timed_step(
+                timings,
+                "redis",
+                asyncio.gather(
+                    # Concurrent generation guard
+                    redis_service.client.setex(generating_key, GENERATING_KEY_TTL, "1"),
+                    # Clear any existing stop flag
+                    redis_service.clear_stop_flag(session_nonce),
+                ),
+            )
+
+            # Wait for admission, reporting queue position
+            async for status in wait_for_admission(ticket):
+                event_counter += 1
+                yield sse_json_event("status", status, str(event_counter))
+                if await redis_service.check_stop_flag(session_nonce):
+                    event_counter += 1
+                    yield sse_json_event("stopped", SSEStoppedData(), str(event_counter))
+                    outcome = "stopped"
+                    return
+            if not ticket.admitted:
+                event_counter += 1
+                yield sse_json_event(
+                    "error",
+                    SSEErrorData(
+                        message="대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.",
+                        code="queue_timeout",
+                    ),
+                    str(event_counter),
+                )
+                outcome = "rejected"
+                return
+
+            # Pre-flight once admitted (holds a Postgres connection and calls
+            # Core): attachment fetch ∥ checkpoint load
+            attachments = asyncio.create_task(
+                timed_step(
+                    timings,
+                    "attachments",
+                    run_in_context(trace_context, fetch_attachments(core_client, request)),
+                )
+            )
+            thread = asyncio.create_task(
+                timed_step(
+                    timings,
+                    "checkpoint",
+                    run_in_context(
+                        trace_context,
+                        load_thread(pool, httpx_client, redis_service.client, config),
+                    ),
                 )
+            )
+            preflight = [attachments, thread]
 
-            # Get the LangGraph app
-            app = await get_app(pool, httpx_client)
+            if not analyzing_sent:
+                event_counter += 1
+                yield sse_json_event("status", analyzing, str(event_counter))
 
-            # Memory management: check and compact if needed
-            config = {"configurable": {"thread_id": session_nonce}}
-            checkpoint = await app.checkpointer.aget(config)
-            if checkpoint and checkpoint.get("channel_values", {}).get("messages"):
-                existing_messages = checkpoint["channel_values"]["messages"]
-                msg_count = len(existing_messages)
-                logger.debug(f"[SSE] Checkpoint has {msg_count} messages")
-                compacted = await manage_memory(existing_messages)
-                if compacted is not None:
-                    logger.info(f"[SSE] Compacted {msg_count} messages → {len(compacted)}")
-                    await app.aupdate_state(config, {"messages": compacted}, as_node="__start__")
+            attachment, (app, checkpoint) = await asyncio.gather(attachments, thread)
 
-            # Prepare input
-            input_data = {"messages": [HumanMessage(content=request.content)]}
-            if user_attached_content:
-                input_data["user_attached_content"] = user_attached_content
+            # Memory management: compact if needed (after admission, may call the LLM)
+            if checkpoint and checkpoint.get("channel_values", {}).get("messages"):
+                await timed_step(
+                    timings,
+                    "memory",
+                    run_in_context(
+                        trace_context,
+                        compact_thread(app, config, checkpoint["channel_values"]["messages"]),
+                    ),
+                )
 
-            # Send analyzing status
-            event_counter += 1
-            yield sse_json_event(
-                "status", SSEStatusData(message=STATUS_MESSAGES["analyzing"]), str(event_counter)
+            logger.debug(
+                "[SSE] Pre-flight "
+                + " ".join(f"{step}={seconds * 1000:.0f}ms" for step, seconds in timings.items())
             )
+            if span is not None:
+                for step, seconds in timings.items():
+                    span.set_attribute(f"chat.preflight.{step}_ms", round(seconds * 1000, 1))
+
+            # Prepare input
+            input_data = {
+                "messages": [HumanMessage(content=request.content)],
+                "attachment_documents": attachment.documents,
+            }
+            if attachment.text:
+                input_data["user_attached_content"] = attachment.text
 
             # Stream the graph execution
             full_response = ""
             source_documents = []
             was_stopped = False
 
-            async for event in app.astream_events(input_data, config=config, version="v2"):
-                # Check for stop flag
-                if await redis_service.check_stop_flag(session_nonce):
-                    logger.info(f"[SSE] Generation stopped for session {session_nonce[:8]}...")
-                    event_counter += 1
-                    yield sse_json_event("stopped", SSEStoppedData(), str(event_counter))
-                    was_stopped = True
-                    break
-
-                event_type = event.get("event")
-                event_name = event.get("name", "")
-                node_name = event.get("metadata", {}).get("langgraph_node", "")
-
-                # Handle node entry for status updates
-                if event_type == "on_chain_start":
-                    status_key = None
-                    if event_name == "generate_queries":
-                        status_key = "generating_queries"
-                    elif event_name == "retrieve_documents":
-                        status_key = "retrieving"
-                    elif event_name == "documents_handler":
-                        status_key = "filtering"
-                    elif event_name in RESPONSE_NODES:
-                        status_key = "generating"
-
-                    if status_key:
-                        logger.debug(f"[SSE] Node started: {event_name} → status={status_key}")
+            # The turn's span reaches graph nodes through the config (see traced_node)
+            run_config = {
+                "configurable": {**config["configurable"], TRACE_CONTEXT_KEY: trace_context},
+                "callbacks": [MetricsCallbackHandler()],
+            }
+            # aclosing: leaving the loop (stop) cancels the graph run
+            async with aclosing(
+                stream_graph(app, input_data, run_config, status="analyzing")
+            ) as turn_events:
+                async for kind, value in turn_events:
+                    # Check for stop flag
+                    if await redis_service.check_stop_flag(session_nonce):
+                        logger.info(f"[SSE] Generation stopped for session {session_nonce[:8]}...")
+                        event_counter += 1
+                        yield sse_json_event("stopped", SSEStoppedData(), str(event_counter))
+                        was_stopped = True
+                        break
+
+                    if kind == "status":
+                        logger.debug(f"[SSE] status={value}")
                         event_counter += 1
                         yield sse_json_event(
                             "status",
-                            SSEStatusData(message=STATUS_MESSAGES[status_key]),
+                            SSEStatusData(message=STATUS_MESSAGES[value]),
                             str(event_counter),
                         )
 
-                # Handle streaming chunks - ONLY from response nodes
-                if event_type == "on_chat_model_stream" and node_name in RESPONSE_NODES:
-                    chunk = event.get("data", {}).get("chunk")
-                    if chunk and hasattr(chunk, "content") and chunk.content:
-                        full_response += chunk.content
+                    elif kind == "chunk":
+                        if not first_chunk_sent:
+                            first_chunk_sent = True
+                            TURN_FIRST_TOKEN.observe(time.perf_counter() - turn_started)
+                        full_response += value
                         event_counter += 1
                         yield sse_json_event(
-                            "chunk",
-                            SSEChunkData(content=chunk.content),
-                            str(event_counter),
+                            "chunk", SSEChunkData(content=value), str(event_counter)
                         )
 
-                # Capture source documents from final state
-                if event_type == "on_chain_end" and event_name in RESPONSE_NODES:
-                    output = event.get("data", {}).get("output", {})
-                    if isinstance(output, dict):
-                        source_docs = output.get("source_documents", [])
-                        if source_docs:
-                            source_documents = [SourceDocument(**doc) for doc in source_docs]
+                    elif kind == "sources":
+                        source_documents = [SourceDocument(**doc) for doc in value]
 
             if not was_stopped:
                 # Send end event
@@ -230,11 +449,15 @@ async def send_and_stream(
                 },
             ]
 
-            await core_client.save_messages(
-                session_nonce=session_nonce,
-                messages=messages_to_save,
-                user_id=request.user_id,
+            await run_in_context(
+                trace_context,
+                core_client.save_messages(
+                    session_nonce=session_nonce,
+                    messages=messages_to_save,
+                    user_id=request.user_id,
+                ),
             )
+            outcome = "stopped" if was_stopped else "completed"
 
         except Exception as e:
             logger.exception(f"[SSE] Error for session={session_nonce[:8]}...: {e}")
@@ -246,12 +469,29 @@ async def send_and_stream(
             )
 
         finally:
+            # Pre-flight work left over by an early return or error
+            for task in preflight:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark as retrieved
+            ticket.release()
+
             # Clear concurrent generation guard
             await redis_service.client.delete(generating_key)
 
+            ACTIVE_GENERATIONS.dec()
+            TURNS.labels(outcome).inc()
+            TURN_DURATION.labels(outcome).observe(time.perf_counter() - turn_started)
+            if span is not None:
+                span.set_attribute("chat.outcome", outcome)
+                span.end()
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
+        # Frees the ticket even if the client disconnects before streaming starts
+        background=BackgroundTask(ticket.release),
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -1,6 +1,7 @@
 """Health check endpoint."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
 router = APIRouter(tags=["health"])
 
@@ -11,6 +12,21 @@ async def health_check():
     return {"status": "ok", "service": "changple-agent"}
 
 
+@router.get("/ready")
+async def readiness_check(request: Request):
+    """
+    Readiness endpoint.
+
+    Returns 200 once the graph, Postgres and Redis are warm (503 before),
+    with per-resource warm-up state and timings.
+    """
+    readiness = getattr(request.app.state, "readiness", None)
+    if readiness is None:
+        # App without warm-up (e.g. the benchmark stand-in)
+        return {"ready": True, "finished": True, "resources": {}}
+    return JSONResponse(readiness.to_dict(), status_code=200 if readiness.ready else 503)
+
+
 @router.get("/")
 async def root():
     """Root endpoint."""
@@ -4,6 +4,7 @@ from fastapi import APIRouter
 
 from src.api.chat import router as chat_router
 from src.api.health import router as health_router
+from src.api.metrics import router as metrics_router
 
 # Main API router
 api_router = APIRouter()
@@ -11,3 +12,4 @@ api_router = APIRouter()
 # Include sub-routers
 api_router.include_router(health_router)
 api_router.include_router(chat_router)
+api_router.include_router(metrics_router)
@@ -8,33 +8,45 @@ import asyncio
 import logging
 
 import httpx
+import redis.asyncio as redis
 from langgraph.graph import END, START, StateGraph
 from psycopg_pool import AsyncConnectionPool
 
+from src.config import get_settings
 from src.graph.checkpointer import PooledAsyncPostgresSaver
+from src.graph.memo import StructuredOutputMemo, set_llm_memo
 from src.graph.nodes import (
     documents_handler,
     generate_queries,
     respond_simple,
     respond_with_docs,
     retrieve_documents,
+    retrieve_followup,
     retrieve_in_parallel,
+    reuse_working_set,
     route_query,
     route_query_condition,
 )
 from src.graph.state import AgentState
 from src.services.core_client import CoreClient
+from src.services.post_cache import PostContentCache
+from src.services.retrieval_cache import RetrievalCache, set_retrieval_cache
+from src.services.snapshot import PostSnapshot
+from src.services.vectorstore import set_index_source
+from src.tracing import traced_node
 
 logger = logging.getLogger(__name__)
 
 # Global singleton
 _app = None
+_core_client: CoreClient | None = None
 _lock = asyncio.Lock()
 
 
 async def build_graph(
     pool: AsyncConnectionPool,
     httpx_client: httpx.AsyncClient,
+    redis_client: redis.Redis | None = None,
 ):
     """
     Build the LangGraph RAG workflow.
@@ -42,12 +54,66 @@ async def build_graph(
     Args:
         pool: PostgreSQL connection pool for checkpointer
         httpx_client: httpx client for Core API calls
+        redis_client: Optional Redis client backing the post content cache,
+            the structured-output memo and the retrieval cache
 
     Returns:
         Compiled LangGraph application
     """
+    global _core_client
+    settings = get_settings()
+
+    # Create post content cache (shared by all turns of this process)
+    post_cache = None
+    if settings.post_cache_enabled:
+        post_cache = PostContentCache(
+            max_bytes=settings.post_cache_max_bytes,
+            redis_client=redis_client if settings.post_cache_use_redis else None,
+            redis_ttl=settings.post_cache_redis_ttl,
+        )
+
+    # Memoize structured-output calls of identical prompts
+    memo_nodes = {
+        node
+        for node, enabled in (
+            ("route_query", settings.llm_memo_route_query),
+            ("generate_queries", settings.llm_memo_generate_queries),
+            ("documents_handler", settings.llm_memo_documents_handler),
+        )
+        if enabled
+    }
+    if redis_client is not None and memo_nodes:
+        set_llm_memo(
+            StructuredOutputMemo(redis_client, settings.llm_memo_ttl_seconds, memo_nodes)
+        )
+
+    # Map Core's read-only post snapshot so post text stays in-process
+    snapshot = None
+    if settings.post_snapshot_dir:
+        snapshot = PostSnapshot(
+            settings.post_snapshot_dir,
+            refresh_interval=settings.post_snapshot_refresh_interval,
+        )
+        snapshot.refresh(force=True)
+
     # Create Core client
-    core_client = CoreClient(httpx_client)
+    core_client = CoreClient(
+        httpx_client,
+        post_cache=post_cache,
+        snapshot=snapshot,
+        generation_ttl=settings.ingest_generation_ttl,
+    )
+    # Shared with startup warm-up, which pre-loads its caches
+    _core_client = core_client
+
+    # Search the namespace of Core's published index build
+    set_index_source(core_client)
+
+    # Cache Pinecone search results until Core bumps the index generation
+    if redis_client is not None and settings.retrieval_cache_enabled:
+        set_retrieval_cache(
+            RetrievalCache(redis_client, core_client, settings.retrieval_cache_ttl_seconds)
+        )
 
     # Create checkpointer
     checkpointer = PooledAsyncPostgresSaver(pool)
@@ -62,6 +128,12 @@ async def build_graph(
     async def generate_queries_node(state: AgentState) -> dict:
         return await generate_queries(state, core_client)
 
+    async def retrieve_followup_node(state: AgentState) -> dict:
+        return await retrieve_followup(state, core_client)
+
+    async def reuse_working_set_node(state: AgentState) -> dict:
+        return await reuse_working_set(state, core_client)
+
     async def documents_handler_node(state: AgentState) -> dict:
         return await documents_handler(state, core_client)
 
@@ -72,13 +144,27 @@ async def build_graph(
     graph_builder = StateGraph(AgentState)
 
     # Add all nodes
-    graph_builder.add_node("route_query", route_query_node)
-    graph_builder.add_node("respond_simple", respond_simple_node)
-    graph_builder.add_node("generate_queries", generate_queries_node)
+    graph_builder.add_node("route_query", traced_node("route_query", route_query_node))
+    graph_builder.add_node("respond_simple", traced_node("respond_simple", respond_simple_node))
+    graph_builder.add_node(
+        "generate_queries", traced_node("generate_queries", generate_queries_node)
+    )
     graph_builder.add_node("retrieve_in_parallel", retrieve_in_parallel)
-    graph_builder.add_node("retrieve_documents", retrieve_documents)
-    graph_builder.add_node("documents_handler", documents_handler_node)
-    graph_builder.add_node("respond_with_docs", respond_with_docs_node)
+    graph_builder.add_node(
+        "retrieve_documents", traced_node("retrieve_documents", retrieve_documents)
+    )
+    graph_builder.add_node(
+        "retrieve_followup", traced_node("retrieve_followup", retrieve_followup_node)
+    )
+    graph_builder.add_node(
+        "reuse_working_set", traced_node("reuse_working_set", reuse_working_set_node)
+    )
+    graph_builder.add_node(
+        "documents_handler", traced_node("documents_handler", documents_handler_node)
+    )
+    graph_builder.add_node(
+        "respond_with_docs", traced_node("respond_with_docs", respond_with_docs_node)
+    )
 
     # Define graph flow
     graph_builder.add_edge(START, "route_query")
@@ -90,19 +176,27 @@ async def build_graph(
         {
             "retrieval_required": "generate_queries",
             "just_respond": "respond_simple",
+            "followup_incremental": "retrieve_followup",
+            "followup_reuse": "reuse_working_set",
         },
     )
 
     # Simple response path (direct to end)
     graph_builder.add_edge("respond_simple", END)
 
-    # Complex RAG path (parallel retrieval → processing → response)
+    # Complex RAG path (parallel retrieval → processing → response); skips the
+    # fan-out when generate_queries already retrieved while streaming queries
     graph_builder.add_conditional_edges(
         "generate_queries",
         retrieve_in_parallel,
-        path_map=["retrieve_documents"],
+        path_map=["retrieve_documents", "documents_handler"],
     )
     graph_builder.add_edge("retrieve_documents", "documents_handler")
+
+    # Follow-up path: merge the question's results with the thread's working
+    # set, or answer from the working set directly
+    graph_builder.add_edge("retrieve_followup", "documents_handler")
+    graph_builder.add_edge("reuse_working_set", "respond_with_docs")
     graph_builder.add_edge("documents_handler", "respond_with_docs")
     graph_builder.add_edge("respond_with_docs", END)
 
@@ -116,6 +210,7 @@ async def build_graph(
 async def get_app(
     pool: AsyncConnectionPool,
     httpx_client: httpx.AsyncClient,
+    redis_client: redis.Redis | None = None,
 ):
     """
     Get or create the LangGraph application singleton.
@@ -125,6 +220,8 @@ async def get_app(
     Args:
         pool: PostgreSQL connection pool
         httpx_client: httpx client for Core API calls
+        redis_client: Optional Redis client backing the post content cache and
+            the structured-output memo
 
     Returns:
         Compiled LangGraph application
@@ -134,12 +231,18 @@ async def get_app(
     if _app is None:
         async with _lock:
             if _app is None:
-                _app = await build_graph(pool, httpx_client)
+                _app = await build_graph(pool, httpx_client, redis_client)
 
     return _app
 
 
+def get_graph_core_client() -> CoreClient | None:
+    """Get the CoreClient used by the graph nodes (None before the graph is built)."""
+    return _core_client
+
+
 def reset_app():
     """Reset the singleton (for testing)."""
-    global _app
+    global _app, _core_client
     _app = None
+    _core_client = None
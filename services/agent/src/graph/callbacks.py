@@ -0,0 +1,161 @@
+"""
+LangChain callback handler that feeds Prometheus metrics.
+
+One handler is attached per chat turn (config["callbacks"]) and records
+graph node durations, chat model latency/TTFT/token rate and retriever
+(Pinecone) latency from the callback stream.
+"""
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.services.metrics import (
+    DEPENDENCY_DURATION,
+    LLM_DURATION,
+    LLM_FIRST_TOKEN,
+    LLM_TOKENS_PER_SECOND,
+    NODE_DURATION,
+)
+
+
+class _LLMRun:
+    """Timing state of an in-flight chat model call."""
+
+    __slots__ = ("model", "started", "first_token", "tokens")
+
+    def __init__(self, model: str):
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token: float | None = None
+        self.tokens = 0
+
+
+def _model_name(serialized: dict, metadata: dict | None) -> str:
+    """Resolve the model name from callback metadata or serialized kwargs."""
+    if metadata and metadata.get("ls_model_name"):
+        return str(metadata["ls_model_name"])
+    kwargs = (serialized or {}).get("kwargs", {})
+    return str(kwargs.get("model") or kwargs.get("model_name") or "unknown")
+
+
+def _output_tokens(response: LLMResult) -> int | None:
+    """Extract output token count from usage metadata, if reported."""
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if usage and usage.get("output_tokens"):
+                return int(usage["output_tokens"])
+    return None
+
+
+class MetricsCallbackHandler(AsyncCallbackHandler):
+    """Record per-node, per-model and retriever timings."""
+
+    def __init__(self):
+        self._nodes: dict[UUID, tuple[str, float]] = {}
+        self._llm_runs: dict[UUID, _LLMRun] = {}
+        self._retrievers: dict[UUID, float] = {}
+
+    # ==========================================================================
+    # Graph nodes
+    # ==========================================================================
+
+    async def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        # Node runs are the chains whose name matches the langgraph_node metadata
+        name = kwargs.get("name")
+        if name and metadata and metadata.get("langgraph_node") == name:
+            self._nodes[run_id] = (name, time.perf_counter())
+
+    async def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_node(run_id, "ok")
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_node(run_id, "error")
+
+    def _finish_node(self, run_id: UUID, status: str) -> None:
+        entry = self._nodes.pop(run_id, None)
+        if entry:
+            name, started = entry
+            NODE_DURATION.labels(name, status).observe(time.perf_counter() - started)
+
+    # ==========================================================================
+    # Chat models
+    # ==========================================================================
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._llm_runs[run_id] = _LLMRun(_model_name(serialized, metadata))
+
+    async def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._llm_runs.get(run_id)
+        if run is None:
+            return
+        if run.first_token is None:
+            run.first_token = time.perf_counter()
+            LLM_FIRST_TOKEN.labels(run.model).observe(run.first_token - run.started)
+        run.tokens += 1
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+        ended = time.perf_counter()
+        LLM_DURATION.labels(run.model, "ok").observe(ended - run.started)
+
+        # Token rate is only meaningful for streamed calls
+        if run.first_token is not None and ended > run.first_token:
+            tokens = _output_tokens(response) or run.tokens
+            LLM_TOKENS_PER_SECOND.labels(run.model).observe(tokens / (ended - run.first_token))
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._llm_runs.pop(run_id, None)
+        if run is not None:
+            LLM_DURATION.labels(run.model, "error").observe(time.perf_counter() - run.started)
+
+    # ==========================================================================
+    # Retrievers (Pinecone, including the query embedding)
+    # ==========================================================================
+
+    async def on_retriever_start(
+        self, serialized: dict[str, Any], query: str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._retrievers[run_id] = time.perf_counter()
+
+    async def on_retriever_end(self, documents: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_retriever(run_id, "ok")
+
+    async def on_retriever_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._finish_retriever(run_id, "error")
+
+    def _finish_retriever(self, run_id: UUID, status: str) -> None:
+        started = self._retrievers.pop(run_id, None)
+        if started is not None:
+            DEPENDENCY_DURATION.labels("pinecone", "retrieve", status).observe(
+                time.perf_counter() - started
+            )
@@ -5,6 +5,7 @@ Ported from changple2/chatbot/bot.py.
 """
 
 import logging
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
@@ -14,6 +15,9 @@ from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
+from src.services.metrics import DEPENDENCY_DURATION
+from src.tracing import start_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,9 +47,21 @@ class PooledAsyncPostgresSaver(AsyncPostgresSaver):
         Yields:
             Configured database cursor
         """
-        async with self.pool.connection(timeout=300) as conn:
-            async with conn.cursor(binary=True, row_factory=dict_row) as cur:
-                yield cur
+        with start_span("postgres.checkpoint") as span:
+            requested = time.perf_counter()
+            async with self.pool.connection(timeout=300) as conn:
+                acquired = time.perf_counter()
+                wait = acquired - requested
+                DEPENDENCY_DURATION.labels("postgres", "pool_wait", "ok").observe(wait)
+                if span is not None:
+                    span.set_attribute("db.pool.wait_seconds", wait)
+                try:
+                    async with conn.cursor(binary=True, row_factory=dict_row) as cur:
+                        yield cur
+                finally:
+                    DEPENDENCY_DURATION.labels("postgres", "checkpoint", "ok").observe(
+                        time.perf_counter() - acquired
+                    )
 
 
 async def setup_checkpointer(pool: AsyncConnectionPool) -> None:
@@ -0,0 +1,134 @@
+"""
+Session working set and follow-up detection.
+
+Every RAG turn stores the documents it kept (post ids and retrieval scores
+only) in the thread's state, which the checkpointer persists with the
+conversation. A follow-up question in the same thread ("그럼 인테리어
+비용은?") usually needs the same documents, so instead of generating queries
+and retrieving from scratch the turn can:
+
+- reuse: answer from the working set directly (a conversational follow-up
+  without new domain keywords, e.g. "더 자세히 알려주세요")
+- incremental: retrieve only the question itself and merge the results
+  with the working set; working-set documents are kept without another
+  relevance judgment, only the new candidates are judged
+- fresh: run the full pipeline (not a follow-up, an attachment turn, or no
+  working set yet)
+
+The detector is a heuristic without an LLM call: a follow-up opens with a
+continuation word or refers back to the previous answer, and stays short.
+New topics are found with the keyword expander's vocabulary match.
+"""
+
+import logging
+from typing import Literal
+
+from langchain_core.documents import Document
+
+from src.services.keyword_expander import KeywordExpander
+
+logger = logging.getLogger(__name__)
+
+FollowupDecision = Literal["fresh", "incremental", "reuse"]
+
+# Openings that continue the previous question
+FOLLOWUP_PREFIXES = (
+    "그럼",
+    "그러면",
+    "그렇다면",
+    "그래서",
+    "그리고",
+    "그런데",
+    "근데",
+    "그건",
+    "그거",
+    "그게",
+    "그중",
+    "그 중",
+    "이건",
+    "이거",
+    "또 ",
+    "더 ",
+    "추가로",
+    "아까",
+    "방금",
+)
+
+# References back to the previous answer anywhere in the question
+FOLLOWUP_REFERENCES = (
+    "그거",
+    "그것",
+    "거기",
+    "위에서",
+    "앞에서",
+    "말씀하신",
+    "말씀해주신",
+    "알려주신",
+    "방금",
+    "아까",
+)
+
+
+def detect_followup(
+    question: str,
+    working_set: list[dict],
+    expander: KeywordExpander | None,
+    max_chars: int = 60,
+) -> FollowupDecision:
+    """
+    Decide how much of the pipeline a question needs.
+
+    Args:
+        question: The user's latest message
+        working_set: Documents kept by the thread's previous RAG turn
+        expander: Keyword vocabulary of the post snapshot (None if unavailable)
+        max_chars: Longer questions are always treated as new
+
+    Returns:
+        "reuse", "incremental" or "fresh"
+    """
+    if not working_set or not isinstance(question, str):
+        return "fresh"
+
+    text = " ".join(question.split())
+    if len(text) > max_chars:
+        return "fresh"
+    if not text.startswith(FOLLOWUP_PREFIXES) and not any(
+        reference in text for reference in FOLLOWUP_REFERENCES
+    ):
+        return "fresh"
+
+    # Without the vocabulary new topics cannot be ruled out
+    if expander is None or expander.match(text):
+        return "incremental"
+    return "reuse"
+
+
+def working_set_documents(working_set: list[dict]) -> list[Document]:
+    """
+    Placeholder documents for the working set, to merge with new results.
+
+    They carry only the post id and the score from the turn that kept them;
+    documents_handler fetches their content.
+    """
+    return [
+        Document(id=str(item["id"]), page_content="", metadata={"score": item.get("score")})
+        for item in working_set
+    ]
+
+
+def build_working_set(stats: list, kept: list[int], limit: int) -> list[dict]:
+    """
+    Working set of a turn: the kept candidates, highest score first.
+
+    Args:
+        stats: Candidates of documents_handler (CandidateStats)
+        kept: Indices of the kept candidates
+        limit: Maximum number of documents in the working set
+
+    Returns:
+        List of {"id", "score"} dicts
+    """
+    items = [{"id": stats[i].doc.id, "score": stats[i].score} for i in kept]
+    items.sort(key=lambda item: -1.0 if item["score"] is None else item["score"], reverse=True)
+    return items[:limit]
@@ -0,0 +1,182 @@
+"""
+Memoization of structured-output LLM calls in Redis.
+
+route_query, generate_queries and the relevance judgments of
+documents_handler are functions of their prompt (system prompt, context
+messages, brand descriptions, candidate documents), so identical turns
+(typically first-turn questions) can reuse an earlier result instead of
+calling the model again.
+
+Keys are a SHA-256 over a canonical JSON of:
+
+- the node and the model parameters (name, temperature)
+- the output schema's JSON schema
+- the prompt messages (role and content)
+- the prompt-template version: a hash of every template in prompts.py, so
+  editing a prompt invalidates all earlier entries
+
+Entries expire after settings.llm_memo_ttl_seconds; each node can be
+enabled separately. Lookups are counted per node and outcome in
+agent_llm_memo_lookups_total (hit rate = hit / (hit + miss)).
+"""
+
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+import redis.asyncio as redis
+from pydantic import BaseModel, TypeAdapter
+
+from src.graph import prompts
+from src.services.metrics import LLM_MEMO_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for memoized results
+LLM_MEMO_PREFIX = "agent:llm_memo:"
+
+
+@lru_cache
+def prompt_version() -> str:
+    """Hash of every prompt template in prompts.py."""
+    templates = sorted(
+        (name, value)
+        for name, value in vars(prompts).items()
+        if name.isupper() and isinstance(value, str)
+    )
+    payload = json.dumps(templates, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache
+def _schema_json(schema: type) -> str:
+    return json.dumps(TypeAdapter(schema).json_schema(), sort_keys=True)
+
+
+def _canonical_message(message: Any) -> list:
+    """[role, content] of a BaseMessage or a {"role", "content"} dict."""
+    if isinstance(message, dict):
+        return [message.get("role"), message.get("content")]
+    return [message.type, message.content]
+
+
+def memo_key(node: str, params: dict, schema: type, prompt: list) -> str:
+    """
+    Canonical cache key of a structured-output call.
+
+    Args:
+        node: Calling node (part of the key, and the per-node flag)
+        params: Model parameters that change the output (name, temperature)
+        schema: Structured-output schema (TypedDict or pydantic model)
+        prompt: Prompt messages
+
+    Returns:
+        Redis key
+    """
+    payload = json.dumps(
+        {
+            "node": node,
+            "params": params,
+            "schema": _schema_json(schema),
+            "prompt": [_canonical_message(m) for m in prompt],
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{LLM_MEMO_PREFIX}{prompt_version()}:{node}:{digest}"
+
+
+class StructuredOutputMemo:
+    """Redis store of structured-output results with per-node enable flags."""
+
+    def __init__(self, redis_client: redis.Redis, ttl: int, nodes: set[str]):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.nodes = nodes
+
+    def enabled(self, node: str) -> bool:
+        return node in self.nodes
+
+    async def get(self, node: str, key: str, schema: type) -> Any | None:
+        """Memoized result for `key`, or None on a miss or Redis error."""
+        try:
+            raw = await self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"LLM memo read failed for {node}: {e}")
+            LLM_MEMO_LOOKUPS.labels(node, "error").inc()
+            return None
+
+        if raw is None:
+            LLM_MEMO_LOOKUPS.labels(node, "miss").inc()
+            return None
+        LLM_MEMO_LOOKUPS.labels(node, "hit").inc()
+        value = json.loads(raw)
+        if isinstance(schema, type) and issubclass(schema, BaseModel):
+            return schema.model_validate(value)
+        return value
+
+    async def set(self, node: str, key: str, value: Any) -> None:
+        """Store a result under `key` with the memo TTL."""
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+        try:
+            await self.redis_client.setex(
+                key, self.ttl, json.dumps(value, ensure_ascii=False, default=str)
+            )
+        except Exception as e:
+            logger.warning(f"LLM memo write failed for {node}: {e}")
+
+
+_memo: StructuredOutputMemo | None = None
+
+
+def set_llm_memo(memo: StructuredOutputMemo | None) -> None:
+    """Install the process-wide memo (done by build_graph)."""
+    global _memo
+    _memo = memo
+
+
+def get_llm_memo(node: str) -> StructuredOutputMemo | None:
+    """The process-wide memo if it is enabled for `node`."""
+    if _memo is not None and _memo.enabled(node):
+        return _memo
+    return None
+
+
+async def memoized(
+    node: str,
+    params: dict,
+    schema: type,
+    prompt: list,
+    call: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run a structured-output call through the memo.
+
+    Args:
+        node: Calling node
+        params: Model parameters that change the output (name, temperature)
+        schema: Structured-output schema of the call
+        prompt: Prompt messages passed to the call
+        call: Performs the LLM call on a miss
+
+    Returns:
+        The memoized or freshly computed result
+    """
+    memo = get_llm_memo(node)
+    if memo is None:
+        return await call()
+
+    key = memo_key(node, params, schema, prompt)
+    cached = await memo.get(node, key, schema)
+    if cached is not None:
+        return cached
+
+    result = await call()
+    if result is not None:
+        await memo.set(node, key, result)
+    return result
@@ -8,9 +8,8 @@ message growth while preserving conversation context.
 import logging
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-from src.config import get_settings
+from src.providers.models import get_chat_model
 
 logger = logging.getLogger(__name__)
 
@@ -71,8 +70,6 @@ async def summarize_messages(messages: list[BaseMessage]) -> str:
     Returns:
         Summary string prefixed with SUMMARY_PREFIX
     """
-    settings = get_settings()
-
     conversation_text = []
     for msg in messages:
         if isinstance(msg, HumanMessage):
@@ -84,11 +81,7 @@ async def summarize_messages(messages: list[BaseMessage]) -> str:
 
     prompt = SUMMARIZE_PROMPT.format(conversation="\n".join(conversation_text))
 
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0,
-        google_api_key=settings.google_api_key,
-    )
+    llm = get_chat_model(model_name="gemini-2.0-flash")
 
     response = await llm.ainvoke(prompt)
     return f"{SUMMARY_PREFIX}{response.content}"
@@ -5,19 +5,29 @@ Ported from changple2/chatbot/bot.py with Django ORM calls replaced
 by Core REST API calls via CoreClient.
 """
 
+import asyncio
 import logging
 import re
-from typing import Any, Literal, TypedDict, Union, cast
+from typing import Any, Literal, Union, cast
 
 from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, AnyMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.config import get_stream_writer
 from langgraph.constants import Send
 from pydantic import BaseModel
 
 from src.config import get_settings
+from src.graph.followup import (
+    FollowupDecision,
+    build_working_set,
+    detect_followup,
+    working_set_documents,
+)
+from src.graph.memo import get_llm_memo, memo_key, memoized
 from src.graph.memory import get_context_messages
 from src.graph.prompts import (
+    DOC_JUDGMENT_PROMPT,
     DOC_RELEVANCE_PROMPT_TEMPLATE,
     GENERATE_QUERIES_PROMPT_TEMPLATE,
     RAG_RESPONSE_PROMPT,
@@ -25,20 +35,42 @@ from src.graph.prompts import (
     SIMPLE_RESPONSE_PROMPT,
     USER_ATTACHED_CONTENT_NOTICE,
 )
-from src.graph.state import AgentState, QueryState, Router
+from src.graph.relevance import (
+    CandidateStats,
+    RelevancePlan,
+    RelevancePolicy,
+    candidate_stats,
+    plan_relevance,
+    record_relevance_decision,
+)
+from src.graph.state import (
+    AgentState,
+    DocJudgment,
+    DocRelevance,
+    QueryResponse,
+    QueryState,
+    Router,
+)
+from src.providers.gateway import get_gateway
+from src.providers.models import astream_structured, get_chat_model
+from src.services.brands import format_brands, get_brand_matcher
 from src.services.core_client import CoreClient
+from src.services.keyword_expander import get_keyword_expander
+from src.services.metrics import FOLLOWUP_DECISIONS, QUERY_GENERATIONS, RELEVANCE_JUDGMENTS
 from src.services.vectorstore import get_vector_store_retriever
 
 logger = logging.getLogger(__name__)
 
+QUERY_MODEL = "gemini-2.5-flash"
+
 
 def load_llm(
     model_name: str | None = None,
     temperature: float = 0,
     streaming: bool = False,
-) -> ChatGoogleGenerativeAI:
+) -> BaseChatModel:
     """
-    Create and configure a Google Generative AI language model.
+    Create and configure a chat model for the configured provider.
 
     Args:
         model_name: The Gemini model to use (defaults to settings)
@@ -46,16 +78,9 @@ def load_llm(
         streaming: Whether to enable streaming responses
 
     Returns:
-        Configured ChatGoogleGenerativeAI instance
+        Configured chat model (Gemini, or the fake when LLM_PROVIDER=fake)
     """
-    settings = get_settings()
-
-    return ChatGoogleGenerativeAI(
-        model=model_name or settings.default_model,
-        temperature=temperature,
-        disable_streaming=not streaming,
-        google_api_key=settings.google_api_key,
-    )
+    return get_chat_model(model_name=model_name, temperature=temperature, streaming=streaming)
 
 
 def format_docs(docs: list[Document] | None) -> str:
@@ -82,11 +107,84 @@ def format_docs(docs: list[Document] | None) -> str:
 """
 
 
+CITATION_PATTERN = re.compile(r"\[(\d+)\]")
+
+
+def rewrite_citations(content: str, source_url_mapping: dict[int, str]) -> str:
+    """
+    Replace [n] citation markers with clickable markdown links.
+
+    Args:
+        content: Generated answer text
+        source_url_mapping: Citation number → source URL
+
+    Returns:
+        Content with known citations linked; unknown markers are left as-is
+    """
+    if not source_url_mapping:
+        return content
+
+    def replace_citation(match):
+        citation_num = int(match.group(1))
+        if citation_num in source_url_mapping:
+            return f"[\\[{citation_num}\\]]({source_url_mapping[citation_num]})"
+        return match.group(0)
+
+    return CITATION_PATTERN.sub(replace_citation, content)
+
+
+# A trailing "[" or "[12" that the next chunk may complete into a citation
+PARTIAL_CITATION_PATTERN = re.compile(r"\[\d{0,6}\Z")
+
+
+class CitationRewriter:
+    """
+    Incremental rewrite_citations over streamed chunks.
+
+    Only a trailing partial marker is held back until the next chunk
+    completes or breaks it; everything before it is rewritten and returned
+    right away. Feeding every chunk and then flushing yields exactly
+    rewrite_citations of the whole text.
+    """
+
+    def __init__(self, source_url_mapping: dict[int, str]):
+        self.source_url_mapping = source_url_mapping
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Rewrite the next chunk, returning the text that is safe to emit."""
+        if not self.source_url_mapping:
+            return text
+        text = self._pending + text
+        partial = PARTIAL_CITATION_PATTERN.search(text)
+        if partial:
+            self._pending = text[partial.start() :]
+            text = text[: partial.start()]
+        else:
+            self._pending = ""
+        return rewrite_citations(text, self.source_url_mapping)
+
+    def flush(self) -> str:
+        """Return the held-back tail once the stream has ended."""
+        text, self._pending = self._pending, ""
+        return text
+
+
 # =============================================================================
 # Node Functions
 # =============================================================================
 
 
+def emit_status(status: str) -> None:
+    """
+    Report node progress to stream_mode="custom" consumers.
+
+    Args:
+        status: Key of STATUS_MESSAGES (the SSE endpoint renders the text)
+    """
+    get_stream_writer()({"status": status})
+
+
 async def route_query(state: AgentState, core_client: CoreClient) -> dict:
     """
     Route user queries to either simple response or complex RAG pipeline.
@@ -107,22 +205,59 @@ async def route_query(state: AgentState, core_client: CoreClient) -> dict:
     context_messages = get_context_messages(state["messages"])
     prompt = [SystemMessage(content=ROUTER_SYSTEM_PROMPT)] + context_messages
 
-    response = cast(Router, await model.ainvoke(prompt))
+    response = cast(
+        Router,
+        await memoized(
+            "route_query",
+            {"model": "gemini-2.5-flash"},
+            Router,
+            prompt,
+            lambda: model.ainvoke(prompt),
+        ),
+    )
+    followup = "fresh"
+    if response.type == "retrieval_required":
+        followup = _detect_followup(state, core_client)
+        FOLLOWUP_DECISIONS.labels(followup).inc()
+
     return {
         "router": response,
         "documents": "delete",  # Clear any existing documents
         "query": state["messages"][-1].content,
         "helpful_documents": [],
+        "retrieval_done": False,
+        "followup": followup,
     }
 
 
+def _detect_followup(state: AgentState, core_client: CoreClient) -> FollowupDecision:
+    """Follow-up decision of a retrieval turn (see src/graph/followup.py)."""
+    settings = get_settings()
+    if not settings.followup_detection:
+        return "fresh"
+    # Attachments change the context, so their turns always retrieve afresh
+    if state.get("attachment_documents") or state.get("user_attached_content"):
+        return "fresh"
+
+    decision = detect_followup(
+        state["messages"][-1].content,
+        state.get("working_set") or [],
+        get_keyword_expander(core_client.snapshot),
+        max_chars=settings.followup_max_chars,
+    )
+    logger.debug(f"Follow-up decision: {decision}")
+    return decision
+
+
 def route_query_condition(
     state: Union[list[AnyMessage], dict[str, Any], BaseModel],
     messages_key: str = "messages",
-) -> Literal["retrieval_required", "just_respond"]:
+) -> Literal["retrieval_required", "just_respond", "followup_incremental", "followup_reuse"]:
     """
     Conditional edge function for routing based on query classification.
 
+    Retrieval turns detected as follow-ups go to the working-set nodes.
+
     Args:
         state: Current agent state
         messages_key: Key for messages in state (unused but required by LangGraph)
@@ -132,10 +267,16 @@ def route_query_condition(
     """
     router = state.get("router")
     if isinstance(router, Router):
-        return router.type
+        route = router.type
     elif isinstance(router, dict):
-        return router.get("type", "retrieval_required")
-    return "retrieval_required"
+        route = router.get("type", "retrieval_required")
+    else:
+        route = "retrieval_required"
+
+    followup = state.get("followup")
+    if route == "retrieval_required" and followup in ("incremental", "reuse"):
+        return f"followup_{followup}"
+    return route
 
 
 async def respond_simple(state: AgentState, core_client: CoreClient) -> dict:
@@ -152,6 +293,7 @@ async def respond_simple(state: AgentState, core_client: CoreClient) -> dict:
     Returns:
         State update with streaming response and answer
     """
+    emit_status("generating")
     llm = load_llm(model_name="gemini-2.5-flash", streaming=True)
 
     context_messages = get_context_messages(state["messages"])
@@ -178,8 +320,23 @@ async def generate_queries(state: AgentState, core_client: CoreClient) -> dict:
     Generate multiple search queries for parallel document retrieval.
 
     Takes the user's question and creates 2-5 different search query variations
-    to maximize document retrieval coverage. Includes brand information for
-    better query context.
+    to maximize document retrieval coverage. Brands mentioned in the
+    conversation (found by the brand matcher over names and aliases) are
+    described in the prompt and added as retrieval queries.
+
+    In incremental mode (settings.incremental_query_retrieval) the structured
+    output is streamed and each query is retrieved as soon as it is complete,
+    overlapping later query generation with earlier searches; the documents
+    are returned directly and the retrieve_documents fan-out is skipped.
+
+    When the turn's attachments already seeded retrieval (attachment_documents)
+    and settings.attachment_skip_query_generation is set, no queries are
+    generated at all.
+
+    With settings.query_expansion_mode "local" (or "auto" while the query
+    model is degraded) the queries are built from the keyword co-occurrence
+    graph of the post snapshot instead of an LLM call. LLM results are
+    memoized per prompt (see src/graph/memo.py).
 
     Args:
         state: Current agent state with user query
@@ -188,16 +345,44 @@ async def generate_queries(state: AgentState, core_client: CoreClient) -> dict:
     Returns:
         State update with search queries and allowed authors list
     """
+    settings = get_settings()
+    if state.get("attachment_documents") and settings.attachment_skip_query_generation:
+        # Retrieval was seeded with the question and attachment vectors
+        return {
+            "retrieve_queries": [],
+            "allowed_authors": await core_client.get_allowed_authors(),
+            "retrieval_done": True,
+        }
 
-    class QueryResponse(TypedDict):
-        maximum_five_queries: list[str]
+    emit_status("generating_queries")
 
-    model = load_llm(model_name="gemini-2.5-flash", temperature=1)
-    model = model.with_structured_output(QueryResponse)
+    # Only the brands mentioned in the conversation go into the prompt
+    context_messages = get_context_messages(state["messages"])
+    brands = await core_client.get_brands()
+    mentioned = get_brand_matcher(brands).find(
+        [m.content for m in reversed(context_messages) if isinstance(m.content, str)],
+        limit=settings.brand_prompt_limit,
+    )
+    expansions = (
+        [brand["name"] for brand in mentioned] if settings.brand_query_expansion else []
+    )
 
-    # Fetch brand information via Core API
-    goodto_know_brands = await core_client.get_brands_formatted()
-    prompt_content = GENERATE_QUERIES_PROMPT_TEMPLATE.format(goodto_know_brands=goodto_know_brands)
+    if local_queries := _expand_locally(state, core_client):
+        return {
+            "retrieve_queries": _with_expansions(local_queries, expansions),
+            "allowed_authors": await core_client.get_allowed_authors(),
+        }
+
+    # Partial results need a streaming client: with disable_streaming the
+    # structured stream yields only the final result
+    model = load_llm(
+        model_name=QUERY_MODEL,
+        temperature=1,
+        streaming=settings.incremental_query_retrieval,
+    )
+    prompt_content = GENERATE_QUERIES_PROMPT_TEMPLATE.format(
+        goodto_know_brands=format_brands(mentioned) or "(없음)"
+    )
 
     # Append user-attached content if it exists
     if user_attached_content := state.get("user_attached_content"):
@@ -205,19 +390,182 @@ async def generate_queries(state: AgentState, core_client: CoreClient) -> dict:
             user_attached_content=user_attached_content
         )
 
-    prompt = [SystemMessage(content=prompt_content)] + get_context_messages(state["messages"])
-    response = cast(QueryResponse, await model.ainvoke(prompt))
+    prompt = [SystemMessage(content=prompt_content)] + context_messages
+
+    params = {"model": QUERY_MODEL, "temperature": 1}
+    if settings.incremental_query_retrieval:
+        # A memoized result goes through the regular retrieve_documents fan-out
+        memo = get_llm_memo("generate_queries")
+        key = memo_key("generate_queries", params, QueryResponse, prompt) if memo else ""
+        response = await memo.get("generate_queries", key, QueryResponse) if memo else None
+        if response is None:
+            update, generated = await _generate_and_retrieve(
+                model, prompt, core_client, expansions
+            )
+            if memo and generated:
+                await memo.set("generate_queries", key, {"maximum_five_queries": generated})
+            return update
+    else:
+        model = model.with_structured_output(QueryResponse)
+        response = await memoized(
+            "generate_queries", params, QueryResponse, prompt, lambda: model.ainvoke(prompt)
+        )
+    response = cast(QueryResponse, response)
 
     # Get allowed authors via Core API
     allowed_authors = await core_client.get_allowed_authors()
 
     return {
-        "retrieve_queries": response["maximum_five_queries"],
+        "retrieve_queries": _with_expansions(response["maximum_five_queries"], expansions),
+        "allowed_authors": allowed_authors,
+    }
+
+
+def _expand_locally(state: AgentState, core_client: CoreClient) -> list[str] | None:
+    """
+    Build the turn's queries from the keyword graph if local expansion applies.
+
+    Returns:
+        Search queries, or None when the LLM should generate them
+    """
+    mode = get_settings().query_expansion_mode
+    if mode == "local":
+        reason = "configured"
+    elif mode == "auto" and get_gateway().is_degraded(QUERY_MODEL):
+        reason = "degraded"
+    else:
+        QUERY_GENERATIONS.labels("llm", "configured").inc()
+        return None
+
+    expander = get_keyword_expander(core_client.snapshot)
+    question = state["messages"][-1].content
+    if expander is None or not isinstance(question, str):
+        logger.warning("Local query expansion unavailable, using the LLM")
+        QUERY_GENERATIONS.labels("llm", "no_keyword_graph").inc()
+        return None
+
+    queries = expander.expand(
+        question,
+        max_queries=5,
+        neighbors=get_settings().query_expansion_neighbors,
+    )
+    QUERY_GENERATIONS.labels("local", reason).inc()
+    logger.debug(f"Expanded queries locally ({reason}): {queries}")
+    return queries
+
+
+def _with_expansions(queries: list[str], expansions: list[str]) -> list[str]:
+    """Append expansion queries that the generated queries do not already contain."""
+    seen = {query.strip() for query in queries}
+    return queries + [query for query in expansions if query.strip() not in seen]
+
+
+async def _generate_and_retrieve(
+    model: BaseChatModel, prompt: list, core_client: CoreClient, expansions: list[str]
+) -> tuple[dict, list[str]]:
+    """
+    Stream queries and start a retrieval for each one as it completes.
+
+    Expansion queries (mentioned brand names) are retrieved right away,
+    while the LLM is still generating.
+
+    Returns:
+        Tuple of (state update, queries generated by the LLM)
+    """
+    allowed_authors = await core_client.get_allowed_authors()
+    retriever = get_vector_store_retriever(allowed_authors)
+
+    queries: list[str] = []
+    retrievals: list[asyncio.Task] = [
+        asyncio.create_task(retriever.ainvoke(query)) for query in expansions
+    ]
+    expanded = {query.strip() for query in expansions}
+
+    def dispatch(query: str) -> None:
+        if not queries:
+            emit_status("retrieving")
+        queries.append(query)
+        if query.strip() not in expanded:
+            retrievals.append(asyncio.create_task(retriever.ainvoke(query)))
+
+    try:
+        current: list[str] = []
+        async for partial in astream_structured(model, QueryResponse, prompt):
+            current = (partial or {}).get("maximum_five_queries") or []
+            # Every item but the last is complete (the last may still be streaming)
+            for query in current[len(queries) : len(current) - 1]:
+                dispatch(query)
+        for query in current[len(queries) :]:
+            dispatch(query)
+
+        results = await asyncio.gather(*retrievals)
+    except BaseException:
+        for task in retrievals:
+            task.cancel()
+        raise
+
+    logger.debug(f"Retrieved {len(queries)} queries while generating them")
+    update = {
+        "retrieve_queries": _with_expansions(queries, expansions),
+        "allowed_authors": allowed_authors,
+        "documents": [doc for docs in results for doc in docs],
+        "retrieval_done": True,
+    }
+    return update, queries
+
+
+async def retrieve_followup(state: AgentState, core_client: CoreClient) -> dict:
+    """
+    Retrieve only the follow-up question and merge it with the working set.
+
+    The working-set documents are added as candidates that documents_handler
+    keeps without judging them again; only the new results are judged.
+
+    Args:
+        state: Current agent state with the thread's working set
+        core_client: CoreClient for fetching allowed authors
+
+    Returns:
+        State update with the merged candidates (query generation and the
+        retrieve_documents fan-out are skipped)
+    """
+    emit_status("retrieving")
+    question = state["messages"][-1].content
+    allowed_authors = await core_client.get_allowed_authors()
+    results = await get_vector_store_retriever(allowed_authors).ainvoke(question)
+    return {
+        "retrieve_queries": [question],
         "allowed_authors": allowed_authors,
+        "documents": working_set_documents(state["working_set"]) + results,
+        "retrieval_done": True,
+    }
+
+
+async def reuse_working_set(state: AgentState, core_client: CoreClient) -> dict:
+    """
+    Answer a conversational follow-up from the working set directly.
+
+    Skips query generation, retrieval and relevance judging; the working-set
+    posts are fetched (from the post cache or snapshot) and passed to
+    respond_with_docs.
+
+    Args:
+        state: Current agent state with the thread's working set
+        core_client: CoreClient for fetching full post content
+
+    Returns:
+        State update with the working-set documents, all marked helpful
+    """
+    emit_status("filtering")
+    docs = await fetch_full_documents(working_set_documents(state["working_set"]), core_client)
+    return {
+        "retrieve_queries": [],
+        "documents": {"documents": docs},
+        "helpful_documents": list(range(1, len(docs) + 1)),
     }
 
 
-def retrieve_in_parallel(state: AgentState) -> list[Send]:
+def retrieve_in_parallel(state: AgentState) -> list[Send] | str:
     """
     Set up parallel document retrieval operations.
 
@@ -228,8 +576,11 @@ def retrieve_in_parallel(state: AgentState) -> list[Send]:
         state: Current agent state with search queries and allowed authors
 
     Returns:
-        List of Send objects for parallel execution
+        List of Send objects for parallel execution, or "documents_handler"
+        when generate_queries already retrieved (incremental mode)
     """
+    if state.get("retrieval_done"):
+        return "documents_handler"
     return [
         Send("retrieve_documents", (QueryState(query=query), state["allowed_authors"]))
         for query in state["retrieve_queries"]
@@ -249,6 +600,7 @@ async def retrieve_documents(args: tuple[QueryState, list[str]]) -> dict:
     Returns:
         Dictionary with retrieved documents
     """
+    emit_status("retrieving")
     state, allowed_authors = args
     retriever = get_vector_store_retriever(allowed_authors)
     response = await retriever.ainvoke(state.query)
@@ -259,9 +611,15 @@ async def documents_handler(state: AgentState, core_client: CoreClient) -> dict:
     """
     Process retrieved documents and filter for relevance.
 
-    Takes all retrieved documents, fetches their full content from Core API,
-    and uses an LLM to determine which documents are actually relevant to
-    the user's question.
+    Uses an LLM to determine which retrieved documents are actually relevant
+    to the user's question (one call for all candidates, or concurrent
+    per-document calls with a deadline, see judge_relevance). The score-based
+    relevance policy (see src/graph/relevance.py) may keep confident
+    documents and drop weak ones without asking the LLM. With settings.summary_first_relevance the LLM
+    judges the title/keywords/summary metadata stored with the vectors, and
+    full content is fetched from Core API only for the documents it keeps
+    (and for candidates without a summary, which are judged on it);
+    otherwise the candidates' full content is fetched and judged.
 
     Args:
         state: Current agent state with retrieved documents
@@ -270,47 +628,129 @@ async def documents_handler(state: AgentState, core_client: CoreClient) -> dict:
     Returns:
         State update with filtered, relevant documents
     """
-    # Deduplicate documents by ID
-    documents_ids = []
-    for doc in state["documents"]:
-        if doc.id not in documents_ids:
-            documents_ids.append(doc.id)
+    emit_status("filtering")
+
+    # Deduplicate documents (query results and attachment seeds) by ID,
+    # keeping their scores across queries
+    stats = candidate_stats(state["documents"] + (state.get("attachment_documents") or []))
+    candidate_docs = [s.doc for s in stats]
+    queries = state.get("retrieve_queries") or []
+    policy = RelevancePolicy.from_settings()
+    plan = plan_relevance(stats, policy, len(queries))
+    if state.get("followup") == "incremental":
+        plan = _carry_working_set(plan, stats, state.get("working_set") or [])
+    settings = get_settings()
 
-    # Fetch full content for each unique document via Core API
-    formatted_docs_dict = {"documents": []}
-    for doc_id in documents_ids:
-        post_id = int(doc_id)
-        post_data = await core_client.get_post_content(post_id)
+    async def fetch(indices: list[int]) -> dict[int, Document]:
+        docs = await fetch_full_documents([candidate_docs[i] for i in indices], core_client)
+        return dict(zip(indices, docs, strict=True))
+
+    # Candidates judged on their full content: all of them, or with
+    # summary-first judging only those without a summary in their metadata
+    if settings.summary_first_relevance:
+        full_docs = await fetch(
+            [i for i in plan.judge if not candidate_docs[i].metadata.get("summary")]
+        )
+    else:
+        full_docs = await fetch(plan.accepted + plan.judge)
+
+    judged = [
+        full_docs[i] if i in full_docs else summary_document(candidate_docs[i]) for i in plan.judge
+    ]
+    # The whole band is judged in both modes: documents accepted by score do
+    # not count towards the per-document early stop
+    helpful = await judge_relevance(judged, state)
+    kept = plan.accepted + [plan.judge[i] for i in helpful]
+    full_docs.update(await fetch([i for i in kept if i not in full_docs]))
+    filtered_docs = [full_docs[i] for i in kept]
+
+    record_relevance_decision(policy, plan, stats, kept, queries)
+    return {
+        "documents": {"documents": filtered_docs},
+        "helpful_documents": list(range(1, len(filtered_docs) + 1)),
+        "working_set": build_working_set(stats, kept, settings.working_set_size),
+    }
+
+
+def _carry_working_set(
+    plan: RelevancePlan, stats: list[CandidateStats], working_set: list[dict]
+) -> RelevancePlan:
+    """Keep the working-set candidates of an incremental follow-up without judging."""
+    carried = {str(item["id"]) for item in working_set}
+    accepted = [i for i, s in enumerate(stats) if s.doc.id in carried]
+    return RelevancePlan(
+        decision=plan.decision,
+        proposed=plan.proposed,
+        accepted=accepted + [i for i in plan.accepted if i not in accepted],
+        judge=[i for i in plan.judge if i not in accepted],
+        rejected=[i for i in plan.rejected if i not in accepted],
+    )
+
+
+def summary_document(doc: Document) -> Document:
+    """
+    Build the compact form of a retrieved document used for relevance judging.
+
+    Args:
+        doc: Retrieved document carrying Pinecone metadata
 
-        temp_doc = Document(
+    Returns:
+        Document whose content is its keywords and summary (the retrieved
+        document itself when the metadata has no summary)
+    """
+    summary = doc.metadata.get("summary")
+    if not summary:
+        return doc
+
+    keywords = doc.metadata.get("keywords") or []
+    if isinstance(keywords, list):
+        keywords = ", ".join(keywords)
+    return Document(
+        id=doc.id,
+        page_content=f"키워드: {keywords}\n요약: {summary}",
+        metadata={
+            "source": doc.metadata.get("source", ""),
+            "title": doc.metadata.get("title", ""),
+        },
+    )
+
+
+async def fetch_full_documents(docs: list[Document], core_client: CoreClient) -> list[Document]:
+    """
+    Fetch the full post content of documents via Core API.
+
+    Args:
+        docs: Retrieved documents (ids are post ids)
+        core_client: CoreClient for fetching post content
+
+    Returns:
+        Documents with full content, in the same order
+    """
+    posts = await asyncio.gather(*(core_client.get_post_content(int(doc.id)) for doc in docs))
+    return [
+        Document(
             page_content=post_data.get("content", ""),
             metadata={
-                "source": post_data.get("url", f"https://cafe.naver.com/cjdckddus/{post_id}"),
+                "source": post_data.get("url", f"https://cafe.naver.com/cjdckddus/{doc.id}"),
                 "title": post_data.get("title", ""),
             },
         )
-        formatted_docs_dict["documents"].append(temp_doc)
+        for doc, post_data in zip(docs, posts)
+    ]
 
-    # Use LLM to filter for relevant documents
-    class DocRelevance(TypedDict):
-        helpful_docs: list[int]
 
-    llm = load_llm(streaming=True)
-    llm = llm.with_structured_output(DocRelevance)
-    temp_docs = format_docs(formatted_docs_dict["documents"])
+def _relevance_context(state: AgentState) -> str:
+    """Deixis block of the relevance prompts (empty without attached content)."""
+    user_attached_content = state.get("user_attached_content")
+    if not user_attached_content:
+        return ""
 
-    system_prompt = DOC_RELEVANCE_PROMPT_TEMPLATE.format(
-        doc_count=len(formatted_docs_dict["documents"])
+    truncated_content = (
+        user_attached_content[:1000] + "..."
+        if len(user_attached_content) > 1000
+        else user_attached_content
     )
-
-    # Add user_attached_content to the prompt if it exists
-    if user_attached_content := state.get("user_attached_content"):
-        truncated_content = (
-            user_attached_content[:1000] + "..."
-            if len(user_attached_content) > 1000
-            else user_attached_content
-        )
-        system_prompt += f"""
+    return f"""
 
 **지시 표현(deixis)**: 사용자의 질문중 '이것', '이 글', '이 내용', '여기' 등과 같이 대상을 가리키는 말이 있다면 'user_attached_content'를 참조하여 무엇을 지칭하는 것인지 파악하세요.
 
@@ -319,6 +759,41 @@ async def documents_handler(state: AgentState, core_client: CoreClient) -> dict:
 </user_attached_content>
 """
 
+
+async def judge_relevance(
+    docs: list[Document], state: AgentState, enough: int | None = None
+) -> list[int]:
+    """
+    Ask the LLM which documents help answer the user's question.
+
+    With settings.relevance_judge_mode == "per_document" each document is
+    judged by its own small call (see judge_relevance_each); otherwise one
+    call judges all of them.
+
+    Args:
+        docs: Documents to judge (full content or summaries)
+        state: Current agent state (messages, user_attached_content)
+        enough: Positives after which per-document judging may stop early
+            (defaults to settings.relevance_judge_enough)
+
+    Returns:
+        0-based indices of helpful documents in the LLM's order, deduplicated
+    """
+    if not docs:
+        return []
+
+    if get_settings().relevance_judge_mode == "per_document":
+        return await judge_relevance_each(docs, state, enough)
+
+    llm = load_llm(streaming=True)
+    llm = llm.with_structured_output(DocRelevance)
+    temp_docs = format_docs(docs)
+
+    system_prompt = DOC_RELEVANCE_PROMPT_TEMPLATE.format(doc_count=len(docs))
+
+    # Add user_attached_content to the prompt if it exists
+    system_prompt += _relevance_context(state)
+
     system_prompt += f"""
 
 {temp_docs}
@@ -329,22 +804,105 @@ async def documents_handler(state: AgentState, core_client: CoreClient) -> dict:
     messages = [{"role": "system", "content": system_prompt}] + get_context_messages(
         state["messages"]
     )
-    response = cast(DocRelevance, await llm.ainvoke(messages))
-
-    # Filter documents based on LLM relevance assessment
-    filtered_docs = []
-    filtered_helpful_docs = []
-
-    if len(response["helpful_docs"]) > 0:
-        for idx in response["helpful_docs"]:
-            if 1 <= idx <= len(formatted_docs_dict["documents"]):
-                filtered_docs.append(formatted_docs_dict["documents"][int(idx - 1)])
-                filtered_helpful_docs.append(len(filtered_docs))
-        filtered_docs_dict = {"documents": filtered_docs}
-    else:
-        filtered_docs_dict = {"documents": []}
+    response = cast(
+        DocRelevance,
+        await memoized(
+            "documents_handler",
+            {"model": get_settings().default_model},
+            DocRelevance,
+            messages,
+            lambda: llm.ainvoke(messages),
+        ),
+    )
+
+    helpful: list[int] = []
+    for idx in response["helpful_docs"]:
+        if 1 <= idx <= len(docs) and idx - 1 not in helpful:
+            helpful.append(int(idx - 1))
+    return helpful
+
+
+async def judge_relevance_each(
+    docs: list[Document], state: AgentState, enough: int | None = None
+) -> list[int]:
+    """
+    Judge documents with concurrent per-document yes/no calls.
+
+    At most settings.relevance_judge_concurrency calls run at once. Judging
+    stops as soon as `enough` documents were judged helpful or the deadline
+    (settings.relevance_judge_deadline_seconds) passes; outstanding calls are
+    cancelled and the documents judged helpful so far are returned. A failed
+    judgment counts as not helpful.
+
+    Args:
+        docs: Documents to judge (full content or summaries)
+        state: Current agent state (messages, user_attached_content)
+        enough: Positives to stop at (defaults to settings.relevance_judge_enough)
 
-    return {"documents": filtered_docs_dict, "helpful_documents": filtered_helpful_docs}
+    Returns:
+        0-based indices of helpful documents, in document order
+    """
+    settings = get_settings()
+    enough = enough if enough is not None else settings.relevance_judge_enough
+    if enough <= 0:
+        return []
+
+    llm = load_llm().with_structured_output(DocJudgment)
+    context = _relevance_context(state)
+    conversation = get_context_messages(state["messages"])
+    semaphore = asyncio.Semaphore(settings.relevance_judge_concurrency)
+
+    params = {"model": settings.default_model}
+
+    async def judge(doc: Document) -> bool:
+        system_prompt = f"{DOC_JUDGMENT_PROMPT}{context}\n\n{format_docs([doc])}"
+        messages = [{"role": "system", "content": system_prompt}] + conversation
+        async with semaphore:
+            response = cast(
+                DocJudgment,
+                await memoized(
+                    "documents_handler",
+                    params,
+                    DocJudgment,
+                    messages,
+                    lambda: llm.ainvoke(messages),
+                ),
+            )
+        return bool(response["helpful"])
+
+    tasks = {asyncio.create_task(judge(doc)): i for i, doc in enumerate(docs)}
+    pending = set(tasks)
+    helpful: list[int] = []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.relevance_judge_deadline_seconds
+    try:
+        while pending and len(helpful) < enough:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    logger.warning(f"Relevance judgment failed: {task.exception()}")
+                    RELEVANCE_JUDGMENTS.labels("error").inc()
+                elif task.result():
+                    helpful.append(tasks[task])
+                    RELEVANCE_JUDGMENTS.labels("helpful").inc()
+                else:
+                    RELEVANCE_JUDGMENTS.labels("not_helpful").inc()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if pending:
+        RELEVANCE_JUDGMENTS.labels("cancelled").inc(len(pending))
+        logger.debug(
+            f"Relevance judging stopped with {len(helpful)} helpful, "
+            f"{len(pending)} of {len(docs)} unjudged"
+        )
+    return sorted(helpful)
 
 
 async def respond_with_docs(state: AgentState, core_client: CoreClient) -> dict:
@@ -361,6 +919,7 @@ async def respond_with_docs(state: AgentState, core_client: CoreClient) -> dict:
     Returns:
         State update with streaming RAG response and answer
     """
+    emit_status("generating")
     llm = load_llm(streaming=True)
 
     # Format retrieved documents
@@ -386,19 +945,6 @@ async def respond_with_docs(state: AgentState, core_client: CoreClient) -> dict:
     prompt = RAG_RESPONSE_PROMPT.format(context=final_context)
     messages = [{"role": "system", "content": prompt}] + get_context_messages(state["messages"])
 
-    # Streaming implementation for real-time RAG response
-    chunks = []
-    async for chunk in llm.astream(messages):
-        chunks.append(chunk)
-
-    # Combine all chunks into final response
-    full_response = AIMessage(content="")
-    if chunks:
-        for chunk in chunks:
-            full_response.content += chunk.content
-            if not full_response.id:
-                full_response.id = chunk.id
-
     # Generate source documents info from helpful_documents (indices) and documents
     source_documents = []
     source_url_mapping = {}
@@ -425,17 +971,18 @@ async def respond_with_docs(state: AgentState, core_client: CoreClient) -> dict:
             except (ValueError, IndexError):
                 continue
 
-    # Replace citation numbers with clickable markdown links
-    processed_content = full_response.content
-
-    def replace_citation(match):
-        citation_num = int(match.group(1))
-        if citation_num in source_url_mapping:
-            return f"[\\[{citation_num}\\]]({source_url_mapping[citation_num]})"
-        return match.group(0)
+    # The SSE stream rewrites the streamed tokens with the same mapping, so
+    # citations arrive as links instead of being re-rendered at the end
+    get_stream_writer()({"citations": source_url_mapping})
+    rewriter = CitationRewriter(source_url_mapping)
 
-    processed_content = re.sub(r"\[(\d+)\]", replace_citation, processed_content)
-    full_response.content = processed_content
+    # Streaming implementation for real-time RAG response
+    full_response = AIMessage(content="")
+    async for chunk in llm.astream(messages):
+        full_response.content += rewriter.feed(chunk.content)
+        if not full_response.id:
+            full_response.id = chunk.id
+    full_response.content += rewriter.flush()
 
     return {
         "messages": [full_response],
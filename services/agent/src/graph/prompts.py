@@ -32,9 +32,9 @@ GENERATE_QUERIES_PROMPT_TEMPLATE = """
 
 최소 2개, 최대 5개의 단어 나열을 반환하시오.
 
-<창플 브랜드>
+<대화에서 언급된 창플 브랜드>
 {goodto_know_brands}
-</창플 브랜드>
+</대화에서 언급된 창플 브랜드>
 """
 
 # User attached content notice for query generation
@@ -56,6 +56,12 @@ DOC_RELEVANCE_PROMPT_TEMPLATE = """
 **문서 번호 범위**: 문서 번호는 1부터 {doc_count}까지만 유효합니다. 이 범위를 벗어나는 번호는 사용하지 마세요.
 """
 
+# Per-document relevance prompt - one yes/no judgment per candidate
+DOC_JUDGMENT_PROMPT = """
+당신은 유능한 AI assistant입니다. 주어진 <documents> 문서가 유저의 질문에 답변하는데 도움이 되는지 판단하세요.
+도움이 된다면 helpful을 true로, 그렇지 않다면 false로 Return하세요.
+"""
+
 # RAG response prompt - main response generation with documents
 RAG_RESPONSE_PROMPT = """
 당신은 초보 창업가들의 든든한 동반자, 창플의 유능한 AI 직원입니다.
@@ -89,6 +95,7 @@ RAG_RESPONSE_PROMPT = """
 
 # Status messages for WebSocket updates
 STATUS_MESSAGES = {
+    "queued": "대기 중입니다 ({position}번째, 약 {wait}초 예상)",
     "analyzing": "어떤 정보가 필요한지 분석하고 있습니다",
     "generating_queries": "검색어를 생성하고 있습니다",
     "retrieving": "관련 문서를 검색하고 있습니다",
@@ -0,0 +1,222 @@
+"""
+Score-based relevance policy for documents_handler.
+
+Decides per turn how much of the candidate set the relevance LLM has to
+judge, from the retrieval scores and ranks the retriever records in
+document metadata (see ScoredRetriever):
+
+- confident: score >= high threshold and retrieved by enough of the
+  generated queries (rank agreement)
+- rejected: score < low threshold
+- ambiguous: everything else, including documents without a score
+
+Decisions:
+
+- skip: enough confident candidates (top_n, or all of them when there are
+  fewer) — the top-N confident documents are kept without an LLM call
+- band: confident documents are kept, rejected ones dropped, and only the
+  ambiguous middle band is judged by the LLM
+- full: every candidate is judged by the LLM
+- empty: no candidates
+
+settings.relevance_policy selects what is applied: "llm" always judges every
+candidate (the policy still runs in shadow and its proposal is recorded),
+"skip" applies skip decisions only, "band" applies skip and band decisions.
+Every turn's decision is logged with the per-candidate scores and the final
+outcome, so the thresholds can be tuned against what the LLM keeps.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+
+from langchain_core.documents import Document
+
+from src.config import get_settings
+from src.services.metrics import RELEVANCE_DECISIONS, RELEVANCE_JUDGED_DOCUMENTS
+
+logger = logging.getLogger(__name__)
+
+POLICY_MODES = ("llm", "skip", "band")
+
+
+@dataclass
+class RelevancePolicy:
+    """Thresholds of the score-based relevance policy."""
+
+    mode: str = "llm"
+    high_score: float = 0.55
+    low_score: float = 0.3
+    min_agreement: int = 2
+    top_n: int = 4
+
+    @classmethod
+    def from_settings(cls) -> "RelevancePolicy":
+        settings = get_settings()
+        mode = settings.relevance_policy
+        if mode not in POLICY_MODES:
+            logger.warning(f"Unknown relevance policy {mode!r}, using 'llm'")
+            mode = "llm"
+        return cls(
+            mode=mode,
+            high_score=settings.relevance_high_score,
+            low_score=settings.relevance_low_score,
+            min_agreement=settings.relevance_min_agreement,
+            top_n=settings.relevance_top_n,
+        )
+
+
+@dataclass
+class CandidateStats:
+    """A deduplicated candidate and its retrieval evidence across queries."""
+
+    doc: Document
+    score: float | None = None
+    hits: int = 0
+    best_rank: int | None = None
+
+
+@dataclass
+class RelevancePlan:
+    """Which candidates (by index) are kept, judged by the LLM, or dropped."""
+
+    decision: str
+    proposed: str
+    accepted: list[int] = field(default_factory=list)
+    judge: list[int] = field(default_factory=list)
+    rejected: list[int] = field(default_factory=list)
+
+
+def candidate_stats(documents: list[Document]) -> list[CandidateStats]:
+    """
+    Deduplicate retrieved documents by id and aggregate their scores.
+
+    Args:
+        documents: Documents of all queries (duplicates across queries)
+
+    Returns:
+        One CandidateStats per document id, in first-retrieved order
+    """
+    candidates: dict[str, CandidateStats] = {}
+    for doc in documents:
+        stats = candidates.setdefault(doc.id, CandidateStats(doc=doc))
+        stats.hits += 1
+        score = doc.metadata.get("score")
+        if score is not None and (stats.score is None or score > stats.score):
+            stats.score = float(score)
+        rank = doc.metadata.get("rank")
+        if rank is not None and (stats.best_rank is None or rank < stats.best_rank):
+            stats.best_rank = int(rank)
+    return list(candidates.values())
+
+
+def _propose(
+    stats: list[CandidateStats], policy: RelevancePolicy, query_count: int
+) -> RelevancePlan:
+    if not stats:
+        return RelevancePlan(decision="empty", proposed="empty")
+
+    # A single query cannot agree with itself more than once
+    agreement = min(policy.min_agreement, max(query_count, 1))
+    confident = sorted(
+        (
+            i
+            for i, s in enumerate(stats)
+            if s.score is not None and s.score >= policy.high_score and s.hits >= agreement
+        ),
+        key=lambda i: stats[i].score,
+        reverse=True,
+    )
+
+    if confident and len(confident) >= min(policy.top_n, len(stats)):
+        accepted = confident[: policy.top_n]
+        rejected = [i for i in range(len(stats)) if i not in accepted]
+        return RelevancePlan(
+            decision="skip", proposed="skip", accepted=accepted, rejected=rejected
+        )
+
+    rejected = [
+        i
+        for i, s in enumerate(stats)
+        if i not in confident and s.score is not None and s.score < policy.low_score
+    ]
+    judge = [i for i in range(len(stats)) if i not in confident and i not in rejected]
+    return RelevancePlan(
+        decision="band", proposed="band", accepted=confident, judge=judge, rejected=rejected
+    )
+
+
+def plan_relevance(
+    stats: list[CandidateStats], policy: RelevancePolicy, query_count: int
+) -> RelevancePlan:
+    """
+    Decide which candidates the relevance LLM has to judge.
+
+    Args:
+        stats: Deduplicated candidates (from candidate_stats)
+        policy: Thresholds and mode
+        query_count: Number of generated queries (for rank agreement)
+
+    Returns:
+        RelevancePlan; `proposed` is the policy's own decision even when the
+        mode overrides it
+    """
+    proposed = _propose(stats, policy, query_count)
+    applied = policy.mode == "band" or (policy.mode == "skip" and proposed.decision == "skip")
+    if applied or proposed.decision == "empty":
+        return proposed
+    return RelevancePlan(
+        decision="full", proposed=proposed.decision, judge=list(range(len(stats)))
+    )
+
+
+def record_relevance_decision(
+    policy: RelevancePolicy,
+    plan: RelevancePlan,
+    stats: list[CandidateStats],
+    kept: list[int],
+    queries: list[str],
+) -> None:
+    """
+    Record a turn's relevance decision for threshold tuning.
+
+    Args:
+        policy: Policy in effect
+        plan: The applied plan
+        stats: Candidates the plan indexes into
+        kept: Candidate indices in the final document set
+        queries: Generated search queries
+    """
+    RELEVANCE_DECISIONS.labels(policy.mode, plan.decision, plan.proposed).inc()
+    RELEVANCE_JUDGED_DOCUMENTS.observe(len(plan.judge))
+
+    # Proposed treatment of each candidate, to compare with what was kept
+    proposed = _propose(stats, policy, len(queries)) if plan.decision == "full" else plan
+    treatment = {i: "accept" for i in proposed.accepted}
+    treatment.update({i: "reject" for i in proposed.rejected})
+    kept_set = set(kept)
+    record = {
+        "mode": policy.mode,
+        "decision": plan.decision,
+        "proposed": plan.proposed,
+        "thresholds": {
+            "high": policy.high_score,
+            "low": policy.low_score,
+            "agreement": policy.min_agreement,
+            "top_n": policy.top_n,
+        },
+        "queries": len(queries),
+        "judged": len(plan.judge),
+        "candidates": [
+            {
+                "id": s.doc.id,
+                "score": s.score,
+                "hits": s.hits,
+                "rank": s.best_rank,
+                "proposed": treatment.get(i, "judge"),
+                "kept": i in kept_set,
+            }
+            for i, s in enumerate(stats)
+        ],
+    }
+    logger.info(f"relevance_decision {json.dumps(record, ensure_ascii=False)}")
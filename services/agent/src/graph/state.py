@@ -6,7 +6,7 @@ service-oriented architecture.
 """
 
 from dataclasses import dataclass, field
-from typing import Annotated, Literal, Optional, Union
+from typing import Annotated, Literal, Optional, TypedDict, Union
 
 from langchain_core.documents import Document
 from langgraph.graph import MessagesState
@@ -24,6 +24,24 @@ class Router(BaseModel):
     type: Literal["retrieval_required", "just_respond"]
 
 
+class QueryResponse(TypedDict):
+    """Structured output of generate_queries."""
+
+    maximum_five_queries: list[str]
+
+
+class DocRelevance(TypedDict):
+    """Structured output of documents_handler (1-based helpful document indices)."""
+
+    helpful_docs: list[int]
+
+
+class DocJudgment(TypedDict):
+    """Structured output of a per-document relevance judgment."""
+
+    helpful: bool
+
+
 @dataclass(kw_only=True)
 class QueryState:
     """
@@ -81,6 +99,10 @@ class AgentState(MessagesState):
         allowed_authors: List of authors to filter documents by
         user_attached_content: Content attached by user (from NotionContent)
         source_documents: Source document metadata for citations
+        retrieval_done: generate_queries already retrieved documents (incremental mode)
+        attachment_documents: Posts retrieved with the attachments' vectors (set per turn)
+        working_set: Documents ({"id", "score"}) kept by the thread's last RAG turn
+        followup: Follow-up decision of the turn ("fresh", "incremental" or "reuse")
     """
 
     router: Router = field(default_factory=lambda: Router(type="retrieval_required"))
@@ -92,3 +114,7 @@ class AgentState(MessagesState):
     allowed_authors: list[str] = field(default_factory=list)
     user_attached_content: Optional[str] = field(default=None)
     source_documents: list[dict] = field(default_factory=list)
+    retrieval_done: bool = field(default=False)
+    attachment_documents: list[Document] = field(default_factory=list)
+    working_set: list[dict] = field(default_factory=list)
+    followup: str = field(default="fresh")
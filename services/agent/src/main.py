@@ -2,7 +2,9 @@
 FastAPI application for Changple Agent Service.
 """
 
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 import httpx
@@ -10,8 +12,22 @@ import redis.asyncio as redis
 from fastapi import FastAPI
 from psycopg_pool import AsyncConnectionPool
 
-from src.api.router import api_router
-from src.config import get_settings
+from src.config import get_settings, per_worker
+from src.services.metrics import httpx_event_hooks, mark_worker_exit, register_pool_collector
+from src.tracing import (
+    configure_tracing,
+    instrument_fastapi,
+    instrument_httpx_client,
+    shutdown_tracing,
+)
+
+# The router pulls in LangGraph, LangChain and the provider SDKs, which
+# dominate cold start; timed for the startup log
+_imports_started = time.perf_counter()
+from src.api.router import api_router  # noqa: E402
+from src.warmup import Readiness, warm_up  # noqa: E402
+
+IMPORT_SECONDS = time.perf_counter() - _imports_started
 
 # Configure logging
 logging.basicConfig(
@@ -30,36 +46,54 @@ async def lifespan(app: FastAPI):
     - PostgreSQL connection pool (for LangGraph checkpointer)
     - Redis client (for stop_generation flags)
     - httpx client (for Core API calls)
+
+    Runs once per worker; pools are sized so that all workers together stay
+    within the configured Postgres/Redis/Core connection budgets.
     """
     settings = get_settings()
-    logger.info("Starting Changple Agent Service...")
+    logger.info(f"Starting Changple Agent Service (application imports took {IMPORT_SECONDS:.2f}s)")
 
     # Initialize PostgreSQL pool for LangGraph checkpointer
     logger.info("Initializing PostgreSQL connection pool...")
+    pool_max = per_worker(settings.postgres_pool_budget, minimum=2)
     pool = AsyncConnectionPool(
         settings.langgraph_database_url,
-        min_size=2,
-        max_size=20,
+        min_size=min(2, pool_max),
+        max_size=pool_max,
         timeout=300,
         open=False,
     )
     await pool.open()
     app.state.pool = pool
-    logger.info("PostgreSQL pool initialized")
+    register_pool_collector(pool)
+    logger.info(f"PostgreSQL pool initialized (max_size={pool_max})")
 
     # Initialize Redis client
     logger.info("Initializing Redis client...")
-    redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    # Blocking pool: callers wait for a free connection instead of failing
+    redis_pool = redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=per_worker(settings.redis_connection_budget, minimum=4),
+        timeout=10,
+        decode_responses=True,
+    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     app.state.redis = redis_client
-    logger.info("Redis client initialized")
+    logger.info(f"Redis client initialized (max_connections={redis_pool.max_connections})")
 
     # Initialize httpx client for Core API calls
     logger.info("Initializing httpx client...")
+    core_connections = per_worker(settings.core_connection_budget, minimum=4)
     httpx_client = httpx.AsyncClient(
         base_url=settings.core_service_url,
         timeout=httpx.Timeout(30.0),
-        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        limits=httpx.Limits(
+            max_keepalive_connections=max(1, core_connections // 2),
+            max_connections=core_connections,
+        ),
+        event_hooks=httpx_event_hooks("core"),
     )
+    instrument_httpx_client(httpx_client)
     app.state.httpx = httpx_client
     logger.info("httpx client initialized")
 
@@ -74,6 +108,17 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to setup checkpointer: {e}")
         raise
 
+    # Warm up in the background: /health answers now, /ready once warm
+    readiness = Readiness()
+    app.state.readiness = readiness
+    warmup_task = None
+    if settings.warmup_enabled:
+        warmup_task = asyncio.create_task(warm_up(app, readiness))
+    else:
+        readiness.finished = True
+        for name in readiness.required:
+            readiness.mark(name, 0.0)
+
     logger.info("Changple Agent Service started successfully")
 
     yield
@@ -81,18 +126,29 @@ async def lifespan(app: FastAPI):
     # Cleanup
     logger.info("Shutting down Changple Agent Service...")
 
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+
     await httpx_client.aclose()
     logger.info("httpx client closed")
 
     await redis_client.aclose()
+    await redis_pool.aclose()
     logger.info("Redis client closed")
 
     await pool.close()
     logger.info("PostgreSQL pool closed")
 
+    shutdown_tracing()
+    mark_worker_exit()
+
     logger.info("Changple Agent Service shutdown complete")
 
 
+# Configure tracing before the app is created so the middleware can be added
+_settings = get_settings()
+configure_tracing("changple-agent", _settings.tracing_exporter, _settings.tracing_file_path)
+
 # Create FastAPI app
 app = FastAPI(
     title="Changple Agent Service",
@@ -103,3 +159,5 @@ app = FastAPI(
 
 # Include routers
 app.include_router(api_router)
+
+instrument_fastapi(app)
@@ -0,0 +1 @@
+"""LLM and embedding providers for Agent service."""
@@ -0,0 +1,376 @@
+"""
+Deterministic fake chat model and embeddings for offline benchmarking.
+
+Latency is driven by a JSON profile (FAKE_LATENCY_PROFILE):
+
+    {
+        "seed": 42,
+        "default": {
+            "first_token_ms": 400, "first_token_jitter_ms": 150,
+            "token_ms": 20, "token_jitter_ms": 5,
+            "structured_ms": 600, "structured_jitter_ms": 200,
+            "response_tokens": 150, "error_rate": 0.0
+        },
+        "models": {"gemini-2.0-flash": {"first_token_ms": 250}},
+        "embedding": {"latency_ms": 80, "jitter_ms": 20, "error_rate": 0.0}
+    }
+
+Delays and injected errors are drawn from a sequence seeded by the profile
+seed (reproducible for the same call order); generated content is seeded by
+the prompt text, so the same input always yields the same output.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import random
+import time
+import typing
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+# Korean filler so prompt sizes and chunk contents resemble production
+FILLER = "창업 초기에는 상권 분석과 메뉴 구성이 가장 중요합니다. "
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure (stands in for 429/5xx responses)."""
+
+
+@dataclass(frozen=True)
+class ChatLatency:
+    """Latency and failure parameters of a fake chat model."""
+
+    first_token_ms: float = 400.0
+    first_token_jitter_ms: float = 0.0
+    token_ms: float = 20.0
+    token_jitter_ms: float = 0.0
+    structured_ms: float = 600.0
+    structured_jitter_ms: float = 0.0
+    response_tokens: int = 150
+    error_rate: float = 0.0
+
+
+@dataclass(frozen=True)
+class EmbeddingLatency:
+    """Latency and failure parameters of fake embeddings."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Parsed latency profile."""
+
+    seed: int = 0
+    default: ChatLatency = ChatLatency()
+    models: tuple[tuple[str, ChatLatency], ...] = ()
+    embedding: EmbeddingLatency = EmbeddingLatency()
+
+    def for_model(self, model_name: str) -> ChatLatency:
+        """Latency parameters for a model (falls back to the default)."""
+        return dict(self.models).get(model_name, self.default)
+
+
+def _pick(cls, data: dict, base: Any = None) -> Any:
+    """Build a dataclass from a dict, ignoring unknown keys."""
+    values = {f.name: getattr(base, f.name) for f in fields(cls)} if base else {}
+    values.update({k: v for k, v in data.items() if k in {f.name for f in fields(cls)}})
+    return cls(**values)
+
+
+@lru_cache
+def load_latency_profile(path: str) -> LatencyProfile:
+    """
+    Load a latency profile from a JSON file.
+
+    Args:
+        path: Profile path; empty returns a zero-jitter default profile
+
+    Returns:
+        LatencyProfile
+    """
+    if not path:
+        return LatencyProfile()
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    default = _pick(ChatLatency, data.get("default", {}))
+    models = tuple(
+        (name, _pick(ChatLatency, overrides, base=default))
+        for name, overrides in data.get("models", {}).items()
+    )
+    logger.info(f"Loaded fake latency profile {path}")
+    return LatencyProfile(
+        seed=int(data.get("seed", 0)),
+        default=default,
+        models=models,
+        embedding=_pick(EmbeddingLatency, data.get("embedding", {})),
+    )
+
+
+# Call counter feeding the latency/error draws
+_calls = itertools.count()
+
+
+def _rng(seed: int, *parts: str) -> random.Random:
+    """Random generator seeded from the profile seed and the given parts."""
+    digest = hashlib.sha256("\x1f".join((str(seed),) + parts).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _delay(rng: random.Random, mean_ms: float, jitter_ms: float) -> float:
+    """Draw a non-negative delay in seconds."""
+    if jitter_ms <= 0:
+        return max(0.0, mean_ms / 1000)
+    return max(0.0, rng.gauss(mean_ms, jitter_ms) / 1000)
+
+
+def _prompt_text(value: Any) -> str:
+    """Stable text form of a model input for seeding."""
+    if isinstance(value, list):
+        return "\n".join(_prompt_text(v) for v in value)
+    if isinstance(value, BaseMessage):
+        return str(value.content)
+    if isinstance(value, dict) and "content" in value:
+        return str(value["content"])
+    if hasattr(value, "to_string"):
+        return value.to_string()
+    return str(value)
+
+
+def fill_schema(schema: Any, rng: random.Random) -> Any:
+    """
+    Build a plausible instance of a structured-output schema.
+
+    Literal fields take their first value (so Router always asks for
+    retrieval), list[int] fields get a few 1-based document indices and string
+    lists get short Korean queries/keywords.
+    """
+    values = {}
+    for name, annotation in typing.get_type_hints(schema).items():
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Literal:
+            values[name] = args[0]
+        elif origin in (list, typing.List) and args and args[0] is int:
+            values[name] = sorted(rng.sample(range(1, 6), 3))
+        elif origin in (list, typing.List):
+            count = 10 if "ten" in name else 5 if "five" in name else 3
+            values[name] = [f"상권 분석 메뉴 {rng.randint(1, 99)}" for _ in range(count)]
+        elif annotation is bool:
+            values[name] = True
+        elif annotation is int:
+            values[name] = rng.randint(1, 5)
+        else:
+            values[name] = FILLER * 5
+
+    if hasattr(schema, "model_validate"):
+        return schema.model_validate(values)
+    return values
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model streaming filler tokens according to a latency profile."""
+
+    model: str = "fake"
+    latency: ChatLatency = ChatLatency()
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model}
+
+    def _get_ls_params(self, stop: list[str] | None = None, **kwargs: Any):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_model_name"] = self.model
+        return params
+
+    def _plan(self, messages: list[BaseMessage]) -> tuple[float, list[float], list[str]]:
+        """Draw first-token delay, per-token delays and tokens for a prompt."""
+        rng = _rng(self.seed, self.model, str(next(_calls)))
+        if rng.random() < self.latency.error_rate:
+            raise FakeProviderError(f"{self.model}: 429 Resource exhausted (injected)")
+
+        words = (FILLER * (self.latency.response_tokens // 5 + 1)).split(" ")
+        tokens = [f"{word} " for word in words[: self.latency.response_tokens]]
+        if len(tokens) > 2:
+            # Cite a couple of documents so citation handling has work to do
+            tokens[len(tokens) // 2] += "[1] "
+            tokens[-1] += "[2]"
+
+        first = _delay(rng, self.latency.first_token_ms, self.latency.first_token_jitter_ms)
+        gaps = [
+            _delay(rng, self.latency.token_ms, self.latency.token_jitter_ms) for _ in tokens
+        ]
+        return first, gaps, tokens
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        first, gaps, tokens = self._plan(messages)
+        time.sleep(first + sum(gaps))
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        first, gaps, tokens = self._plan(messages)
+        await asyncio.sleep(first + sum(gaps))
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        first, gaps, tokens = self._plan(messages)
+        time.sleep(first)
+        for token, gap in zip(tokens, gaps):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            time.sleep(gap)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        first, gaps, tokens = self._plan(messages)
+        await asyncio.sleep(first)
+        for token, gap in zip(tokens, gaps):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            await asyncio.sleep(gap)
+
+    def with_structured_output(self, schema: Any, *, include_raw: bool = False, **kwargs: Any):
+        """Return a runnable producing a schema instance after structured_ms."""
+        return FakeStructuredOutput(model=self, schema=schema, include_raw=include_raw)
+
+
+class FakeStructuredOutput(Runnable):
+    """
+    Structured output of FakeChatModel.
+
+    astream() reveals list fields of dict (TypedDict) results one item at a
+    time across structured_ms, like partial JSON parsing of a streamed
+    provider response, unless the model has disable_streaming set (then,
+    like a real provider, it yields the complete result once);
+    invoke/ainvoke return the complete result.
+    """
+
+    def __init__(self, model: FakeChatModel, schema: Any, include_raw: bool):
+        self.model = model
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def _build(self, value: Any) -> tuple[float, Any]:
+        model, latency = self.model, self.model.latency
+        rng = _rng(model.seed, model.model, str(next(_calls)))
+        if rng.random() < latency.error_rate:
+            raise FakeProviderError(f"{model.model}: 429 Resource exhausted (injected)")
+        delay = _delay(rng, latency.structured_ms, latency.structured_jitter_ms)
+        parsed = fill_schema(self.schema, _rng(model.seed, _prompt_text(value)))
+        if self.include_raw:
+            raw = AIMessage(content=json.dumps(_as_dict(parsed), ensure_ascii=False))
+            return delay, {"raw": raw, "parsed": parsed, "parsing_error": None}
+        return delay, parsed
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        delay, result = self._build(input)
+        time.sleep(delay)
+        return result
+
+    async def ainvoke(
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> Any:
+        delay, result = self._build(input)
+        await asyncio.sleep(delay)
+        return result
+
+    async def astream(
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        delay, result = self._build(input)
+        lists = {}
+        if isinstance(result, dict) and not self.include_raw:
+            lists = {k: v for k, v in result.items() if isinstance(v, list)}
+        steps = max((len(v) for v in lists.values()), default=0)
+        if not steps or self.model.disable_streaming:
+            await asyncio.sleep(delay)
+            yield result
+            return
+
+        for step in range(1, steps + 1):
+            await asyncio.sleep(delay / steps)
+            yield {**result, **{k: v[:step] for k, v in lists.items()}}
+
+
+def _as_dict(value: Any) -> Any:
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """Deterministic hash-seeded embeddings with profile latency."""
+
+    latency: EmbeddingLatency = EmbeddingLatency()
+    seed: int = 0
+
+    def _wait_time(self, texts: list[str]) -> float:
+        rng = _rng(self.seed, "embedding", str(next(_calls)))
+        if rng.random() < self.latency.error_rate:
+            raise FakeProviderError("embeddings: 429 Too Many Requests (injected)")
+        return _delay(rng, self.latency.latency_ms, self.latency.jitter_ms)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(self._wait_time(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(self._wait_time([text]))
+        return super().embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(self._wait_time(texts))
+        return super().embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        await asyncio.sleep(self._wait_time([text]))
+        return super().embed_query(text)
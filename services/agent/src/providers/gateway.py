@@ -0,0 +1,513 @@
+"""
+Provider gateway for chat model calls.
+
+Every chat model returned by get_chat_model is wrapped in GatewayChatModel,
+which:
+
+- waits for a per-model slot: a semaphore bounding concurrent calls plus
+  token buckets for requests-per-minute and (estimated) tokens-per-minute
+- records queue time and in-flight calls
+- falls back to a secondary model when the primary fails, and hedges to it
+  when the primary has not produced a structured or non-streaming result
+  within LLM_HEDGE_AFTER_SECONDS (a first streamed token within
+  LLM_HEDGE_AFTER_SECONDS_STREAMING, off by default: long RAG prompts are
+  routinely slower than that and hedging them doubles load at peak);
+  whichever answers first wins
+- marks a model degraded after repeated fallbacks or queue timeouts, so
+  callers with a cheaper path (e.g. local query expansion) can skip it
+
+The inner models are called without callbacks, so stream events and
+metrics are emitted once, by the wrapper.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from src.config import get_settings, per_worker
+from src.services.metrics import LLM_FALLBACKS, LLM_INFLIGHT, LLM_QUEUE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Inner calls must not re-emit events already emitted by the wrapper
+_SILENT: RunnableConfig = {"callbacks": []}
+
+
+class GatewayQueueTimeout(Exception):
+    """No gateway slot became available within the queue timeout."""
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token estimate of a prompt (Korean text averages ~2 chars/token)."""
+    if isinstance(value, list):
+        return sum(estimate_tokens(v) for v in value)
+    if isinstance(value, BaseMessage):
+        return estimate_tokens(value.content)
+    if hasattr(value, "to_messages"):
+        return estimate_tokens(value.to_messages())
+    if isinstance(value, dict):
+        return estimate_tokens(value.get("content", ""))
+    return max(1, len(str(value)) // 2)
+
+
+# =============================================================================
+# Limits
+# =============================================================================
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `per_minute` / 60 per second."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self, amount: float) -> None:
+        """Wait until `amount` tokens are available and consume them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+@dataclass
+class ModelLimiter:
+    """Concurrency and rate limits of a single model."""
+
+    semaphore: asyncio.Semaphore
+    requests: TokenBucket | None
+    tokens: TokenBucket | None
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        await self.semaphore.acquire()
+        try:
+            if self.requests:
+                await self.requests.take(1)
+            if self.tokens:
+                await self.tokens.take(estimated_tokens)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+
+class ProviderGateway:
+    """Per-process registry of model limiters."""
+
+    def __init__(
+        self,
+        limits: dict[str, dict],
+        queue_timeout: float,
+        degraded_events: int = 3,
+        degraded_window: float = 60.0,
+    ):
+        self.limits = limits
+        self.queue_timeout = queue_timeout
+        self.degraded_events = degraded_events
+        self.degraded_window = degraded_window
+        self._limiters: dict[str, ModelLimiter] = {}
+        self._failures: dict[str, deque[float]] = {}
+
+    def record_failure(self, model: str) -> None:
+        """Record a fallback or queue timeout of `model`."""
+        failures = self._failures.setdefault(model, deque(maxlen=max(self.degraded_events, 1)))
+        failures.append(time.monotonic())
+
+    def is_degraded(self, model: str) -> bool:
+        """Whether `model` had degraded_events failures within degraded_window."""
+        failures = self._failures.get(model)
+        if not failures or len(failures) < self.degraded_events:
+            return False
+        return time.monotonic() - failures[0] <= self.degraded_window
+
+    def _limiter(self, model: str) -> ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            config = self.limits.get(model) or self.limits.get("default", {})
+            rpm, tpm = config.get("rpm"), config.get("tpm")
+            limiter = ModelLimiter(
+                semaphore=asyncio.Semaphore(config.get("max_concurrency", 16)),
+                requests=TokenBucket(rpm) if rpm else None,
+                tokens=TokenBucket(tpm) if tpm else None,
+            )
+            self._limiters[model] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, model: str, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        Hold a call slot for `model`.
+
+        Raises:
+            GatewayQueueTimeout: If no slot is available within queue_timeout
+        """
+        limiter = self._limiter(model)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(limiter.acquire(estimated_tokens), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.record_failure(model)
+            raise GatewayQueueTimeout(f"No {model} slot within {self.queue_timeout}s")
+        LLM_QUEUE_SECONDS.labels(model).observe(time.perf_counter() - started)
+
+        LLM_INFLIGHT.labels(model).inc()
+        try:
+            yield
+        finally:
+            LLM_INFLIGHT.labels(model).dec()
+            limiter.release()
+
+
+_gateway: ProviderGateway | None = None
+
+
+def get_gateway() -> ProviderGateway:
+    """Get the process-wide gateway."""
+    global _gateway
+    if _gateway is None:
+        settings = get_settings()
+        # Limits are provider-side totals; each worker process gets its share
+        limits = {
+            model: {key: per_worker(value) for key, value in config.items()}
+            for model, config in settings.llm_model_limits.items()
+        }
+        _gateway = ProviderGateway(
+            limits,
+            settings.llm_queue_timeout_seconds,
+            degraded_events=settings.llm_degraded_events,
+            degraded_window=settings.llm_degraded_window_seconds,
+        )
+    return _gateway
+
+
+# =============================================================================
+# Hedging helpers
+# =============================================================================
+
+
+async def _cancel(task: asyncio.Future) -> None:
+    """Cancel a task and wait for it to unwind."""
+    task.cancel()
+    with suppress(BaseException):
+        await task
+
+
+def _succeeded(task: asyncio.Future) -> bool:
+    """Whether a finished task produced a result (an exhausted stream counts: empty)."""
+    exception = task.exception()
+    return exception is None or isinstance(exception, StopAsyncIteration)
+
+
+async def _race(
+    primary: asyncio.Future,
+    start_fallback: Callable[[], asyncio.Future],
+    hedge_after: float,
+) -> tuple[str, asyncio.Future, str | None]:
+    """
+    Wait for the primary; start the fallback if it fails or is too slow.
+
+    A stream that ends without yielding (StopAsyncIteration from its first
+    __anext__) is a successful, empty result, not a failure.
+
+    Returns:
+        Tuple of (winner "primary"/"fallback", winning task, fallback reason)
+    """
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_after or None)
+        if primary in done and _succeeded(primary):
+            return "primary", primary, None
+
+        reason = "error" if primary in done else "slow_first_token"
+        if reason == "error":
+            logger.warning(f"Primary model failed, falling back: {primary.exception()}")
+        fallback = start_fallback()
+        pending = {fallback} if primary in done else {primary, fallback}
+
+        failure = primary.exception() if primary in done else None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if _succeeded(task):
+                    return ("primary" if task is primary else "fallback"), task, reason
+                failure = task.exception()
+        raise failure
+    finally:
+        # Losers (or everything, if the caller was cancelled) stop holding slots
+        for task in pending:
+            if not task.done():
+                await _cancel(task)
+
+
+# =============================================================================
+# Chat model wrapper
+# =============================================================================
+
+
+class GatewayChatModel(BaseChatModel):
+    """Chat model routed through the provider gateway with fallback/hedging."""
+
+    primary: BaseChatModel
+    primary_name: str
+    fallback: BaseChatModel | None = None
+    fallback_name: str | None = None
+    hedge_after: float = 0.0
+    stream_hedge_after: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "gateway"
+
+    def _get_ls_params(self, stop: list[str] | None = None, **kwargs: Any):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_model_name"] = self.primary_name
+        return params
+
+    def _record_fallback(self, reason: str | None) -> None:
+        LLM_FALLBACKS.labels(self.primary_name, self.fallback_name, reason or "error").inc()
+        get_gateway().record_failure(self.primary_name)
+        logger.info(f"{self.primary_name} → {self.fallback_name} ({reason})")
+
+    async def _call(
+        self,
+        name: str,
+        estimate: int,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        async with get_gateway().slot(name, estimate):
+            return await call()
+
+    async def _hedged(
+        self,
+        estimate: int,
+        primary_call: Callable[[], Awaitable[Any]],
+        fallback_call: Callable[[], Awaitable[Any]] | None,
+    ) -> Any:
+        """Run a non-streaming call with fallback and hedging."""
+        if fallback_call is None:
+            return await self._call(self.primary_name, estimate, primary_call)
+
+        primary = asyncio.ensure_future(self._call(self.primary_name, estimate, primary_call))
+        winner, task, reason = await _race(
+            primary,
+            lambda: asyncio.ensure_future(
+                self._call(self.fallback_name, estimate, fallback_call)
+            ),
+            self.hedge_after,
+        )
+        if winner == "fallback":
+            self._record_fallback(reason)
+        return task.result()
+
+    # -------------------------------------------------------------------------
+    # Non-streaming
+    # -------------------------------------------------------------------------
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Sync calls are not used on the request path; no limits, plain fallback
+        try:
+            message = self.primary.invoke(messages, config=_SILENT, stop=stop, **kwargs)
+        except Exception:
+            if self.fallback is None:
+                raise
+            self._record_fallback("error")
+            message = self.fallback.invoke(messages, config=_SILENT, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        fallback_call = None
+        if self.fallback is not None:
+
+            def fallback_call():
+                return self.fallback.ainvoke(messages, config=_SILENT, stop=stop, **kwargs)
+
+        message = await self._hedged(
+            estimate_tokens(messages),
+            lambda: self.primary.ainvoke(messages, config=_SILENT, stop=stop, **kwargs),
+            fallback_call,
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    # -------------------------------------------------------------------------
+    # Streaming
+    # -------------------------------------------------------------------------
+
+    async def _model_stream(
+        self,
+        name: str,
+        model: BaseChatModel,
+        messages: list[BaseMessage],
+        stop: list[str] | None,
+        estimate: int,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async with get_gateway().slot(name, estimate):
+            async for chunk in model.astream(messages, config=_SILENT, stop=stop, **kwargs):
+                yield ChatGenerationChunk(message=chunk)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        for chunk in self.primary.stream(messages, config=_SILENT, stop=stop, **kwargs):
+            generation_chunk = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=generation_chunk)
+            yield generation_chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        estimate = estimate_tokens(messages)
+        primary_iter = self._model_stream(
+            self.primary_name, self.primary, messages, stop, estimate, **kwargs
+        )
+        stream = primary_iter
+
+        if self.fallback is None:
+            try:
+                chunk = await primary_iter.__anext__()
+            except StopAsyncIteration:
+                return
+        else:
+            first = asyncio.ensure_future(primary_iter.__anext__())
+            fallback_iter = self._model_stream(
+                self.fallback_name, self.fallback, messages, stop, estimate, **kwargs
+            )
+            winner, task, reason = await _race(
+                first,
+                lambda: asyncio.ensure_future(fallback_iter.__anext__()),
+                self.stream_hedge_after,
+            )
+
+            if winner == "fallback":
+                self._record_fallback(reason)
+                stream = fallback_iter
+                await primary_iter.aclose()
+            else:
+                await fallback_iter.aclose()
+            try:
+                chunk = task.result()
+            except StopAsyncIteration:
+                # The winner's stream was empty
+                await stream.aclose()
+                return
+
+        # Close the inner stream (and release its slot) even if the consumer stops early
+        try:
+            while True:
+                if run_manager:
+                    await run_manager.on_llm_new_token(str(chunk.message.content), chunk=chunk)
+                yield chunk
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+        finally:
+            await stream.aclose()
+
+    # -------------------------------------------------------------------------
+    # Structured output
+    # -------------------------------------------------------------------------
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        """Structured output with the same limits, fallback and hedging."""
+        primary = self.primary.with_structured_output(schema, **kwargs)
+        fallback = (
+            self.fallback.with_structured_output(schema, **kwargs) if self.fallback else None
+        )
+
+        # No wrapper chat-model run exists here, so the inner calls keep the
+        # caller's callbacks (metrics and tracing see each provider call)
+        def invoke(value: Any, config: RunnableConfig) -> Any:
+            try:
+                return primary.invoke(value, config=config)
+            except Exception:
+                if fallback is None:
+                    raise
+                self._record_fallback("error")
+                return fallback.invoke(value, config=config)
+
+        async def ainvoke(value: Any, config: RunnableConfig) -> Any:
+            fallback_call = None
+            if fallback is not None:
+
+                def fallback_call():
+                    return fallback.ainvoke(value, config=config)
+
+            return await self._hedged(
+                estimate_tokens(value),
+                lambda: primary.ainvoke(value, config=config),
+                fallback_call,
+            )
+
+        return RunnableLambda(invoke, afunc=ainvoke, name=f"{self.primary_name}_structured")
+
+    async def astream_structured(
+        self, schema: Any, value: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Stream partial structured results within a gateway slot.
+
+        Falls back to the secondary model only if the primary fails before
+        yielding anything; no hedging (partials cannot be merged across models).
+        """
+        candidates = [(self.primary_name, self.primary)]
+        if self.fallback is not None:
+            candidates.append((self.fallback_name, self.fallback))
+        estimate = estimate_tokens(value)
+
+        for attempt, (name, model) in enumerate(candidates):
+            runnable = model.with_structured_output(schema, **kwargs)
+            yielded = False
+            try:
+                async with get_gateway().slot(name, estimate):
+                    async for partial in runnable.astream(value, config=config):
+                        yielded = True
+                        yield partial
+                return
+            except Exception as e:
+                if yielded or attempt == len(candidates) - 1:
+                    raise
+                logger.warning(f"{name} structured stream failed, falling back: {e}")
+                self._record_fallback("error")
@@ -0,0 +1,166 @@
+"""
+Chat model and embedding factories selected by settings.
+
+LLM_PROVIDER chooses between Google Gemini ("google") and the local fake
+("fake"); EMBEDDING_PROVIDER between OpenAI ("openai") and the fake. The fakes
+follow the latency profile at FAKE_LATENCY_PROFILE.
+
+Chat models are wrapped in the provider gateway (src.providers.gateway) for
+per-model limits and fallback unless LLM_GATEWAY_ENABLED is false.
+"""
+
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import OpenAIEmbeddings
+
+from src.config import get_settings
+from src.providers.fake import FakeChatModel, FakeEmbeddings, load_latency_profile
+from src.providers.gateway import GatewayChatModel
+from src.services.metrics import observe_dependency
+
+
+class TimedOpenAIEmbeddings(OpenAIEmbeddings):
+    """OpenAIEmbeddings that records async embedding latency."""
+
+    async def aembed_query(self, text: str) -> list[float]:
+        async with observe_dependency("openai", "embed_query"):
+            return await super().aembed_query(text)
+
+    async def aembed_documents(self, texts: list[str], chunk_size: int | None = None):
+        async with observe_dependency("openai", "embed_documents"):
+            return await super().aembed_documents(texts, chunk_size=chunk_size)
+
+
+def _create_chat_model(model_name: str, temperature: float, streaming: bool) -> BaseChatModel:
+    """Create an unwrapped chat model for the configured provider."""
+    settings = get_settings()
+
+    if settings.llm_provider == "fake":
+        profile = load_latency_profile(settings.fake_latency_profile)
+        return FakeChatModel(
+            model=model_name,
+            latency=profile.for_model(model_name),
+            seed=profile.seed,
+            disable_streaming=not streaming,
+        )
+
+    if settings.llm_provider == "google":
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            temperature=temperature,
+            disable_streaming=not streaming,
+            google_api_key=settings.google_api_key,
+        )
+
+    raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
+
+
+def get_chat_model(
+    model_name: str | None = None,
+    temperature: float = 0,
+    streaming: bool = False,
+) -> BaseChatModel:
+    """
+    Get a chat model for the configured provider.
+
+    Cached per (model, temperature, streaming) so provider clients and their
+    connections are reused across turns.
+
+    Args:
+        model_name: Model to use (defaults to settings.default_model)
+        temperature: Randomness in generation (0-1)
+        streaming: Whether to enable streaming responses
+
+    Returns:
+        Chat model, wrapped in the provider gateway when enabled
+
+    Raises:
+        ValueError: If settings.llm_provider is unknown
+    """
+    model_name = model_name or get_settings().default_model
+    return _cached_chat_model(model_name, float(temperature), bool(streaming))
+
+
+@lru_cache
+def _cached_chat_model(model_name: str, temperature: float, streaming: bool) -> BaseChatModel:
+    settings = get_settings()
+    primary = _create_chat_model(model_name, temperature, streaming)
+    if not settings.llm_gateway_enabled:
+        return primary
+
+    fallback_name = settings.llm_fallback_models.get(model_name)
+    return GatewayChatModel(
+        primary=primary,
+        primary_name=model_name,
+        fallback=(
+            _create_chat_model(fallback_name, temperature, streaming) if fallback_name else None
+        ),
+        fallback_name=fallback_name,
+        hedge_after=settings.llm_hedge_after_seconds,
+        stream_hedge_after=settings.llm_hedge_after_seconds_streaming,
+        disable_streaming=not streaming,
+    )
+
+
+async def astream_structured(
+    model: BaseChatModel, schema: Any, value: Any, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Stream partial structured-output results (growing dicts for TypedDicts).
+
+    Args:
+        model: Chat model from get_chat_model (gateway-wrapped or not)
+        schema: Structured output schema
+        value: Model input
+        **kwargs: Passed to with_structured_output
+
+    Yields:
+        Partial results; the last one is complete
+    """
+    if isinstance(model, GatewayChatModel):
+        stream = model.astream_structured(schema, value, **kwargs)
+    else:
+        stream = model.with_structured_output(schema, **kwargs).astream(value)
+    async for partial in stream:
+        yield partial
+
+
+@lru_cache
+def get_embeddings() -> Embeddings:
+    """
+    Get embeddings for the configured provider (cached).
+
+    Returns:
+        Configured Embeddings instance
+
+    Raises:
+        ValueError: If settings.embedding_provider is unknown
+    """
+    settings = get_settings()
+
+    if settings.embedding_provider == "fake":
+        profile = load_latency_profile(settings.fake_latency_profile)
+        return FakeEmbeddings(
+            size=settings.fake_embedding_dimensions,
+            latency=profile.embedding,
+            seed=profile.seed,
+        )
+
+    if settings.embedding_provider == "openai":
+        return TimedOpenAIEmbeddings(
+            model=settings.embedding_model,
+            chunk_size=200,
+            api_key=settings.openai_api_key,
+        )
+
+    raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+
+
+def clear_model_cache() -> None:
+    """Drop cached chat models and embeddings (after settings change)."""
+    _cached_chat_model.cache_clear()
+    get_embeddings.cache_clear()
@@ -36,6 +36,8 @@ class SSEStatusData(BaseModel):
     """Data for status SSE event."""
 
     message: str
+    queue_position: Optional[int] = None
+    estimated_wait_seconds: Optional[float] = None
 
 
 class SSEChunkData(BaseModel):
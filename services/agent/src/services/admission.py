@@ -0,0 +1,187 @@
+"""
+Admission control for chat turns.
+
+Caps the number of graph runs in flight per process (ADMISSION_MAX_* are
+totals split across workers) and keeps a bounded wait queue in front of them. Waiting turns are grouped per user and served
+round-robin across users, so one user submitting many turns cannot starve
+the others. When the queue is full, callers are rejected immediately
+(the stream endpoint answers 503).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+from src.config import get_settings, per_worker
+from src.services.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """The wait queue is full."""
+
+
+class Ticket:
+    """A turn's place in the admission queue."""
+
+    def __init__(self, controller: "AdmissionController", user_key: str):
+        self.controller = controller
+        self.user_key = user_key
+        self.granted = asyncio.get_running_loop().create_future()
+        self.created = time.perf_counter()
+        self.admitted_at: float | None = None
+        self.released = False
+
+    @property
+    def admitted(self) -> bool:
+        return self.granted.done()
+
+    def position(self) -> int:
+        """1-based position in the queue (0 once admitted)."""
+        return self.controller.position(self)
+
+    def estimated_wait(self) -> float:
+        """Rough seconds until admission."""
+        return self.controller.estimated_wait(self.position())
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for admission; return whether admitted."""
+        if not self.admitted:
+            try:
+                await asyncio.wait_for(asyncio.shield(self.granted), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def release(self) -> None:
+        """Leave the queue or free the in-flight slot (idempotent)."""
+        if not self.released:
+            self.released = True
+            self.controller.release(self)
+
+
+class AdmissionController:
+    """Bounded in-flight counter with a per-user round-robin wait queue."""
+
+    def __init__(self, max_inflight: int, max_queue: int, initial_turn_seconds: float = 10.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.inflight = 0
+        # user_key → waiting tickets, in round-robin order of users
+        self._waiting: OrderedDict[str, deque[Ticket]] = OrderedDict()
+        self._queued = 0
+        # Moving average of admitted turn durations, for wait estimates
+        self._turn_seconds = initial_turn_seconds
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def reserve(self, user_key: str) -> Ticket:
+        """
+        Take a ticket, admitted immediately if a slot is free.
+
+        Args:
+            user_key: Fairness key (user id, or the session for anonymous users)
+
+        Returns:
+            Ticket (check `admitted`, or `wait()` for it)
+
+        Raises:
+            AdmissionRejected: If the wait queue is full
+        """
+        ticket = Ticket(self, user_key)
+        if self.inflight < self.max_inflight and not self._queued:
+            self._admit(ticket)
+            return ticket
+
+        if self._queued >= self.max_queue:
+            ADMISSION_REJECTED.inc()
+            raise AdmissionRejected(f"Admission queue full ({self._queued} waiting)")
+
+        self._waiting.setdefault(user_key, deque()).append(ticket)
+        self._queued += 1
+        ADMISSION_QUEUE_DEPTH.set(self._queued)
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        """1-based position of a waiting ticket in admission order, 0 if not waiting."""
+        queue = self._waiting.get(ticket.user_key)
+        if ticket.admitted or not queue or ticket not in queue:
+            return 0
+        index = queue.index(ticket)
+
+        # Round-robin serves every user's n-th ticket before anyone's (n+1)-th
+        ahead = index
+        seen_own = False
+        for user_key, waiting in self._waiting.items():
+            if user_key == ticket.user_key:
+                seen_own = True
+                continue
+            ahead += min(len(waiting), index)
+            if not seen_own and len(waiting) > index:
+                ahead += 1
+        return ahead + 1
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until a turn at `position` is likely admitted."""
+        if position <= 0:
+            return 0.0
+        rounds = (position - 1) // self.max_inflight + 1
+        return rounds * self._turn_seconds
+
+    def release(self, ticket: Ticket) -> None:
+        """Free the ticket's slot, or drop it from the queue if still waiting."""
+        if ticket.admitted:
+            self.inflight -= 1
+            duration = time.perf_counter() - ticket.admitted_at
+            self._turn_seconds = 0.8 * self._turn_seconds + 0.2 * duration
+            self._admit_next()
+            return
+
+        queue = self._waiting.get(ticket.user_key)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._waiting[ticket.user_key]
+            self._queued -= 1
+            ADMISSION_QUEUE_DEPTH.set(self._queued)
+
+    def _admit(self, ticket: Ticket) -> None:
+        self.inflight += 1
+        ticket.admitted_at = time.perf_counter()
+        ticket.granted.set_result(True)
+        ADMISSION_WAIT.observe(ticket.admitted_at - ticket.created)
+
+    def _admit_next(self) -> None:
+        while self._waiting and self.inflight < self.max_inflight:
+            user_key, queue = next(iter(self._waiting.items()))
+            ticket = queue.popleft()
+            if queue:
+                # This user's next ticket goes behind every other waiting user
+                self._waiting.move_to_end(user_key)
+            else:
+                del self._waiting[user_key]
+            self._queued -= 1
+            self._admit(ticket)
+        ADMISSION_QUEUE_DEPTH.set(self._queued)
+
+
+_controller: AdmissionController | None = None
+
+
+def get_admission() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    global _controller
+    if _controller is None:
+        settings = get_settings()
+        _controller = AdmissionController(
+            per_worker(settings.admission_max_inflight), per_worker(settings.admission_max_queue)
+        )
+        logger.info(
+            f"Admission control: {_controller.max_inflight} in flight, "
+            f"{_controller.max_queue} queued"
+        )
+    return _controller
@@ -0,0 +1,127 @@
+"""
+Attachment-aware retrieval for chat turns with attached NotionContent.
+
+Core summarises, splits and embeds each column after upload. Instead of
+pushing the whole column text into every prompt, a turn keeps only:
+
+- the column's summary and the passages most similar to the question
+  (user_attached_content)
+- posts retrieved with the question and column summary vectors, which seed
+  documents_handler (attachment_documents) so generate_queries can be skipped
+
+Columns not processed yet fall back to their full text.
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+
+from langchain_core.documents import Document
+
+from src.config import get_settings
+from src.providers.models import get_embeddings
+from src.services.core_client import CoreClient
+from src.services.vectorstore import search_by_vectors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AttachmentContext:
+    """Prompt text and seed documents for a turn's attachments."""
+
+    text: str = ""
+    documents: list[Document] = field(default_factory=list)
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two vectors (0 if either is zero)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def select_passages(
+    question_vector: list[float], passages: list[dict], limit: int
+) -> list[dict]:
+    """
+    Pick the passages most similar to the question.
+
+    Args:
+        question_vector: Embedding of the user's question
+        passages: Passages with "text" and "embedding"
+        limit: Maximum number of passages
+
+    Returns:
+        Selected passages in document order
+    """
+    ranked = sorted(
+        range(len(passages)),
+        key=lambda i: cosine_similarity(question_vector, passages[i]["embedding"]),
+        reverse=True,
+    )
+    return [passages[i] for i in sorted(ranked[:limit])]
+
+
+def format_attachment(content: dict, passages: list[dict] | None = None) -> str:
+    """Format one attachment as summary plus passages, or its full text."""
+    title = content.get("title") or ""
+    if passages is None:
+        body = content.get("text") or ""
+    else:
+        body = "\n\n(...)\n\n".join(passage["text"] for passage in passages)
+        if content.get("summary"):
+            body = f"요약: {content['summary']}\n\n{body}"
+    return f"## {title}\n{body}" if title else body
+
+
+async def load_attachment_context(
+    core_client: CoreClient, content_ids: list[int], question: str
+) -> AttachmentContext:
+    """
+    Build the attachment prompt text and retrieval seeds for a turn.
+
+    Args:
+        core_client: CoreClient for the attachment context and allowed authors
+        content_ids: Attached NotionContent IDs
+        question: The user's message
+
+    Returns:
+        AttachmentContext (empty when nothing is attached)
+    """
+    if not content_ids:
+        return AttachmentContext()
+
+    settings = get_settings()
+    data = await core_client.get_content_context(content_ids)
+    contents = [c for c in data.get("contents", []) if not c.get("error")]
+    processed = [c for c in contents if c.get("passages") or c.get("summary_embedding")]
+
+    question_vector: list[float] | None = None
+    if processed:
+        question_vector = await get_embeddings().aembed_query(question)
+
+    processed_ids = {c["id"] for c in processed}
+    texts = []
+    for content in contents:
+        if content["id"] in processed_ids:
+            passages = select_passages(
+                question_vector, content.get("passages") or [], settings.attachment_passages
+            )
+            texts.append(format_attachment(content, passages))
+        elif content.get("text"):
+            texts.append(format_attachment(content))
+
+    documents: list[Document] = []
+    if processed:
+        vectors = [question_vector] + [
+            c["summary_embedding"] for c in processed if c.get("summary_embedding")
+        ]
+        allowed_authors = await core_client.get_allowed_authors()
+        documents = await search_by_vectors(vectors, allowed_authors, settings.attachment_seed_k)
+        logger.debug(
+            f"Attachment context: {len(processed)}/{len(contents)} processed, "
+            f"{len(documents)} seed documents"
+        )
+
+    return AttachmentContext(text="\n\n---\n\n".join(texts), documents=documents)
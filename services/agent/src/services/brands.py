@@ -0,0 +1,148 @@
+"""
+Brand-mention detection for query generation.
+
+An Aho-Corasick automaton over every GoodtoKnow brand name and alias finds,
+in one pass over the conversation, which brands are actually mentioned, so
+generate_queries injects only those brands' descriptions (instead of the
+whole catalogue) and adds the brand names as retrieval queries.
+
+Matching ignores case and whitespace ("원조 부대찌개" matches "원조부대찌개").
+The automaton is rebuilt only when the brand list changes.
+"""
+
+import hashlib
+import json
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Patterns shorter than this (after normalisation) match too much Korean text
+MIN_PATTERN_LENGTH = 2
+
+
+def normalize(text: str) -> str:
+    """Lowercase and drop whitespace."""
+    return "".join(text.lower().split())
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher; each pattern maps to a value."""
+
+    def __init__(self, patterns: dict[str, int]):
+        # Trie as per-node transition dicts; node 0 is the root
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[int]] = [set()]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = next_node
+            self._out[node].add(value)
+
+        # Breadth-first failure links; outputs inherit their failure node's
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find(self, text: str) -> list[int]:
+        """Values of all patterns occurring in `text`, in order of first match end."""
+        found: dict[int, None] = {}
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for value in self._out[node]:
+                found.setdefault(value)
+        return list(found)
+
+
+class BrandMatcher:
+    """Finds the GoodtoKnow brands mentioned in a text."""
+
+    def __init__(self, brands: list[dict], fingerprint: str):
+        self.brands = brands
+        self.fingerprint = fingerprint
+        patterns: dict[str, int] = {}
+        for index, brand in enumerate(brands):
+            for name in [brand.get("name") or ""] + list(brand.get("aliases") or []):
+                key = normalize(name)
+                if len(key) >= MIN_PATTERN_LENGTH:
+                    patterns.setdefault(key, index)
+        self._automaton = AhoCorasick(patterns)
+        logger.info(f"Brand matcher built: {len(brands)} brands, {len(patterns)} patterns")
+
+    def find(self, texts: list[str], limit: int | None = None) -> list[dict]:
+        """
+        Brands mentioned in the texts.
+
+        Args:
+            texts: Texts to scan, most important first (e.g. latest message first)
+            limit: Maximum number of brands
+
+        Returns:
+            Mentioned brand dicts, in order of first mention across `texts`
+        """
+        found: dict[int, None] = {}
+        for text in texts:
+            for index in self._automaton.find(normalize(text)):
+                found.setdefault(index)
+        indices = list(found)[:limit] if limit is not None else list(found)
+        return [self.brands[i] for i in indices]
+
+
+def brands_fingerprint(brands: list[dict]) -> str:
+    """Hash of the brand names, aliases and descriptions."""
+    payload = json.dumps(brands, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+_matcher: BrandMatcher | None = None
+
+
+def get_brand_matcher(brands: list[dict]) -> BrandMatcher:
+    """
+    Get the process-wide matcher for a brand list, rebuilding it if it changed.
+
+    CoreClient returns the same cached list object until its cache expires,
+    so the fingerprint is only recomputed after a refresh.
+    """
+    global _matcher
+    if _matcher is not None and _matcher.brands is brands:
+        return _matcher
+
+    fingerprint = brands_fingerprint(brands)
+    if _matcher is None or _matcher.fingerprint != fingerprint:
+        _matcher = BrandMatcher(brands, fingerprint)
+    else:
+        _matcher.brands = brands
+    return _matcher
+
+
+def format_brands(brands: list[dict], max_description_chars: int = 300) -> str:
+    """Format brands as "name: description" lines for the prompt."""
+    lines = []
+    for brand in brands:
+        description = (brand.get("description") or "").strip()
+        if len(description) > max_description_chars:
+            description = description[:max_description_chars] + "..."
+        lines.append(f"{brand['name']}: {description}")
+    return "\n".join(lines)
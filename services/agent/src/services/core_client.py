@@ -11,6 +11,9 @@ from typing import Any
 
 import httpx
 
+from src.services.post_cache import PostContentCache
+from src.services.snapshot import PostSnapshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,13 +29,23 @@ class CoreClient:
     """
     HTTP client for all Core service API calls.
 
-    Provides caching for infrequently changing data (authors, brands).
+    Provides caching for infrequently changing data (authors, brands) and,
+    when a PostSnapshot or PostContentCache is given, for post content.
     """
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        post_cache: PostContentCache | None = None,
+        snapshot: PostSnapshot | None = None,
+        generation_ttl: int = 30,
+    ):
         self.client = client
+        self.post_cache = post_cache
+        self.snapshot = snapshot
         self._cache: dict[str, tuple[Any, datetime]] = {}
         self._cache_ttl = timedelta(minutes=5)
+        self._generation_ttl = timedelta(seconds=generation_ttl)
 
     def _get_cached(self, key: str) -> Any | None:
         """Get value from cache if not expired."""
@@ -43,9 +56,9 @@ class CoreClient:
             del self._cache[key]
         return None
 
-    def _set_cached(self, key: str, value: Any) -> None:
+    def _set_cached(self, key: str, value: Any, ttl: timedelta | None = None) -> None:
         """Set value in cache with TTL."""
-        self._cache[key] = (value, datetime.now() + self._cache_ttl)
+        self._cache[key] = (value, datetime.now() + (ttl or self._cache_ttl))
 
     # =========================================================================
     # Scraper data (read-only)
@@ -130,10 +143,79 @@ class CoreClient:
         brands = await self.get_brands()
         return "\n".join(f"{b['name']}: {b.get('description', '')}" for b in brands)
 
+    async def _get_generations(self) -> dict[str, Any] | None:
+        """
+        Get Core's ingest and index generations and the live index namespace.
+
+        Returns:
+            Dict with 'ingest', 'index' and 'namespace' keys, or None if Core
+            could not be reached
+
+        Cached for a short TTL (see generation_ttl).
+        """
+        cached = self._get_cached("generations")
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.client.get("/api/v1/scraper/internal/generation/")
+            response.raise_for_status()
+            data = response.json()
+            # Core reports null generations while its Redis is unavailable
+            ingest = data.get("ingest_generation", 0)
+            index = data.get("index_generation", 0)
+            generations = {
+                "ingest": int(ingest) if ingest is not None else None,
+                "index": int(index) if index is not None else None,
+                "namespace": str(data.get("index_namespace") or ""),
+            }
+            self._set_cached("generations", generations, ttl=self._generation_ttl)
+            return generations
+
+        except (httpx.HTTPStatusError, httpx.RequestError, ValueError) as e:
+            logger.warning(f"Failed to get generations: {e}")
+            return None
+
+    async def get_ingest_generation(self) -> int | None:
+        """
+        Get Core's current ingest generation (bumped when post content changes).
+
+        Returns:
+            Generation number, or None if Core or its Redis could not be reached
+        """
+        generations = await self._get_generations()
+        return generations["ingest"] if generations else None
+
+    async def get_index_generation(self) -> int | None:
+        """
+        Get Core's current Pinecone index generation (bumped on every upsert
+        or delete).
+
+        Returns:
+            Generation number, or None if Core or its Redis could not be reached
+        """
+        generations = await self._get_generations()
+        return generations["index"] if generations else None
+
+    async def get_index_namespace(self) -> str | None:
+        """
+        Get the Pinecone namespace of Core's published index build.
+
+        Returns:
+            Namespace ("" for the default namespace), or None if Core could
+            not be reached
+        """
+        generations = await self._get_generations()
+        return generations["namespace"] if generations else None
+
     async def get_post_content(self, post_id: int) -> dict:
         """
         Get post title and content by post_id.
 
+        Served from the local snapshot without contacting Core (Core exports
+        a new snapshot after every ingest generation bump), then from the
+        post cache keyed by the current ingest generation.
+
         Args:
             post_id: The NaverCafeData post_id
 
@@ -143,10 +225,26 @@ class CoreClient:
         Raises:
             CoreClientError: If post not found or API error
         """
+        if self.snapshot is not None:
+            post = self.snapshot.get(post_id)
+            if post is not None:
+                return post
+
+        generation = None
+        if self.post_cache is not None:
+            generation = await self.get_ingest_generation()
+            cached = await self.post_cache.aget(post_id, generation)
+            if cached is not None:
+                return cached
+
         try:
             response = await self.client.get(f"/api/v1/scraper/internal/posts/{post_id}/")
             response.raise_for_status()
-            return response.json()
+            post = response.json()
+
+            if self.post_cache is not None:
+                await self.post_cache.aset(post_id, generation, post)
+            return post
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -196,6 +294,39 @@ class CoreClient:
             logger.error(f"Request error getting content text: {e}")
             return {"contents": []}
 
+    async def get_content_context(self, content_ids: list[int]) -> dict:
+        """
+        Get attachment retrieval context from NotionContent.
+
+        Args:
+            content_ids: List of NotionContent IDs
+
+        Returns:
+            Dict with 'contents' list, each containing 'id', 'title', 'summary',
+            'summary_embedding', 'passages' (with 'text' and 'embedding') and
+            'text' (full text, only for contents not processed yet)
+        """
+        if not content_ids:
+            return {"contents": []}
+
+        try:
+            response = await self.client.post(
+                "/api/v1/content/internal/attachment/context/",
+                json={"content_ids": content_ids},
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to get content context: {e}")
+            raise CoreClientError(
+                f"Failed to get content context: {e.response.text}",
+                status_code=e.response.status_code,
+            )
+        except httpx.RequestError as e:
+            logger.error(f"Request error getting content context: {e}")
+            return {"contents": []}
+
     async def get_content_text_formatted(self, content_ids: list[int]) -> str:
         """
         Get content text as formatted string for user_attached_content.
@@ -0,0 +1,124 @@
+"""
+Local query expansion over the keyword co-occurrence graph.
+
+Core's post snapshot carries the keywords extracted from every post and,
+for each keyword, its strongest co-occurring keywords (normalised PMI over
+posts). Instead of asking the LLM for search queries, the question is
+matched against that vocabulary (Aho-Corasick, ignoring case and
+whitespace) and each matched keyword is expanded with its top neighbours:
+
+    "부대찌개 창업 비용이 궁금해요"
+    → ["부대찌개 창업 비용이 궁금해요", "부대찌개 창업 비용",
+       "부대찌개 프랜차이즈 상권", "창업 비용 인테리어 보증금", ...]
+
+The expander is rebuilt when a new snapshot is mapped.
+"""
+
+import logging
+
+from src.services.brands import MIN_PATTERN_LENGTH, AhoCorasick, normalize
+from src.services.snapshot import PostSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAX_QUESTION_CHARS = 200
+
+
+class KeywordExpander:
+    """Expands a question into search queries with co-occurring keywords."""
+
+    def __init__(self, doc_freq: dict[str, int], neighbors: dict[str, list[str]], source: str):
+        self.doc_freq = doc_freq
+        self.neighbors = neighbors
+        self.source = source
+        self._keywords = list(doc_freq)
+        patterns: dict[str, int] = {}
+        for index, keyword in enumerate(self._keywords):
+            key = normalize(keyword)
+            if len(key) >= MIN_PATTERN_LENGTH:
+                patterns.setdefault(key, index)
+        self._automaton = AhoCorasick(patterns)
+        logger.info(
+            f"Keyword expander built from {source}: {len(patterns)} keywords, "
+            f"{sum(len(n) for n in neighbors.values())} neighbour links"
+        )
+
+    def match(self, text: str) -> list[str]:
+        """
+        Vocabulary keywords occurring in `text`.
+
+        Keywords contained in a longer matched keyword ("찌개" in "부대찌개")
+        are dropped.
+
+        Returns:
+            Matched keywords in order of occurrence
+        """
+        found = [self._keywords[i] for i in self._automaton.find(normalize(text))]
+        keys = [normalize(keyword) for keyword in found]
+        return [
+            keyword
+            for keyword, key in zip(found, keys)
+            if not any(key != other and key in other for other in keys)
+        ]
+
+    def expand(self, question: str, max_queries: int = 5, neighbors: int = 2) -> list[str]:
+        """
+        Build search queries for a question.
+
+        The question itself is always the first query; then the matched
+        keywords together, then each matched keyword (rarest first) with its
+        top co-occurring keywords.
+
+        Args:
+            question: The user's latest message
+            max_queries: Maximum number of queries
+            neighbors: Co-occurring keywords added to each matched keyword
+
+        Returns:
+            1 to max_queries distinct search strings
+        """
+        queries: dict[str, None] = {" ".join(question.split())[:MAX_QUESTION_CHARS]: None}
+        matched = self.match(question)
+        if len(matched) > 1:
+            queries.setdefault(" ".join(matched[:4]))
+
+        # Rare keywords say more about the question than generic ones
+        for keyword in sorted(matched, key=lambda k: self.doc_freq.get(k, 0)):
+            extra = [n for n in self.neighbors.get(keyword, []) if n not in matched]
+            if extra:
+                queries.setdefault(" ".join([keyword] + extra[:neighbors]))
+
+        return [query for query in queries if query][:max_queries]
+
+
+_expander: KeywordExpander | None = None
+# Snapshot file without a keyword graph, so it is not re-read on every turn
+_empty_source: str | None = None
+
+
+def get_keyword_expander(snapshot: PostSnapshot | None) -> KeywordExpander | None:
+    """
+    Get the process-wide expander for the mapped snapshot, rebuilding it if
+    a newer snapshot was published.
+
+    Returns:
+        KeywordExpander, or None without a snapshot carrying keywords
+    """
+    global _expander, _empty_source
+    if snapshot is None:
+        return None
+
+    snapshot.refresh()
+    source = snapshot.file
+    if source is None or source == _empty_source:
+        return None
+    if _expander is not None and _expander.source == source:
+        return _expander
+
+    graph = snapshot.keyword_graph()
+    if not graph or not graph[0]:
+        _empty_source = source
+        return None
+
+    _expander = KeywordExpander(*graph, source=source)
+    return _expander
@@ -0,0 +1,282 @@
+"""
+Prometheus metrics for the Agent service.
+
+Metric objects live at module level (prometheus_client's default registry)
+and are fed by graph callbacks, the SSE loop and dependency clients.
+
+With several server workers, PROMETHEUS_MULTIPROC_DIR makes prometheus_client
+write per-process files that render_latest() aggregates; gauges then sum the
+values of live workers.
+"""
+
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+from psycopg_pool import AsyncConnectionPool
+
+# Latency buckets covering cache hits (ms) up to long LLM generations (minutes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+NODE_DURATION = Histogram(
+    "agent_node_duration_seconds",
+    "Duration of LangGraph node executions",
+    ["node", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_DURATION = Histogram(
+    "agent_llm_duration_seconds",
+    "Duration of chat model calls",
+    ["model", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_FIRST_TOKEN = Histogram(
+    "agent_llm_first_token_seconds",
+    "Time from chat model call start to its first streamed token",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "agent_llm_tokens_per_second",
+    "Output token rate of streamed chat model calls",
+    ["model"],
+    buckets=(1, 5, 10, 25, 50, 100, 200, 400, 800),
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "agent_llm_queue_seconds",
+    "Time spent waiting for a provider gateway slot (concurrency and rate limits)",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_INFLIGHT = Gauge(
+    "agent_llm_inflight",
+    "Chat model calls currently holding a gateway slot",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+LLM_FALLBACKS = Counter(
+    "agent_llm_fallbacks_total",
+    "Calls served by the fallback model",
+    ["model", "fallback", "reason"],
+)
+QUERY_GENERATIONS = Counter(
+    "agent_query_generations_total",
+    "Search query generations by source (llm or local keyword expansion)",
+    ["source", "reason"],
+)
+LLM_MEMO_LOOKUPS = Counter(
+    "agent_llm_memo_lookups_total",
+    "Structured-output memo lookups by node and outcome (hit, miss, error)",
+    ["node", "outcome"],
+)
+FOLLOWUP_DECISIONS = Counter(
+    "agent_followup_decisions_total",
+    "Retrieval turns by follow-up decision (fresh, incremental, reuse)",
+    ["decision"],
+)
+RETRIEVAL_CACHE_LOOKUPS = Counter(
+    "agent_retrieval_cache_lookups_total",
+    "Retrieval-result cache lookups by outcome (hit, miss, error)",
+    ["outcome"],
+)
+DEPENDENCY_DURATION = Histogram(
+    "agent_dependency_duration_seconds",
+    "Duration of calls to external dependencies",
+    ["dependency", "operation", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+TURN_FIRST_TOKEN = Histogram(
+    "agent_turn_first_token_seconds",
+    "Time from stream request to the first response chunk",
+    buckets=LATENCY_BUCKETS,
+)
+TURN_DURATION = Histogram(
+    "agent_turn_duration_seconds",
+    "Total duration of a chat turn",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+PREFLIGHT_DURATION = Histogram(
+    "agent_preflight_step_seconds",
+    "Duration of chat turn pre-flight steps (redis, attachments, checkpoint, memory)",
+    ["step"],
+    buckets=LATENCY_BUCKETS,
+)
+TURNS = Counter(
+    "agent_turns_total",
+    "Chat turns by outcome",
+    ["outcome"],
+)
+ACTIVE_GENERATIONS = Gauge(
+    "agent_active_generations",
+    "Chat turns currently streaming",
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "agent_admission_queue_depth",
+    "Chat turns waiting for admission",
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "agent_admission_wait_seconds",
+    "Time chat turns waited for admission",
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "agent_admission_rejected_total",
+    "Chat turns rejected because the admission queue was full",
+)
+RELEVANCE_DECISIONS = Counter(
+    "agent_relevance_decisions_total",
+    "Relevance policy decisions per turn (applied and proposed)",
+    ["mode", "decision", "proposed"],
+)
+RELEVANCE_JUDGED_DOCUMENTS = Histogram(
+    "agent_relevance_judged_documents",
+    "Documents sent to the relevance LLM per turn",
+    buckets=(0, 1, 2, 4, 6, 8, 12, 16, 20, 30),
+)
+RELEVANCE_JUDGMENTS = Counter(
+    "agent_relevance_judgments_total",
+    "Per-document relevance judgments by outcome",
+    ["outcome"],
+)
+
+# Collapse numeric path segments so post ids do not explode label cardinality
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@asynccontextmanager
+async def observe_dependency(dependency: str, operation: str) -> AsyncIterator[None]:
+    """
+    Time a call to an external dependency.
+
+    Usage:
+        async with observe_dependency("redis", "check_stop_flag"):
+            await client.exists(key)
+    """
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        DEPENDENCY_DURATION.labels(dependency, operation, status).observe(
+            time.perf_counter() - started
+        )
+
+
+def httpx_event_hooks(dependency: str) -> dict:
+    """
+    Build httpx event hooks that record request latency per path.
+
+    Args:
+        dependency: Dependency label (e.g. "core")
+
+    Returns:
+        Dict suitable for httpx.AsyncClient(event_hooks=...)
+    """
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["metrics_started"] = time.perf_counter()
+
+    async def on_response(response: httpx.Response) -> None:
+        started = response.request.extensions.get("metrics_started")
+        if started is None:
+            return
+        path = _ID_SEGMENT.sub("/{id}", response.request.url.path)
+        operation = f"{response.request.method} {path}"
+        status = "ok" if response.status_code < 400 else str(response.status_code)
+        DEPENDENCY_DURATION.labels(dependency, operation, status).observe(
+            time.perf_counter() - started
+        )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+class PoolCollector(Collector):
+    """Expose psycopg pool saturation at scrape time."""
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    def collect(self):
+        stats = self.pool.get_stats()
+        gauges = {
+            "agent_pg_pool_size": ("Connections currently in the pool", "pool_size"),
+            "agent_pg_pool_available": ("Idle connections in the pool", "pool_available"),
+            "agent_pg_pool_max": ("Maximum pool size", "pool_max"),
+            "agent_pg_pool_requests_waiting": (
+                "Clients waiting for a connection",
+                "requests_waiting",
+            ),
+        }
+        for name, (documentation, key) in gauges.items():
+            yield GaugeMetricFamily(name, documentation, value=stats.get(key, 0))
+
+        pool_max = stats.get("pool_max") or 0
+        in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+        yield GaugeMetricFamily(
+            "agent_pg_pool_saturation",
+            "Fraction of the maximum pool size currently checked out",
+            value=in_use / pool_max if pool_max else 0,
+        )
+
+
+_pool_collector: PoolCollector | None = None
+
+
+def register_pool_collector(pool: AsyncConnectionPool) -> None:
+    """Register (or replace) the pool saturation collector."""
+    global _pool_collector
+    if _pool_collector is not None:
+        REGISTRY.unregister(_pool_collector)
+    _pool_collector = PoolCollector(pool)
+    REGISTRY.register(_pool_collector)
+
+
+# =============================================================================
+# Exposition
+# =============================================================================
+
+
+def _multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+def render_latest() -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+
+    In multiprocess mode the pool collector only reports the worker that
+    serves the scrape (pool stats live in process memory).
+    """
+    if _multiprocess_dir() is None:
+        return generate_latest()
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    if _pool_collector is not None:
+        registry.register(_pool_collector)
+    return generate_latest(registry)
+
+
+def mark_worker_exit() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if _multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(os.getpid())
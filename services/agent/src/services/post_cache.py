@@ -0,0 +1,135 @@
+"""
+Post content cache for documents_handler.
+
+Bounded, byte-size-aware LRU of post title/content/url kept in process,
+optionally backed by Redis so that entries survive restarts and are shared
+between agent processes. Entries are keyed by Core's ingest generation, so
+a bump on the Core side makes every stale entry unreachable. While the
+generation is unknown (Core or its Redis unreachable) the cache is bypassed.
+"""
+
+import json
+import logging
+from collections import OrderedDict
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for shared post entries
+POST_CACHE_PREFIX = "agent:post:"
+
+
+def _entry_size(post: dict) -> int:
+    """Approximate memory footprint of a cached post in bytes."""
+    return sum(len(str(post.get(key) or "").encode("utf-8")) for key in ("title", "content", "url"))
+
+
+class PostContentCache:
+    """LRU cache of post content bounded by total bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        redis_client: redis.Redis | None = None,
+        redis_ttl: int = 86400,
+    ):
+        self.max_bytes = max_bytes
+        self.redis_client = redis_client
+        self.redis_ttl = redis_ttl
+        self._entries: OrderedDict[tuple[int, int], tuple[dict, int]] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_key(self, post_id: int, generation: int) -> str:
+        """Get Redis key for a post entry."""
+        return f"{POST_CACHE_PREFIX}{generation}:{post_id}"
+
+    def get(self, post_id: int, generation: int) -> dict | None:
+        """Get post from the in-process LRU."""
+        key = (post_id, generation)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, post_id: int, generation: int, post: dict) -> None:
+        """Store post in the in-process LRU, evicting least recently used entries."""
+        key = (post_id, generation)
+        size = _entry_size(post)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+
+        self._entries[key] = (post, size)
+        self._size += size
+
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    async def aget(self, post_id: int, generation: int | None) -> dict | None:
+        """
+        Get post from the local LRU, then from Redis.
+
+        Args:
+            post_id: The NaverCafeData post_id
+            generation: Current ingest generation (None bypasses the cache)
+
+        Returns:
+            Cached post dict or None on miss
+        """
+        if generation is None:
+            return None
+
+        post = self.get(post_id, generation)
+        if post is None and self.redis_client is not None:
+            try:
+                raw = await self.redis_client.get(self._redis_key(post_id, generation))
+                if raw:
+                    post = json.loads(raw)
+                    self.put(post_id, generation, post)
+            except Exception as e:
+                logger.warning(f"Post cache Redis read failed for {post_id}: {e}")
+
+        if post is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return post
+
+    async def aset(self, post_id: int, generation: int | None, post: dict) -> None:
+        """
+        Store post locally and, if configured, in Redis.
+
+        Args:
+            post_id: The NaverCafeData post_id
+            generation: Ingest generation the post was fetched at (None skips
+                caching)
+            post: Post dict with 'title', 'content', 'url' keys
+        """
+        if generation is None:
+            return
+
+        self.put(post_id, generation, post)
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.setex(
+                    self._redis_key(post_id, generation),
+                    self.redis_ttl,
+                    json.dumps(post, ensure_ascii=False),
+                )
+            except Exception as e:
+                logger.warning(f"Post cache Redis write failed for {post_id}: {e}")
+
+    @property
+    def size_bytes(self) -> int:
+        """Total bytes held by the in-process LRU."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
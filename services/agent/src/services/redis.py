@@ -8,6 +8,8 @@ import logging
 
 import redis.asyncio as redis
 
+from src.services.metrics import observe_dependency
+
 logger = logging.getLogger(__name__)
 
 # Key prefix for stop flags
@@ -33,7 +35,8 @@ class RedisService:
             session_nonce: The chat session nonce
         """
         key = self._stop_key(session_nonce)
-        await self.client.setex(key, STOP_FLAG_TTL, "1")
+        async with observe_dependency("redis", "set_stop_flag"):
+            await self.client.setex(key, STOP_FLAG_TTL, "1")
         logger.info(f"Set stop flag for session {session_nonce}")
 
     async def check_stop_flag(self, session_nonce: str) -> bool:
@@ -47,7 +50,8 @@ class RedisService:
             True if stop flag is set
         """
         key = self._stop_key(session_nonce)
-        return await self.client.exists(key) > 0
+        async with observe_dependency("redis", "check_stop_flag"):
+            return await self.client.exists(key) > 0
 
     async def clear_stop_flag(self, session_nonce: str) -> None:
         """
@@ -57,7 +61,8 @@ class RedisService:
             session_nonce: The chat session nonce
         """
         key = self._stop_key(session_nonce)
-        await self.client.delete(key)
+        async with observe_dependency("redis", "clear_stop_flag"):
+            await self.client.delete(key)
         logger.debug(f"Cleared stop flag for session {session_nonce}")
 
     async def ping(self) -> bool:
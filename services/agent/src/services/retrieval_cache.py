@@ -0,0 +1,122 @@
+"""
+Retrieval-result cache for Pinecone similarity searches.
+
+A search for the same query and author filter returns the same documents
+until the index changes, so results (ids, page content, metadata including
+score and rank) are kept in Redis under:
+
+    agent:retrieval:{index generation}:{k}:{filter hash}:{query hash}
+
+Core bumps the index generation whenever vectors are upserted or deleted,
+which makes every earlier entry unreachable; entries also expire after a
+TTL. Queries are normalised (Unicode NFC, case, whitespace) before hashing.
+Without a known generation (Core unreachable) the cache is bypassed.
+"""
+
+import hashlib
+import json
+import logging
+import unicodedata
+
+import redis.asyncio as redis
+from langchain_core.documents import Document
+
+from src.services.core_client import CoreClient
+from src.services.metrics import RETRIEVAL_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for cached search results
+RETRIEVAL_CACHE_PREFIX = "agent:retrieval:"
+
+
+def normalize_query(query: str) -> str:
+    """NFC-normalised, lowercased query with collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", query).lower().split())
+
+
+def _canonical_filter(value):
+    """Filter with sorted lists, so author order does not change the key."""
+    if isinstance(value, dict):
+        return {k: _canonical_filter(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted(value, key=str)
+    return value
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+class RetrievalCache:
+    """Redis cache of similarity-search results keyed by index generation."""
+
+    def __init__(self, redis_client: redis.Redis, core_client: CoreClient, ttl: int):
+        self.redis_client = redis_client
+        self.core_client = core_client
+        self.ttl = ttl
+
+    async def key(self, query: str, search_filter: dict | None, k: int) -> str | None:
+        """
+        Cache key of a search, or None when the index generation is unknown.
+
+        Args:
+            query: Search query
+            search_filter: Pinecone metadata filter (e.g. allowed authors)
+            k: Number of results
+        """
+        generation = await self.core_client.get_index_generation()
+        if generation is None:
+            return None
+        filter_json = json.dumps(
+            _canonical_filter(search_filter or {}), ensure_ascii=False, sort_keys=True
+        )
+        return (
+            f"{RETRIEVAL_CACHE_PREFIX}{generation}:{k}:"
+            f"{_digest(filter_json)}:{_digest(normalize_query(query))}"
+        )
+
+    async def get(self, key: str) -> list[Document] | None:
+        """Cached documents for `key` (fresh objects), or None on a miss."""
+        try:
+            raw = await self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Retrieval cache read failed: {e}")
+            RETRIEVAL_CACHE_LOOKUPS.labels("error").inc()
+            return None
+
+        if raw is None:
+            RETRIEVAL_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        RETRIEVAL_CACHE_LOOKUPS.labels("hit").inc()
+        return [
+            Document(id=item["id"], page_content=item["page_content"], metadata=item["metadata"])
+            for item in json.loads(raw)
+        ]
+
+    async def set(self, key: str, documents: list[Document]) -> None:
+        """Store search results under `key`."""
+        payload = [
+            {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata}
+            for doc in documents
+        ]
+        try:
+            await self.redis_client.setex(
+                key, self.ttl, json.dumps(payload, ensure_ascii=False, default=str)
+            )
+        except Exception as e:
+            logger.warning(f"Retrieval cache write failed: {e}")
+
+
+_cache: RetrievalCache | None = None
+
+
+def set_retrieval_cache(cache: RetrievalCache | None) -> None:
+    """Install the process-wide retrieval cache (done by build_graph)."""
+    global _cache
+    _cache = cache
+
+
+def get_retrieval_cache() -> RetrievalCache | None:
+    """The process-wide retrieval cache, if enabled."""
+    return _cache
@@ -0,0 +1,182 @@
+"""
+Read-only post snapshot published by Core.
+
+Core's export_post_snapshot task writes eligible posts into a SQLite file and
+atomically swaps a CURRENT pointer next to it. This module maps the current
+file read-only (immutable + mmap) and re-opens it when a new generation is
+published, so post text lookups never leave the process. Core exports after
+every ingest generation bump, so the mapped snapshot is trusted as current
+(it lags a bump by the export countdown plus refresh_interval).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILENAME = "CURRENT"
+MMAP_SIZE = 1024 * 1024 * 1024  # Upper bound; SQLite maps at most the file size
+
+
+@dataclass(frozen=True)
+class _OpenSnapshot:
+    """An opened snapshot file together with its pointer metadata."""
+
+    conn: sqlite3.Connection
+    file: str
+    generation: int
+    pointer_mtime: float
+
+
+class PostSnapshot:
+    """Read-only view over the latest published post snapshot."""
+
+    def __init__(self, directory: str, refresh_interval: float = 10.0):
+        self.directory = Path(directory)
+        self.refresh_interval = refresh_interval
+        self._current: _OpenSnapshot | None = None
+        self._last_check = 0.0
+
+    @property
+    def generation(self) -> int | None:
+        """Ingest generation of the mapped snapshot, if any."""
+        current = self._current
+        return current.generation if current else None
+
+    @property
+    def file(self) -> str | None:
+        """File name of the mapped snapshot, if any."""
+        current = self._current
+        return current.file if current else None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a snapshot file is currently mapped."""
+        return self._current is not None
+
+    def _open(self, file: str) -> sqlite3.Connection:
+        """Open a snapshot file read-only with memory mapping."""
+        uri = f"file:{self.directory / file}?mode=ro&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Map the newest published snapshot if the pointer changed.
+
+        Checks the pointer at most once per refresh_interval unless forced.
+
+        Returns:
+            True if a new snapshot was mapped
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.refresh_interval:
+            return False
+        self._last_check = now
+
+        pointer_path = self.directory / POINTER_FILENAME
+        try:
+            mtime = os.stat(pointer_path).st_mtime
+        except OSError:
+            return False
+
+        current = self._current
+        if current and current.pointer_mtime == mtime:
+            return False
+
+        try:
+            with open(pointer_path, "r", encoding="utf-8") as f:
+                pointer = json.load(f)
+            if current and current.file == pointer["file"]:
+                return False
+            conn = self._open(pointer["file"])
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            logger.warning(f"Failed to map post snapshot: {e}")
+            return False
+
+        # Lookups are synchronous, so no reader can be mid-query during the swap
+        self._current = _OpenSnapshot(
+            conn=conn,
+            file=pointer["file"],
+            generation=int(pointer.get("generation", 0)),
+            pointer_mtime=mtime,
+        )
+        logger.info(
+            f"Mapped post snapshot {pointer['file']} "
+            f"(generation {pointer.get('generation')}, {pointer.get('post_count')} posts)"
+        )
+        if current:
+            current.conn.close()
+        return True
+
+    def get(self, post_id: int, generation: int | None = None) -> dict | None:
+        """
+        Look up a post in the mapped snapshot.
+
+        Args:
+            post_id: The NaverCafeData post_id
+            generation: Current ingest generation; when given, the snapshot is
+                only used if it was exported at that generation
+
+        Returns:
+            Dict with 'post_id', 'title', 'content', 'url' keys, or None
+        """
+        self.refresh()
+        current = self._current
+        if current is None:
+            return None
+        if generation is not None and current.generation != generation:
+            return None
+
+        try:
+            row = current.conn.execute(
+                "SELECT post_id, title, url, content, summary, author, updated_at "
+                "FROM posts WHERE post_id = ?",
+                (post_id,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Post snapshot lookup failed for {post_id}: {e}")
+            return None
+
+        return dict(row) if row else None
+
+    def keyword_graph(self) -> tuple[dict[str, int], dict[str, list[str]]] | None:
+        """
+        Read the keyword co-occurrence graph of the mapped snapshot.
+
+        Returns:
+            Tuple of (keyword document frequencies, neighbours of each keyword
+            strongest first), or None if no snapshot with keywords is mapped
+        """
+        self.refresh()
+        current = self._current
+        if current is None:
+            return None
+
+        try:
+            doc_freq = dict(current.conn.execute("SELECT keyword, doc_freq FROM keywords"))
+            neighbors: dict[str, list[str]] = {}
+            for keyword, neighbor in current.conn.execute(
+                "SELECT keyword, neighbor FROM keyword_neighbors "
+                "ORDER BY keyword, npmi DESC, count DESC"
+            ):
+                neighbors.setdefault(keyword, []).append(neighbor)
+        except sqlite3.Error as e:
+            # Snapshots exported before the keyword tables existed
+            logger.warning(f"Post snapshot has no keyword graph: {e}")
+            return None
+
+        return doc_freq, neighbors
+
+    def close(self) -> None:
+        """Close the mapped snapshot."""
+        if self._current:
+            self._current.conn.close()
+            self._current = None
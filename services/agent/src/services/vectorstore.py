@@ -1,36 +1,55 @@
 """
 Pinecone vector store setup for document retrieval.
+
+Searches go to the namespace of Core's published index build (blue-green
+rebuilds), which is read with the generations and switches as soon as Core
+publishes a new build. The last known namespace is kept while Core is
+unreachable.
 """
 
+import asyncio
 import logging
-
-from langchain_openai import OpenAIEmbeddings
+from functools import lru_cache
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
 from langchain_pinecone import PineconeVectorStore
 
 from src.config import get_settings
+from src.providers.models import get_embeddings
+from src.services.core_client import CoreClient
+from src.services.metrics import observe_dependency
+from src.services.retrieval_cache import get_retrieval_cache
 
 logger = logging.getLogger(__name__)
 
+_index_source: CoreClient | None = None
+_namespace = ""
 
-def load_embeddings() -> OpenAIEmbeddings:
+
+def load_embeddings() -> Embeddings:
     """
-    Create and configure OpenAI embeddings for vector store operations.
+    Create embeddings for vector store operations.
 
     Returns:
-        Configured OpenAIEmbeddings instance
+        Embeddings for the configured provider (OpenAI or fake)
     """
-    settings = get_settings()
-
-    return OpenAIEmbeddings(
-        model=settings.embedding_model,
-        chunk_size=200,
-        api_key=settings.openai_api_key,
-    )
+    return get_embeddings()
 
 
+@lru_cache
 def get_vector_store() -> PineconeVectorStore:
     """
-    Get Pinecone vector store instance.
+    Get the Pinecone vector store instance.
+
+    Cached so the Pinecone and embedding clients (and their connection
+    pools) are reused across retrievals instead of rebuilt per query.
 
     Returns:
         Configured PineconeVectorStore
@@ -45,7 +64,84 @@ def get_vector_store() -> PineconeVectorStore:
     )
 
 
-def get_vector_store_retriever(allowed_authors: list[str], k: int = 4):
+def set_index_source(core_client: CoreClient | None) -> None:
+    """Read the published index namespace from this client (done by build_graph)."""
+    global _index_source
+    _index_source = core_client
+
+
+async def get_index_namespace() -> str | None:
+    """
+    Namespace to search (None for the default namespace).
+
+    Returns:
+        The published build's namespace, or the last known one if Core is
+        unreachable
+    """
+    global _namespace
+    if _index_source is not None:
+        namespace = await _index_source.get_index_namespace()
+        if namespace is not None:
+            if namespace != _namespace:
+                logger.info(f"Searching index namespace {namespace or '(default)'}")
+            _namespace = namespace
+    return _namespace or None
+
+
+def annotate_scores(results: list[tuple[Document, float]]) -> list[Document]:
+    """Record similarity score and 0-based rank in each document's metadata."""
+    documents = []
+    for rank, (doc, score) in enumerate(results):
+        doc.metadata["score"] = float(score)
+        doc.metadata["rank"] = rank
+        documents.append(doc)
+    return documents
+
+
+class ScoredRetriever(BaseRetriever):
+    """
+    Similarity search retriever that records scores on the documents.
+
+    Each returned document carries metadata["score"] (Pinecone similarity)
+    and metadata["rank"] (0-based position in this query's results), which
+    the relevance policy in documents_handler uses.
+
+    Async searches go through the retrieval cache when one is installed, so
+    repeated queries do not reach Pinecone until the index changes.
+    """
+
+    vector_store: Any
+    k: int = 4
+    filter: dict | None = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        results = self.vector_store.similarity_search_with_score(
+            query, k=self.k, filter=self.filter, namespace=_namespace or None
+        )
+        return annotate_scores(results)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        cache = get_retrieval_cache()
+        key = await cache.key(query, self.filter, self.k) if cache is not None else None
+        if key is not None:
+            cached = await cache.get(key)
+            if cached is not None:
+                return cached
+
+        results = await self.vector_store.asimilarity_search_with_score(
+            query, k=self.k, filter=self.filter, namespace=await get_index_namespace()
+        )
+        documents = annotate_scores(results)
+        if key is not None:
+            await cache.set(key, documents)
+        return documents
+
+
+def get_vector_store_retriever(allowed_authors: list[str], k: int = 4) -> ScoredRetriever:
     """
     Create a Pinecone vector store retriever with author-based filtering.
 
@@ -54,13 +150,45 @@ def get_vector_store_retriever(allowed_authors: list[str], k: int = 4):
         k: Number of documents to retrieve
 
     Returns:
-        Configured Pinecone retriever with author filtering
+        Configured Pinecone retriever with author filtering; documents carry
+        their similarity score and rank in metadata
     """
-    vector_store = get_vector_store()
-
-    return vector_store.as_retriever(
-        search_kwargs={
-            "k": k,
-            "filter": {"author": {"$in": allowed_authors}},
-        }
+    return ScoredRetriever(
+        vector_store=get_vector_store(),
+        k=k,
+        filter={"author": {"$in": allowed_authors}},
     )
+
+
+async def search_by_vectors(
+    vectors: list[list[float]], allowed_authors: list[str], k: int = 4
+) -> list[Document]:
+    """
+    Search posts by precomputed embedding vectors, with author filtering.
+
+    Args:
+        vectors: Query vectors (e.g. question and attachment summary embeddings)
+        allowed_authors: List of author names to include in search results
+        k: Number of documents per vector
+
+    Returns:
+        Documents of all vectors (duplicates across vectors kept), carrying
+        score and rank metadata like ScoredRetriever results
+    """
+    vector_store = get_vector_store()
+    search_filter = {"author": {"$in": allowed_authors}}
+    namespace = await get_index_namespace()
+
+    async def search(vector: list[float]) -> list[Document]:
+        async with observe_dependency("pinecone", "search_by_vector"):
+            results = await asyncio.to_thread(
+                vector_store.similarity_search_by_vector_with_score,
+                vector,
+                k=k,
+                filter=search_filter,
+                namespace=namespace,
+            )
+        return annotate_scores(results)
+
+    results = await asyncio.gather(*(search(vector) for vector in vectors))
+    return [doc for docs in results for doc in docs]
@@ -0,0 +1,216 @@
+"""
+OpenTelemetry tracing for the Agent service.
+
+Tracing is optional: install the `tracing` extra and set TRACING_EXPORTER
+("otlp" or "file") to enable it. Without the extra or with an empty
+exporter every helper here is a no-op.
+
+W3C trace-context headers are extracted by the FastAPI instrumentation and
+injected into Core calls by the httpx instrumentation, so one chat turn
+shows up as a single trace together with the Core requests it caused.
+"""
+
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Sequence
+
+from langchain_core.runnables import RunnableConfig
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+
+# Key of the chat turn's trace context in the graph run's config["configurable"]
+TRACE_CONTEXT_KEY = "otel_context"
+
+
+if OTEL_AVAILABLE:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """
+        Append finished spans to a file, one JSON object per line.
+
+        Duplicated in services/core/src/common/tracing.py: the services are
+        built from separate Docker contexts and share no package, so keep
+        both copies in sync.
+        """
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+            lines = [json.dumps(json.loads(span.to_json()), ensure_ascii=False) for span in spans]
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                logger.warning(f"Failed to write spans to {self.path}: {e}")
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+def configure_tracing(service_name: str, exporter: str, file_path: str = "") -> bool:
+    """
+    Install a global tracer provider.
+
+    Args:
+        service_name: Value of the service.name resource attribute
+        exporter: "otlp" (endpoint from OTEL_EXPORTER_OTLP_* env vars),
+            "file" (JSON lines at file_path) or "" to disable
+        file_path: Output path for the file exporter
+
+    Returns:
+        True if tracing was enabled
+    """
+    global _enabled
+
+    if not exporter:
+        return False
+    if not OTEL_AVAILABLE:
+        logger.warning("TRACING_EXPORTER is set but opentelemetry is not installed")
+        return False
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        span_exporter = OTLPSpanExporter()
+    elif exporter == "file":
+        span_exporter = JsonLinesSpanExporter(file_path or "traces.jsonl")
+    else:
+        logger.warning(f"Unknown tracing exporter {exporter!r}, tracing disabled")
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _enabled = True
+    logger.info(f"Tracing enabled ({exporter} exporter)")
+    return True
+
+
+def instrument_fastapi(app) -> None:
+    """Create server spans for incoming requests (extracts traceparent)."""
+    if not _enabled:
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics")
+
+
+def instrument_httpx_client(client) -> None:
+    """Create client spans for an httpx client (injects traceparent)."""
+    if not _enabled:
+        return
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+    HTTPXClientInstrumentor.instrument_client(client)
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans."""
+    if _enabled:
+        trace.get_tracer_provider().shutdown()
+
+
+@contextmanager
+def start_span(name: str, context: Any = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Start a span as the current span, or do nothing when tracing is off.
+
+    Only for code that does not suspend across tasks while the span is
+    current (coroutines, not async generators; see open_span).
+
+    Args:
+        name: Span name
+        context: Parent context (defaults to the current one)
+
+    Usage:
+        with start_span("graph.route_query", context=parent):
+            ...
+    """
+    if not _enabled:
+        yield None
+        return
+
+    tracer = trace.get_tracer("changple.agent")
+    with tracer.start_as_current_span(name, context=context, attributes=attributes) as span:
+        yield span
+
+
+def open_span(name: str, **attributes: Any) -> tuple[Any, Any]:
+    """
+    Start a span without making it current; the caller must end() it.
+
+    An async generator (the SSE stream) cannot attach a context around its
+    yields: it would leak into, or fail to detach from, whichever task
+    resumes the generator. Work that should be a child of the span gets the
+    returned context explicitly (run_in_context, TRACE_CONTEXT_KEY).
+
+    Returns:
+        Tuple of (span, context with the span), or (None, None) when tracing is off
+    """
+    if not _enabled:
+        return None, None
+    span = trace.get_tracer("changple.agent").start_span(name, attributes=attributes)
+    return span, trace.set_span_in_context(span)
+
+
+async def run_in_context(context: Any, awaitable: Awaitable[Any]) -> Any:
+    """Await `awaitable` with `context` attached (as is when context is None)."""
+    if context is None:
+        return await awaitable
+    token = otel_context.attach(context)
+    try:
+        return await awaitable
+    finally:
+        otel_context.detach(token)
+
+
+def traced_node(
+    name: str, fn: Callable[..., Awaitable[dict]]
+) -> Callable[..., Awaitable[dict]]:
+    """
+    Wrap an async graph node so each execution gets its own span.
+
+    The span's parent is the chat turn's context from the run config
+    (configurable[TRACE_CONTEXT_KEY]), falling back to the current context.
+
+    Args:
+        name: Node name used as span name (graph.<name>)
+        fn: Async node function taking the node input only
+
+    Returns:
+        Wrapped node function
+    """
+
+    # Not functools.wraps: LangGraph inspects the signature (following
+    # __wrapped__) to decide whether to pass the config
+    async def wrapper(state: Any, config: RunnableConfig) -> dict:
+        parent = (config.get("configurable") or {}).get(TRACE_CONTEXT_KEY)
+        with start_span(f"graph.{name}", context=parent, **{"langgraph.node": name}):
+            return await fn(state)
+
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
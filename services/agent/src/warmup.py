@@ -0,0 +1,172 @@
+"""
+Startup warm-up and readiness tracking.
+
+Run from the lifespan as a background task so /health answers immediately
+while /ready reports 503 until the required resources are warm:
+
+- graph: compile the LangGraph application singleton
+- postgres: open pooled connections and read a checkpoint
+- redis: ping through the connection pool
+- core: load the allowed-author, brand and ingest-generation caches
+- models: one minimal call through each cached chat model and a one-word
+  embedding, so every provider client has an open TLS connection
+- vectorstore: one retrieval, opening the Pinecone connection
+- synthetic_turn (optional): a full graph run on a throwaway thread
+
+Each step is timed and logged; failures of optional steps are reported by
+/ready but do not block readiness.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import FastAPI
+from langchain_core.messages import HumanMessage
+
+from src.config import get_settings
+from src.graph.builder import get_app, get_graph_core_client
+from src.providers.models import get_chat_model, get_embeddings
+from src.services.vectorstore import get_vector_store_retriever
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_RESOURCES = ("graph", "postgres", "redis")
+WARMUP_MESSAGE = "치킨집 창업할 때 상권 분석은 어떻게 해야 하나요?"
+WARMUP_PING = "안녕"
+
+
+def warmup_models() -> tuple[dict, ...]:
+    """get_chat_model arguments of the models used by the graph nodes and memory compaction."""
+    return (
+        {"model_name": "gemini-2.5-flash"},
+        # generate_queries streams its queries in incremental mode
+        {
+            "model_name": "gemini-2.5-flash",
+            "temperature": 1,
+            "streaming": get_settings().incremental_query_retrieval,
+        },
+        {"model_name": "gemini-2.5-flash", "streaming": True},
+        {"model_name": "gemini-2.0-flash"},
+        {"streaming": True},
+    )
+
+
+@dataclass
+class ResourceStatus:
+    """Warm-up state of a single resource."""
+
+    ready: bool = False
+    seconds: float | None = None
+    error: str | None = None
+
+
+class Readiness:
+    """Warm-up results keyed by resource name."""
+
+    def __init__(self, required: tuple[str, ...] = REQUIRED_RESOURCES):
+        self.required = required
+        self.resources: dict[str, ResourceStatus] = {name: ResourceStatus() for name in required}
+        self.finished = False
+
+    @property
+    def ready(self) -> bool:
+        return all(self.resources[name].ready for name in self.required)
+
+    def mark(self, name: str, seconds: float, error: str | None = None) -> None:
+        self.resources[name] = ResourceStatus(ready=error is None, seconds=seconds, error=error)
+
+    async def step(self, name: str, fn: Callable[[], Awaitable[Any]], timeout: float) -> bool:
+        """Run and time one warm-up step; return whether it succeeded."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(fn(), timeout)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self.mark(name, elapsed, error=f"{type(e).__name__}: {e}")
+            logger.warning(f"Warm-up {name} failed after {elapsed:.2f}s: {e}")
+            return False
+        elapsed = time.perf_counter() - started
+        self.mark(name, elapsed)
+        logger.info(f"Warm-up {name} ready in {elapsed:.2f}s")
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "finished": self.finished,
+            "resources": {name: asdict(status) for name, status in self.resources.items()},
+        }
+
+
+async def warm_up(app: FastAPI, readiness: Readiness) -> None:
+    """
+    Warm the resources used by the first chat turn.
+
+    Args:
+        app: FastAPI application (lifespan resources on app.state)
+        readiness: Readiness to record results into
+    """
+    settings = get_settings()
+    timeout = settings.warmup_timeout_seconds
+    state = app.state
+    started = time.perf_counter()
+
+    if not await readiness.step(
+        "graph", lambda: get_app(state.pool, state.httpx, state.redis), timeout
+    ):
+        readiness.finished = True
+        return
+    graph = await get_app(state.pool, state.httpx, state.redis)
+    core_client = get_graph_core_client()
+
+    async def postgres() -> None:
+        await graph.checkpointer.aget({"configurable": {"thread_id": "warmup"}})
+
+    async def core() -> None:
+        await asyncio.gather(
+            core_client.get_allowed_authors(),
+            core_client.get_brands(),
+            core_client.get_ingest_generation(),
+        )
+
+    async def models() -> None:
+        # Each cached client has its own connection pool, so each gets a call
+        await asyncio.gather(
+            *(get_chat_model(**kwargs).ainvoke(WARMUP_PING) for kwargs in warmup_models()),
+            get_embeddings().aembed_query(WARMUP_PING),
+        )
+
+    await asyncio.gather(
+        readiness.step("postgres", postgres, timeout),
+        readiness.step("redis", state.redis.ping, timeout),
+        readiness.step("core", core, timeout),
+        readiness.step("models", models, timeout),
+    )
+
+    async def vectorstore() -> None:
+        authors = await core_client.get_allowed_authors()
+        await get_vector_store_retriever(authors, k=1).ainvoke(WARMUP_MESSAGE)
+
+    await readiness.step("vectorstore", vectorstore, timeout)
+
+    if settings.warmup_synthetic_turn:
+
+        async def synthetic_turn() -> None:
+            thread_id = f"warmup-{uuid.uuid4()}"
+            config = {"configurable": {"thread_id": thread_id}}
+            try:
+                await graph.ainvoke({"messages": [HumanMessage(content=WARMUP_MESSAGE)]}, config)
+            finally:
+                await graph.checkpointer.adelete_thread(thread_id)
+
+        await readiness.step("synthetic_turn", synthetic_turn, timeout)
+
+    readiness.finished = True
+    logger.info(
+        f"Warm-up finished in {time.perf_counter() - started:.2f}s "
+        f"(ready={readiness.ready})"
+    )
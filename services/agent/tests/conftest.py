@@ -0,0 +1,50 @@
+"""
+Pytest configuration for Changple Agent service tests.
+"""
+
+import pytest
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client calls the agent makes."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def _check(self) -> None:
+        if self.fail:
+            raise ConnectionError("Redis unavailable")
+
+    async def get(self, key: str):
+        self._check()
+        return self.data.get(key)
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._check()
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+
+@pytest.fixture
+def fake_redis():
+    """A working in-memory Redis."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def broken_redis():
+    """A Redis whose every call fails."""
+    return FakeRedis(fail=True)
+
+
+@pytest.fixture
+def four_workers(monkeypatch):
+    """Settings of a service running AGENT_WORKERS=4."""
+    from src.config import get_settings
+
+    monkeypatch.setenv("AGENT_WORKERS", "4")
+    get_settings.cache_clear()
+    yield get_settings()
+    get_settings.cache_clear()
@@ -0,0 +1,144 @@
+"""
+Tests for admission control of chat turns.
+"""
+
+import pytest
+
+from src.services import admission
+from src.services.admission import AdmissionController, AdmissionRejected
+
+
+class TestReserve:
+    """Tests for reserving tickets."""
+
+    async def test_admits_while_slots_are_free(self):
+        """Test tickets are admitted up to max_inflight, then queued."""
+        controller = AdmissionController(max_inflight=2, max_queue=5)
+        first, second, third = (controller.reserve("a") for _ in range(3))
+
+        assert first.admitted and second.admitted
+        assert not third.admitted
+        assert (controller.inflight, controller.queued) == (2, 1)
+
+    async def test_rejects_when_queue_is_full(self):
+        """Test reserving beyond max_queue raises AdmissionRejected."""
+        controller = AdmissionController(max_inflight=1, max_queue=1)
+        controller.reserve("a")
+        controller.reserve("b")
+        with pytest.raises(AdmissionRejected):
+            controller.reserve("c")
+        assert controller.queued == 1
+
+    async def test_free_slot_does_not_jump_the_queue(self):
+        """Test a new ticket waits behind queued ones even if a slot looks free."""
+        controller = AdmissionController(max_inflight=1, max_queue=5)
+        running = controller.reserve("a")
+        waiting = controller.reserve("b")
+        controller.max_inflight = 2
+        assert not controller.reserve("c").admitted
+
+        running.release()
+        assert waiting.admitted
+
+
+class TestFairness:
+    """Tests for round-robin ordering across users."""
+
+    async def test_round_robin_across_users(self):
+        """Test a user with many waiting turns cannot starve another user."""
+        controller = AdmissionController(max_inflight=1, max_queue=10)
+        running = controller.reserve("busy")
+        busy = [controller.reserve("busy") for _ in range(3)]
+        other = controller.reserve("other")
+
+        admitted = []
+        current = running
+        for _ in range(4):
+            current.release()
+            current = next(t for t in [*busy, other] if t.admitted and not t.released)
+            admitted.append(current)
+        assert admitted == [busy[0], other, busy[1], busy[2]]
+
+    async def test_positions_follow_admission_order(self):
+        """Test positions match the round-robin order and update as turns finish."""
+        controller = AdmissionController(max_inflight=1, max_queue=10)
+        running = controller.reserve("a")
+        a1, a2 = controller.reserve("a"), controller.reserve("a")
+        b1 = controller.reserve("b")
+
+        assert [t.position() for t in (a1, b1, a2)] == [1, 2, 3]
+        assert running.position() == 0
+
+        running.release()
+        assert a1.admitted and a1.position() == 0
+        assert [t.position() for t in (b1, a2)] == [1, 2]
+
+    async def test_estimated_wait_scales_with_position(self):
+        """Test the estimate counts rounds of max_inflight turns."""
+        controller = AdmissionController(max_inflight=2, max_queue=10, initial_turn_seconds=10)
+        assert controller.estimated_wait(0) == 0.0
+        assert controller.estimated_wait(2) == 10.0
+        assert controller.estimated_wait(3) == 20.0
+
+
+class TestWaitAndRelease:
+    """Tests for waiting, timeouts and releasing."""
+
+    async def test_wait_returns_when_admitted(self):
+        """Test a waiting ticket is admitted when a running turn ends."""
+        controller = AdmissionController(max_inflight=1, max_queue=5)
+        running = controller.reserve("a")
+        waiting = controller.reserve("b")
+
+        running.release()
+        assert await waiting.wait(timeout=0.1) is True
+
+    async def test_wait_times_out(self):
+        """Test wait gives up after the timeout and leaving frees the queue spot."""
+        controller = AdmissionController(max_inflight=1, max_queue=5)
+        controller.reserve("a")
+        waiting = controller.reserve("b")
+
+        assert await waiting.wait(timeout=0.01) is False
+        assert controller.queued == 1
+        waiting.release()
+        assert controller.queued == 0
+        assert waiting.position() == 0
+
+    async def test_double_release_frees_one_slot(self):
+        """Test releasing a ticket twice does not free a second slot."""
+        controller = AdmissionController(max_inflight=1, max_queue=5)
+        running = controller.reserve("a")
+        waiting = controller.reserve("b")
+
+        running.release()
+        running.release()
+        assert controller.inflight == 1
+        assert waiting.admitted
+        waiting.release()
+        waiting.release()
+        assert (controller.inflight, controller.queued) == (0, 0)
+
+    async def test_released_waiting_ticket_is_never_admitted(self):
+        """Test a ticket that left the queue is skipped when a slot frees up."""
+        controller = AdmissionController(max_inflight=1, max_queue=5)
+        running = controller.reserve("a")
+        gone, waiting = controller.reserve("b"), controller.reserve("c")
+
+        gone.release()
+        running.release()
+        assert not gone.admitted
+        assert waiting.admitted
+        assert controller.inflight == 1
+
+
+class TestGetAdmission:
+    """Tests for the process-wide controller."""
+
+    def test_limits_are_split_across_workers(self, monkeypatch, four_workers):
+        """Test each worker admits and queues its share of the totals."""
+        monkeypatch.setattr(admission, "_controller", None)
+        monkeypatch.setattr(four_workers, "admission_max_inflight", 16)
+        monkeypatch.setattr(four_workers, "admission_max_queue", 64)
+        controller = admission.get_admission()
+        assert (controller.max_inflight, controller.max_queue) == (4, 16)
@@ -0,0 +1,159 @@
+"""
+Tests for attachment-aware retrieval.
+"""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+
+from src.config import Settings, get_settings
+from src.graph import nodes
+from src.services import attachments
+from src.services.attachments import format_attachment, load_attachment_context, select_passages
+
+
+def passage(text: str, embedding: list[float]) -> dict:
+    return {"text": text, "embedding": embedding}
+
+
+class FakeCoreClient:
+    """Records calls and serves canned attachment context."""
+
+    def __init__(self, contents: list[dict]):
+        self.contents = contents
+        self.calls: list[str] = []
+
+    async def get_content_context(self, content_ids):
+        self.calls.append("context")
+        return {"contents": self.contents}
+
+    async def get_allowed_authors(self):
+        self.calls.append("authors")
+        return ["창플"]
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.queries: list[str] = []
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.queries.append(text)
+        return [1.0, 0.0]
+
+
+@pytest.fixture
+def retrieval(monkeypatch):
+    """Fake question embeddings and vector search, recording the searched vectors."""
+    embeddings = FakeEmbeddings()
+    searches = []
+
+    async def search_by_vectors(vectors, allowed_authors, k):
+        searches.append((vectors, allowed_authors, k))
+        return [Document(page_content="시드", id="1")]
+
+    monkeypatch.setattr(attachments, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(attachments, "search_by_vectors", search_by_vectors)
+    return embeddings, searches
+
+
+class TestSelectPassages:
+    """Tests for select_passages."""
+
+    def test_picks_most_similar_in_document_order(self):
+        """Test the closest passages are kept, then put back in document order."""
+        passages = [
+            passage("먼 문단", [0.0, 1.0]),
+            passage("가까운 문단", [1.0, 0.1]),
+            passage("중간 문단", [1.0, 1.0]),
+            passage("같은 방향", [2.0, 0.0]),
+        ]
+        selected = select_passages([1.0, 0.0], passages, limit=2)
+        assert [p["text"] for p in selected] == ["가까운 문단", "같은 방향"]
+
+    def test_zero_vector_and_limit(self):
+        """Test zero vectors score 0 and limits beyond the count keep everything."""
+        passages = [passage("a", [0.0, 0.0]), passage("b", [1.0, 0.0])]
+        assert select_passages([1.0, 0.0], passages, limit=1) == [passages[1]]
+        assert select_passages([1.0, 0.0], passages, limit=5) == passages
+
+
+class TestFormatAttachment:
+    """Tests for format_attachment."""
+
+    def test_summary_and_passages(self):
+        """Test processed attachments show the summary and the selected passages."""
+        text = format_attachment(
+            {"title": "칼럼", "summary": "요약문"}, [passage("첫", []), passage("둘", [])]
+        )
+        assert text == "## 칼럼\n요약: 요약문\n\n첫\n\n(...)\n\n둘"
+
+    def test_full_text_fallback(self):
+        """Test unprocessed attachments keep their full text."""
+        assert format_attachment({"title": "", "text": "전문"}) == "전문"
+
+
+class TestLoadAttachmentContext:
+    """Tests for load_attachment_context."""
+
+    async def test_no_attachments(self, retrieval):
+        """Test nothing is fetched without attachments."""
+        core_client = FakeCoreClient([])
+        context = await load_attachment_context(core_client, [], "질문")
+        assert (context.text, context.documents) == ("", [])
+        assert core_client.calls == []
+
+    async def test_processed_attachment_seeds_retrieval(self, retrieval):
+        """Test processed columns use passages and seed retrieval with their vectors."""
+        embeddings, searches = retrieval
+        core_client = FakeCoreClient(
+            [
+                {
+                    "id": 1,
+                    "title": "칼럼",
+                    "summary": "요약문",
+                    "summary_embedding": [0.0, 1.0],
+                    "passages": [passage("관련", [1.0, 0.0]), passage("무관", [0.0, 1.0])],
+                    "text": "전문은 쓰지 않음",
+                }
+            ]
+        )
+
+        context = await load_attachment_context(core_client, [1], "질문")
+
+        assert embeddings.queries == ["질문"]
+        assert "관련" in context.text and "전문은 쓰지 않음" not in context.text
+        assert searches == [([[1.0, 0.0], [0.0, 1.0]], ["창플"], get_settings().attachment_seed_k)]
+        assert [d.id for d in context.documents] == ["1"]
+
+    async def test_unprocessed_attachment_uses_full_text(self, retrieval):
+        """Test columns not processed yet fall back to full text without retrieval."""
+        embeddings, searches = retrieval
+        core_client = FakeCoreClient(
+            [{"id": 1, "title": "", "text": "전문"}, {"id": 2, "error": "not found"}]
+        )
+
+        context = await load_attachment_context(core_client, [1, 2], "질문")
+
+        assert (context.text, context.documents) == ("전문", [])
+        assert embeddings.queries == [] and searches == []
+
+
+class TestSkipQueryGeneration:
+    """Tests for skipping generate_queries on attachment turns."""
+
+    def test_enabled_by_default(self):
+        """Test ATTACHMENT_SKIP_QUERY_GENERATION defaults on."""
+        assert Settings.model_fields["attachment_skip_query_generation"].default is True
+
+    async def test_seeded_turn_generates_no_queries(self):
+        """Test a turn with attachment seeds goes straight to documents_handler."""
+        state = {
+            "messages": [HumanMessage(content="이 칼럼 요약해줘")],
+            "attachment_documents": [Document(page_content="시드", id="1")],
+        }
+        update = await nodes.generate_queries(state, FakeCoreClient([]))
+        assert update == {
+            "retrieve_queries": [],
+            "allowed_authors": ["창플"],
+            "retrieval_done": True,
+        }
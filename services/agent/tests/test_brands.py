@@ -0,0 +1,137 @@
+"""
+Tests for brand-mention detection.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config import get_settings
+from src.graph import nodes
+from src.services import brands as brands_module
+from src.services.brands import AhoCorasick, BrandMatcher, format_brands, get_brand_matcher
+
+BRANDS = [
+    {"name": "원조부대찌개", "aliases": ["원조 부대"], "description": "부대찌개 전문점"},
+    {"name": "BBQ치킨", "aliases": ["비비큐", "B"], "description": "치킨 프랜차이즈"},
+    {"name": "부대찌개", "aliases": [], "description": "일반 부대찌개"},
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_matcher(monkeypatch):
+    """Start every test without a cached matcher."""
+    monkeypatch.setattr(brands_module, "_matcher", None)
+
+
+def names(found: list[dict]) -> list[str]:
+    return [brand["name"] for brand in found]
+
+
+class TestAhoCorasick:
+    """Tests for the automaton."""
+
+    def test_overlapping_patterns(self):
+        """Test patterns inside and overlapping other patterns are all found."""
+        automaton = AhoCorasick({"he": 1, "she": 2, "his": 3, "hers": 4})
+        found = automaton.find("ushers")
+        # "she" and "he" end on the same character; "hers" ends last
+        assert set(found[:2]) == {1, 2}
+        assert found[2:] == [4]
+
+    def test_failure_links_across_partial_matches(self):
+        """Test a failed partial match still finds a pattern starting inside it."""
+        automaton = AhoCorasick({"abcd": 1, "bce": 2})
+        assert automaton.find("abce") == [2]
+
+    def test_each_value_once(self):
+        """Test repeated mentions are reported once."""
+        assert AhoCorasick({"창플": 1}).find("창플 창플 창플") == [1]
+
+
+class TestBrandMatcher:
+    """Tests for BrandMatcher."""
+
+    def test_aliases_ignore_case_and_whitespace(self):
+        """Test names and aliases match regardless of case and spacing."""
+        matcher = BrandMatcher(BRANDS, "v1")
+        assert names(matcher.find(["bbq 치킨 어때요"])) == ["BBQ치킨"]
+        assert names(matcher.find(["원조부대 창업"])) == ["원조부대찌개"]
+        assert names(matcher.find(["비 비 큐"])) == ["BBQ치킨"]
+
+    def test_short_aliases_are_ignored(self):
+        """Test single-character aliases never match."""
+        assert BrandMatcher(BRANDS, "v1").find(["B급 상권"]) == []
+
+    def test_nested_names_both_match(self):
+        """Test a brand name inside another brand's name matches both."""
+        found = BrandMatcher(BRANDS, "v1").find(["원조부대찌개 창업비용"])
+        assert sorted(names(found)) == ["부대찌개", "원조부대찌개"]
+
+    def test_order_and_limit_follow_texts(self):
+        """Test brands are ordered by first mention across texts and truncated."""
+        matcher = BrandMatcher(BRANDS, "v1")
+        # The alias "원조 부대" ends before "부대찌개" does
+        texts = ["비비큐 말고", "원조 부대찌개는요?"]
+        assert names(matcher.find(texts)) == ["BBQ치킨", "원조부대찌개", "부대찌개"]
+        assert names(matcher.find(texts, limit=2)) == ["BBQ치킨", "원조부대찌개"]
+
+
+class TestGetBrandMatcher:
+    """Tests for rebuilding the process-wide matcher."""
+
+    def test_same_list_reuses_matcher(self):
+        """Test the same list object returns the cached matcher."""
+        assert get_brand_matcher(BRANDS) is get_brand_matcher(BRANDS)
+
+    def test_equal_list_keeps_automaton(self):
+        """Test a refreshed but unchanged list does not rebuild."""
+        matcher = get_brand_matcher(BRANDS)
+        refreshed = [dict(brand) for brand in BRANDS]
+        assert get_brand_matcher(refreshed) is matcher
+        assert matcher.brands is refreshed
+
+    def test_changed_list_rebuilds(self):
+        """Test a changed brand list builds a matcher with the new patterns."""
+        first = get_brand_matcher(BRANDS)
+        changed = BRANDS + [{"name": "창플김밥", "aliases": []}]
+        second = get_brand_matcher(changed)
+        assert second is not first
+        assert names(second.find(["창플김밥 가맹"])) == ["창플김밥"]
+
+
+class TestFormatBrands:
+    """Tests for format_brands."""
+
+    def test_truncates_descriptions(self):
+        """Test long descriptions are cut to max_description_chars."""
+        text = format_brands([{"name": "창플", "description": "가" * 10}], 4)
+        assert text == "창플: 가가가가..."
+
+
+class FakeCoreClient:
+    async def get_brands(self):
+        return BRANDS
+
+    async def get_allowed_authors(self):
+        return ["창플"]
+
+
+class TestBrandPromptLimit:
+    """Tests for BRAND_PROMPT_LIMIT in generate_queries."""
+
+    async def test_only_first_mentioned_brands_are_used(self, monkeypatch):
+        """Test at most brand_prompt_limit brands, latest message first, are added."""
+        monkeypatch.setattr(get_settings(), "brand_prompt_limit", 2)
+        monkeypatch.setattr(nodes, "emit_status", lambda status: None)
+        monkeypatch.setattr(nodes, "_expand_locally", lambda state, client: ["창업 비용"])
+        state = {
+            "messages": [
+                HumanMessage(content="원조부대찌개 알려줘"),
+                AIMessage(content="네"),
+                HumanMessage(content="비비큐는요?"),
+            ]
+        }
+
+        update = await nodes.generate_queries(state, FakeCoreClient())
+
+        assert update["retrieve_queries"] == ["창업 비용", "BBQ치킨", "원조부대찌개"]
@@ -0,0 +1,104 @@
+"""
+Tests for rewriting [n] citation markers while streaming.
+"""
+
+import itertools
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from src.api.chat import stream_graph
+from src.graph.nodes import CitationRewriter, rewrite_citations
+
+MAPPING = {1: "https://cafe.naver.com/cjdckddus/1", 12: "https://cafe.naver.com/cjdckddus/12"}
+
+TEXTS = [
+    "상권 분석이 먼저입니다[1]. 메뉴는 [12]를 참고하세요.",
+    "[1][12][1]",
+    "모르는 출처 [3]와 [123]는 그대로 [12]",
+    "대괄호만 [ 있거나 [1 끝나지 않거나 [a] 문자",
+    "배열 표기 [1, 12]와 [[12]] 중첩",
+    "끝에 걸친 인용 [12",
+    "끝에 여는 괄호 [",
+    "",
+]
+
+
+def stream(rewriter: CitationRewriter, chunks: list[str]) -> str:
+    return "".join(rewriter.feed(chunk) for chunk in chunks) + rewriter.flush()
+
+
+def splits(text: str, cuts: int):
+    """Every way of cutting `text` into cuts + 1 chunks (empty chunks included)."""
+    for offsets in itertools.combinations_with_replacement(range(len(text) + 1), cuts):
+        bounds = [0, *offsets, len(text)]
+        yield [text[a:b] for a, b in itertools.pairwise(bounds)]
+
+
+class TestCitationRewriter:
+    """Property-style tests: any chunking gives rewrite_citations of the whole text."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_every_single_split(self, text):
+        """Test splitting at every offset matches the one-shot rewrite."""
+        expected = rewrite_citations(text, MAPPING)
+        for chunks in splits(text, 1):
+            assert stream(CitationRewriter(MAPPING), chunks) == expected, chunks
+
+    @pytest.mark.parametrize("text", ["[1][12]", "a[12]b[3]", "[[1]"])
+    def test_every_double_split(self, text):
+        """Test every three-chunk split of short texts, across both boundaries."""
+        expected = rewrite_citations(text, MAPPING)
+        for chunks in splits(text, 2):
+            assert stream(CitationRewriter(MAPPING), chunks) == expected, chunks
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_character_by_character(self, text):
+        """Test one-character chunks, the finest tokenisation."""
+        assert stream(CitationRewriter(MAPPING), list(text)) == rewrite_citations(text, MAPPING)
+
+    def test_only_partial_markers_are_held_back(self):
+        """Test text is emitted right away unless it ends in "[" or "[digits"."""
+        rewriter = CitationRewriter(MAPPING)
+        assert rewriter.feed("상권 [") == "상권 "
+        assert rewriter.feed("1") == ""
+        assert rewriter.feed("2] 참고") == f"[\\[12\\]]({MAPPING[12]}) 참고"
+        assert rewriter.feed("모르는 [3") == "모르는 "
+        assert rewriter.feed("] 끝") == "[3] 끝"
+        assert rewriter.flush() == ""
+
+    def test_without_mapping_passes_through(self):
+        """Test nothing is held back or rewritten without citations."""
+        rewriter = CitationRewriter({})
+        assert rewriter.feed("[1") == "[1"
+        assert rewriter.flush() == ""
+
+
+class FakeApp:
+    """Replays a respond_with_docs turn through LangGraph's stream modes."""
+
+    def __init__(self, chunks: list[str]):
+        self.chunks = chunks
+
+    async def astream(self, input_data, config, stream_mode):
+        metadata = {"langgraph_node": "respond_with_docs"}
+        yield "custom", {"status": "generating"}
+        yield "custom", {"citations": MAPPING}
+        for chunk in self.chunks:
+            yield "messages", (AIMessageChunk(content=chunk), metadata)
+        yield "updates", {"respond_with_docs": {"source_documents": [{"id": 1}]}}
+
+
+class TestStreamGraph:
+    """Tests for citation rewriting in stream_graph."""
+
+    @pytest.mark.parametrize("text", TEXTS[:3] + TEXTS[5:6])
+    async def test_streamed_answer_matches_saved_answer(self, text):
+        """Test the streamed chunks join to the rewritten answer at every split."""
+        for chunks in splits(text, 1):
+            events = [event async for event in stream_graph(FakeApp(chunks), {}, {})]
+            streamed = "".join(value for kind, value in events if kind == "chunk")
+            assert streamed == rewrite_citations(text, MAPPING), chunks
+            assert events[0] == ("status", "generating")
+            assert events[-1] == ("sources", [{"id": 1}])
+            assert all(value for kind, value in events if kind == "chunk")
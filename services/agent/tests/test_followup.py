@@ -0,0 +1,223 @@
+"""
+Tests for the session working set and follow-up turns.
+"""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config import get_settings
+from src.graph import nodes
+from src.graph.followup import build_working_set, detect_followup, working_set_documents
+from src.graph.relevance import CandidateStats, RelevancePlan
+from src.services.keyword_expander import KeywordExpander
+
+WORKING_SET = [{"id": "1", "score": 0.8}, {"id": "2", "score": 0.6}]
+
+
+@pytest.fixture
+def expander():
+    return KeywordExpander({"인테리어": 5, "보증금": 3}, {}, source="posts-1.sqlite3")
+
+
+class TestDetectFollowup:
+    """Tests for detect_followup decisions."""
+
+    @pytest.mark.parametrize(
+        "question",
+        ["더 자세히 알려주세요", "그럼 어떻게 해야 하나요?", "아까 말씀하신 방법으로요"],
+    )
+    def test_reuse_without_new_keywords(self, question, expander):
+        """Test conversational follow-ups without domain keywords reuse the set."""
+        assert detect_followup(question, WORKING_SET, expander) == "reuse"
+
+    @pytest.mark.parametrize("question", ["그럼 인테리어 비용은?", "위에서 말한 보증금은요?"])
+    def test_incremental_with_new_keywords(self, question, expander):
+        """Test follow-ups naming a domain keyword retrieve incrementally."""
+        assert detect_followup(question, WORKING_SET, expander) == "incremental"
+
+    def test_incremental_without_vocabulary(self):
+        """Test new topics cannot be ruled out without the keyword vocabulary."""
+        assert detect_followup("더 알려주세요", WORKING_SET, None) == "incremental"
+
+    @pytest.mark.parametrize(
+        "question",
+        ["인테리어 비용은 얼마인가요?", "그럼 " + "아주 " * 30 + "긴 질문", ""],
+    )
+    def test_fresh_questions(self, question, expander):
+        """Test new questions and long questions run the full pipeline."""
+        assert detect_followup(question, WORKING_SET, expander) == "fresh"
+
+    def test_fresh_without_working_set(self, expander):
+        """Test a thread without a working set always starts fresh."""
+        assert detect_followup("더 자세히 알려주세요", [], expander) == "fresh"
+
+    def test_max_chars_after_collapsing_whitespace(self, expander):
+        """Test the length limit applies to the normalised question."""
+        question = "그럼   " + "가" * 10
+        assert detect_followup(question, WORKING_SET, expander, max_chars=13) == "reuse"
+        assert detect_followup(question, WORKING_SET, expander, max_chars=12) == "fresh"
+
+
+class TestWorkingSet:
+    """Tests for building and expanding the working set."""
+
+    def test_build_sorts_by_score_and_limits(self):
+        """Test kept candidates are ordered by score (unscored last) and capped."""
+        stats = [
+            CandidateStats(doc=Document(page_content="", id=str(i)), score=score)
+            for i, score in enumerate([0.5, None, 0.9, 0.7])
+        ]
+        assert build_working_set(stats, [0, 1, 2], limit=5) == [
+            {"id": "2", "score": 0.9},
+            {"id": "0", "score": 0.5},
+            {"id": "1", "score": None},
+        ]
+        assert build_working_set(stats, [0, 1, 2, 3], limit=2) == [
+            {"id": "2", "score": 0.9},
+            {"id": "3", "score": 0.7},
+        ]
+
+    def test_placeholder_documents(self):
+        """Test placeholders carry the post id and the kept score."""
+        docs = working_set_documents([{"id": 7, "score": 0.8}])
+        assert (docs[0].id, docs[0].page_content, docs[0].metadata) == ("7", "", {"score": 0.8})
+
+
+class FakeCoreClient:
+    """Serves post content and allowed authors; no snapshot."""
+
+    snapshot = None
+
+    async def get_post_content(self, post_id: int) -> dict:
+        return {"title": f"제목 {post_id}", "content": f"post{post_id}", "url": ""}
+
+    async def get_allowed_authors(self) -> list[str]:
+        return ["창플"]
+
+
+@pytest.fixture
+def quiet_nodes(monkeypatch):
+    """Nodes run outside a graph: no stream writer."""
+    monkeypatch.setattr(nodes, "emit_status", lambda status: None)
+
+
+class TestDetectFollowupNode:
+    """Tests for the route_query follow-up check."""
+
+    def state(self, **extra) -> dict:
+        return {
+            "messages": [
+                HumanMessage(content="상권은?"),
+                AIMessage(content="..."),
+                HumanMessage(content="더 자세히 알려주세요"),
+            ],
+            "working_set": WORKING_SET,
+            **extra,
+        }
+
+    def test_disabled_by_default(self):
+        """Test follow-up detection is off unless configured."""
+        assert nodes._detect_followup(self.state(), FakeCoreClient()) == "fresh"
+
+    def test_enabled(self, monkeypatch):
+        """Test a follow-up is detected once enabled (no vocabulary: incremental)."""
+        monkeypatch.setattr(get_settings(), "followup_detection", True)
+        assert nodes._detect_followup(self.state(), FakeCoreClient()) == "incremental"
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"attachment_documents": [Document(page_content="", id="9")]},
+            {"user_attached_content": "칼럼 본문"},
+        ],
+    )
+    def test_attachment_turns_are_fresh(self, monkeypatch, extra):
+        """Test turns with attachments always retrieve afresh."""
+        monkeypatch.setattr(get_settings(), "followup_detection", True)
+        assert nodes._detect_followup(self.state(**extra), FakeCoreClient()) == "fresh"
+
+
+class TestFollowupNodes:
+    """Tests for the reuse and incremental nodes."""
+
+    async def test_reuse_working_set(self, quiet_nodes):
+        """Test the working-set posts are answered from directly, all helpful."""
+        state = {"messages": [], "working_set": WORKING_SET}
+        update = await nodes.reuse_working_set(state, FakeCoreClient())
+
+        docs = update["documents"]["documents"]
+        assert [d.page_content for d in docs] == ["post1", "post2"]
+        assert update["helpful_documents"] == [1, 2]
+        assert update["retrieve_queries"] == []
+
+    async def test_retrieve_followup_merges_working_set(self, quiet_nodes, monkeypatch):
+        """Test only the question is retrieved and appended to the working set."""
+        searched = []
+
+        class Retriever:
+            async def ainvoke(self, query):
+                searched.append(query)
+                return [Document(page_content="", id="3", metadata={"score": 0.7})]
+
+        monkeypatch.setattr(nodes, "get_vector_store_retriever", lambda authors: Retriever())
+        state = {"messages": [HumanMessage(content="그럼 인테리어는?")], "working_set": WORKING_SET}
+
+        update = await nodes.retrieve_followup(state, FakeCoreClient())
+
+        assert searched == ["그럼 인테리어는?"]
+        assert [d.id for d in update["documents"]] == ["1", "2", "3"]
+        assert update["retrieval_done"] is True
+
+
+class TestCarryWorkingSet:
+    """Tests for keeping working-set documents without re-judging them."""
+
+    def stats(self, *ids: str) -> list[CandidateStats]:
+        return [CandidateStats(doc=Document(page_content="", id=i)) for i in ids]
+
+    def test_working_set_is_accepted(self):
+        """Test working-set candidates move from judge/rejected to accepted."""
+        plan = RelevancePlan(
+            decision="band", proposed="band", accepted=[3], judge=[0, 2], rejected=[1]
+        )
+        carried = nodes._carry_working_set(plan, self.stats("1", "2", "3", "4"), WORKING_SET)
+        assert (carried.accepted, carried.judge, carried.rejected) == ([0, 1, 3], [2], [])
+        assert (carried.decision, carried.proposed) == ("band", "band")
+
+    def test_empty_working_set_keeps_plan(self):
+        """Test an empty working set changes nothing."""
+        plan = RelevancePlan(decision="full", proposed="band", judge=[0, 1])
+        carried = nodes._carry_working_set(plan, self.stats("1", "2"), [])
+        assert (carried.accepted, carried.judge, carried.rejected) == ([], [0, 1], [])
+
+    async def test_documents_handler_judges_only_new_candidates(self, quiet_nodes, monkeypatch):
+        """Test an incremental turn judges new results only and keeps the working set."""
+        settings = get_settings()
+        monkeypatch.setattr(settings, "summary_first_relevance", False)
+        judged = []
+
+        async def judge_relevance(docs, state, enough=None):
+            judged.extend(d.page_content for d in docs)
+            return [0]
+
+        monkeypatch.setattr(nodes, "judge_relevance", judge_relevance)
+        retrieved = [
+            Document(page_content="", id="1", metadata={"score": 0.9, "rank": 0}),
+            Document(page_content="", id="3", metadata={"score": 0.7, "rank": 1}),
+            Document(page_content="", id="4", metadata={"score": 0.5, "rank": 2}),
+        ]
+        state = {
+            "messages": [HumanMessage(content="그럼 인테리어는?")],
+            "documents": working_set_documents(WORKING_SET) + retrieved,
+            "retrieve_queries": ["그럼 인테리어는?"],
+            "working_set": WORKING_SET,
+            "followup": "incremental",
+        }
+
+        update = await nodes.documents_handler(state, FakeCoreClient())
+
+        assert judged == ["post3", "post4"]
+        kept = [d.page_content for d in update["documents"]["documents"]]
+        assert kept == ["post1", "post2", "post3"]
+        assert [item["id"] for item in update["working_set"]] == ["1", "3", "2"]
@@ -0,0 +1,242 @@
+"""
+Tests for the provider gateway: limits, fallback and hedging.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from src.config import Settings
+from src.providers import gateway as gateway_module
+from src.providers.gateway import (
+    GatewayChatModel,
+    ProviderGateway,
+    TokenBucket,
+    _race,
+    get_gateway,
+)
+
+
+class ProviderError(Exception):
+    """Scripted provider failure."""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model with a fixed answer, first-token delay and optional failure."""
+
+    chunks: list[str] = ["창업", "상담"]
+    delay: float = 0.0
+    error: bool = False
+    events: list[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self.events.append("called")
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise ProviderError("503")
+        message = AIMessage(content="".join(self.chunks))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self.events.append("called")
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise ProviderError("503")
+            for chunk in self.chunks:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
+        except asyncio.CancelledError:
+            self.events.append("cancelled")
+            raise
+
+    async def astream(self, input: Any, config=None, **kwargs: Any) -> AsyncIterator[Any]:
+        # Unlike BaseChatModel.astream, an empty answer ends the stream without raising
+        async for chunk in self._astream(input):
+            yield chunk.message
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """A fresh gateway: one slot per model, degraded after a single failure."""
+    provider_gateway = ProviderGateway(
+        {"default": {"max_concurrency": 1}}, queue_timeout=1.0, degraded_events=1
+    )
+    monkeypatch.setattr(gateway_module, "_gateway", provider_gateway)
+    return provider_gateway
+
+
+def gateway_model(
+    primary, fallback, hedge_after: float = 0.0, stream_hedge_after: float = 0.0
+) -> GatewayChatModel:
+    return GatewayChatModel(
+        primary=primary,
+        primary_name="primary",
+        fallback=fallback,
+        fallback_name="fallback",
+        hedge_after=hedge_after,
+        stream_hedge_after=stream_hedge_after,
+    )
+
+
+async def stream_text(model: GatewayChatModel) -> str:
+    return "".join([chunk.content async for chunk in model.astream("질문")])
+
+
+class TestRace:
+    """Tests for _race."""
+
+    async def test_fast_primary_wins_without_fallback(self):
+        """Test the fallback is never started when the primary answers in time."""
+        started = []
+
+        async def answer(value):
+            return value
+
+        primary = asyncio.ensure_future(answer("primary"))
+        winner, task, reason = await _race(
+            primary, lambda: started.append(1) or asyncio.ensure_future(answer("x")), 1.0
+        )
+        assert (winner, task.result(), reason) == ("primary", "primary", None)
+        assert started == []
+
+    async def test_both_failing_raises_last_failure(self):
+        """Test the fallback's error propagates when both models fail."""
+
+        async def fail(message):
+            raise ProviderError(message)
+
+        with pytest.raises(ProviderError, match="fallback"):
+            await _race(
+                asyncio.ensure_future(fail("primary")),
+                lambda: asyncio.ensure_future(fail("fallback")),
+                1.0,
+            )
+
+
+class TestFallback:
+    """Tests for falling back on primary errors."""
+
+    async def test_error_falls_back(self, gateway):
+        """Test a failing primary is answered by the fallback and recorded."""
+        model = gateway_model(
+            ScriptedChatModel(error=True), ScriptedChatModel(chunks=["대체", "답변"])
+        )
+        assert (await model.ainvoke("질문")).content == "대체답변"
+        assert gateway.is_degraded("primary")
+
+    async def test_stream_error_falls_back(self, gateway):
+        """Test a primary stream failing before its first chunk is replaced."""
+        model = gateway_model(
+            ScriptedChatModel(error=True), ScriptedChatModel(chunks=["대체", "답변"])
+        )
+        assert await stream_text(model) == "대체답변"
+        assert gateway.is_degraded("primary")
+
+    async def test_empty_primary_stream_is_not_a_failure(self, gateway):
+        """Test a primary stream ending without chunks does not fall back."""
+        fallback = ScriptedChatModel()
+        model = gateway_model(ScriptedChatModel(chunks=[]), fallback)
+        chunks = [chunk async for chunk in model._astream([HumanMessage(content="질문")])]
+        assert chunks == []
+        assert fallback.events == []
+        assert not gateway.is_degraded("primary")
+
+
+class TestHedging:
+    """Tests for hedging a slow first token."""
+
+    async def test_slow_first_token_hedges_and_cancels_loser(self, gateway):
+        """Test the fallback wins a slow primary, which is cancelled and frees its slot."""
+        primary = ScriptedChatModel(chunks=["느린", "답변"], delay=5.0)
+        model = gateway_model(
+            primary, ScriptedChatModel(chunks=["빠른", "답변"]), stream_hedge_after=0.05
+        )
+
+        assert await stream_text(model) == "빠른답변"
+        assert primary.events == ["called", "cancelled"]
+        assert not gateway._limiter("primary").semaphore.locked()
+        assert not gateway._limiter("fallback").semaphore.locked()
+
+    async def test_primary_answering_during_hedge_wins(self, gateway):
+        """Test a primary answering after the hedge started still wins the race."""
+        fallback = ScriptedChatModel(chunks=["대체"], delay=5.0)
+        model = gateway_model(ScriptedChatModel(chunks=["원래"], delay=0.1), fallback, 0.05)
+
+        assert (await model.ainvoke("질문")).content == "원래"
+        assert fallback.events == ["called"]
+        assert not gateway._limiter("fallback").semaphore.locked()
+        assert not gateway.is_degraded("primary")
+
+    async def test_streams_are_not_hedged_by_default(self, gateway):
+        """Test a slow first streamed token waits for the primary under the defaults."""
+        settings = Settings()
+        fallback = ScriptedChatModel(chunks=["대체"])
+        model = gateway_model(
+            ScriptedChatModel(chunks=["느린", "답변"], delay=0.1),
+            fallback,
+            hedge_after=0.05,
+            stream_hedge_after=settings.llm_hedge_after_seconds_streaming,
+        )
+
+        assert await stream_text(model) == "느린답변"
+        assert fallback.events == []
+        assert not gateway.is_degraded("primary")
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    async def test_waits_for_refill(self):
+        """Test a drained bucket waits for the refill rate."""
+        bucket = TokenBucket(per_minute=600)  # 10 tokens per second
+        await bucket.take(600)
+
+        started = time.monotonic()
+        await bucket.take(1)
+        assert 0.05 <= time.monotonic() - started < 1.0
+
+    async def test_refill_is_capped_at_capacity(self):
+        """Test idle time does not accumulate more than one minute of tokens."""
+        bucket = TokenBucket(per_minute=60)
+        await bucket.take(60)
+        bucket.updated -= 1000
+        await bucket.take(0)
+        assert bucket.tokens == 60
+
+    async def test_oversized_request_is_clamped(self):
+        """Test a request larger than the capacity waits for a full bucket only."""
+        bucket = TokenBucket(per_minute=60)
+        await asyncio.wait_for(bucket.take(1000), timeout=0.1)
+        assert bucket.tokens < 1
+
+
+class TestGatewayLimits:
+    """Tests for the process-wide gateway's limits."""
+
+    def test_limits_are_split_across_workers(self, monkeypatch, four_workers):
+        """Test each worker gets its share of the provider limits."""
+        monkeypatch.setattr(gateway_module, "_gateway", None)
+        monkeypatch.setattr(
+            four_workers,
+            "llm_model_limits",
+            {"default": {"max_concurrency": 2}, "m": {"max_concurrency": 32, "rpm": 1000}},
+        )
+        assert get_gateway().limits == {
+            "default": {"max_concurrency": 1},
+            "m": {"max_concurrency": 8, "rpm": 250},
+        }
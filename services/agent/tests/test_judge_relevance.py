@@ -0,0 +1,182 @@
+"""
+Tests for batch and per-document relevance judging.
+"""
+
+import asyncio
+import re
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+
+from src.config import get_settings
+from src.graph import nodes
+from src.graph.relevance import RelevancePlan
+from src.graph.state import DocJudgment
+
+
+class FakeJudge:
+    """Structured-output model answering from a script keyed by document content."""
+
+    def __init__(self, helpful=(), delays=None, failing=()):
+        self.helpful = set(helpful)
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.schema = None
+        self.active = 0
+        self.max_active = 0
+        self.cancelled: list[str] = []
+
+    def with_structured_output(self, schema):
+        self.schema = schema
+        return self
+
+    async def ainvoke(self, messages):
+        names = re.findall(r"Content: (doc\d+)", messages[0]["content"])
+        if self.schema is not DocJudgment:
+            return {"helpful_docs": [i + 1 for i, n in enumerate(names) if n in self.helpful]}
+
+        (name,) = names
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(name, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        finally:
+            self.active -= 1
+        if name in self.failing:
+            raise ValueError("malformed judgment")
+        return {"helpful": name in self.helpful}
+
+
+@pytest.fixture
+def judge_settings(monkeypatch):
+    """Per-document judging with a short deadline."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "relevance_judge_mode", "per_document")
+    monkeypatch.setattr(settings, "relevance_judge_concurrency", 6)
+    monkeypatch.setattr(settings, "relevance_judge_deadline_seconds", 0.2)
+    return settings
+
+
+def use_judge(monkeypatch, judge: FakeJudge) -> FakeJudge:
+    monkeypatch.setattr(nodes, "load_llm", lambda *args, **kwargs: judge)
+    return judge
+
+
+def docs(count: int) -> list[Document]:
+    return [Document(page_content=f"doc{i}", id=str(i)) for i in range(count)]
+
+
+STATE = {"messages": [HumanMessage(content="상권 분석은 어떻게 하나요?")]}
+
+
+class TestJudgeRelevanceEach:
+    """Tests for judge_relevance_each."""
+
+    async def test_returns_helpful_in_document_order(self, monkeypatch, judge_settings):
+        """Test helpful indices come back sorted regardless of finish order."""
+        use_judge(monkeypatch, FakeJudge(helpful={"doc0", "doc2"}, delays={"doc0": 0.05}))
+        assert await nodes.judge_relevance_each(docs(3), STATE) == [0, 2]
+
+    async def test_deadline_cancels_and_drops_slow_judges(self, monkeypatch, judge_settings):
+        """Test a judge still running at the deadline is cancelled and not kept."""
+        judge = use_judge(monkeypatch, FakeJudge(helpful={"doc0", "doc1"}, delays={"doc1": 5}))
+
+        assert await nodes.judge_relevance_each(docs(2), STATE) == [0]
+        await asyncio.sleep(0)
+        assert judge.cancelled == ["doc1"]
+
+    async def test_enough_positives_stop_early(self, monkeypatch, judge_settings):
+        """Test judging stops once `enough` documents were found helpful."""
+        judge = use_judge(
+            monkeypatch,
+            FakeJudge(helpful={"doc0", "doc1", "doc2"}, delays={"doc2": 5, "doc3": 5}),
+        )
+
+        assert await nodes.judge_relevance_each(docs(4), STATE, enough=2) == [0, 1]
+        await asyncio.sleep(0)
+        assert sorted(judge.cancelled) == ["doc2", "doc3"]
+
+    async def test_concurrency_is_bounded(self, monkeypatch, judge_settings):
+        """Test no more than relevance_judge_concurrency calls run at once."""
+        judge_settings.relevance_judge_concurrency = 2
+        judge = use_judge(monkeypatch, FakeJudge(helpful={"doc3"}))
+
+        assert await nodes.judge_relevance_each(docs(6), STATE) == [3]
+        assert judge.max_active == 2
+
+    async def test_failed_judgment_is_not_helpful(self, monkeypatch, judge_settings):
+        """Test a failing call drops only its own document."""
+        use_judge(monkeypatch, FakeJudge(helpful={"doc0", "doc1"}, failing={"doc1"}))
+        assert await nodes.judge_relevance_each(docs(2), STATE) == [0]
+
+    async def test_zero_enough_judges_nothing(self, monkeypatch, judge_settings):
+        """Test enough=0 returns without any call."""
+        judge = use_judge(monkeypatch, FakeJudge(helpful={"doc0"}))
+        assert await nodes.judge_relevance_each(docs(2), STATE, enough=0) == []
+        assert judge.max_active == 0
+
+
+class TestJudgeModes:
+    """Tests that both judge modes keep the same documents."""
+
+    @pytest.mark.parametrize("helpful", [set(), {"doc1"}, {"doc0", "doc2", "doc4"}])
+    async def test_batch_and_each_agree(self, monkeypatch, judge_settings, helpful):
+        """Test batch and per-document judging return the same kept set."""
+        use_judge(monkeypatch, FakeJudge(helpful=helpful))
+        each = await nodes.judge_relevance(docs(5), STATE, enough=5)
+
+        judge_settings.relevance_judge_mode = "batch"
+        use_judge(monkeypatch, FakeJudge(helpful=helpful))
+        batch = await nodes.judge_relevance(docs(5), STATE)
+
+        assert set(each) == set(batch) == {int(name[3:]) for name in helpful}
+
+
+class FakeCoreClient:
+    snapshot = None
+
+    async def get_post_content(self, post_id: int) -> dict:
+        return {"title": "", "content": f"doc{post_id}", "url": ""}
+
+
+class TestDocumentsHandlerBand:
+    """Tests for judging the ambiguous band in documents_handler."""
+
+    @pytest.fixture
+    def band(self, monkeypatch, judge_settings):
+        """Five documents accepted by score (relevance_judge_enough) and a band of three."""
+        monkeypatch.setattr(judge_settings, "summary_first_relevance", False)
+        monkeypatch.setattr(judge_settings, "relevance_judge_enough", 5)
+        monkeypatch.setattr(nodes, "emit_status", lambda status: None)
+        monkeypatch.setattr(
+            nodes,
+            "plan_relevance",
+            lambda stats, policy, query_count: RelevancePlan(
+                decision="band", proposed="band", accepted=[0, 1, 2, 3, 4], judge=[5, 6, 7]
+            ),
+        )
+        return {
+            "messages": STATE["messages"],
+            "documents": docs(8),
+            "retrieve_queries": ["상권 분석"],
+        }
+
+    async def kept(self, band) -> list[str]:
+        update = await nodes.documents_handler(band, FakeCoreClient())
+        return [doc.page_content for doc in update["documents"]["documents"]]
+
+    async def test_band_is_judged_after_enough_accepted(self, monkeypatch, judge_settings, band):
+        """Test per-document judging still judges the band when score kept enough."""
+        judge = use_judge(monkeypatch, FakeJudge(helpful={"doc6"}))
+        each = await self.kept(band)
+
+        judge_settings.relevance_judge_mode = "batch"
+        use_judge(monkeypatch, FakeJudge(helpful={"doc6"}))
+        batch = await self.kept(band)
+
+        assert each == batch == ["doc0", "doc1", "doc2", "doc3", "doc4", "doc6"]
+        assert judge.max_active > 0
@@ -0,0 +1,115 @@
+"""
+Tests for local query expansion over the keyword graph.
+"""
+
+import pytest
+
+from src.services import keyword_expander
+from src.services.keyword_expander import (
+    MAX_QUESTION_CHARS,
+    KeywordExpander,
+    get_keyword_expander,
+)
+
+DOC_FREQ = {"부대찌개": 3, "찌개": 40, "창업": 90, "비용": 50, "상권": 30, "인테리어": 8}
+NEIGHBORS = {
+    "부대찌개": ["프랜차이즈", "상권", "창업"],
+    "창업": ["비용", "상권", "인테리어"],
+    "비용": ["인테리어", "보증금"],
+}
+
+
+def expander() -> KeywordExpander:
+    return KeywordExpander(DOC_FREQ, NEIGHBORS, source="posts-1.sqlite3")
+
+
+class TestMatch:
+    """Tests for KeywordExpander.match."""
+
+    def test_contained_keywords_are_dropped(self):
+        """Test "찌개" is not reported inside "부대찌개"."""
+        assert expander().match("부대찌개 창업") == ["부대찌개", "창업"]
+
+    def test_ignores_case_and_spacing(self):
+        """Test keywords match across whitespace."""
+        assert expander().match("부대 찌개는 어때요") == ["부대찌개"]
+
+
+class TestExpand:
+    """Tests for KeywordExpander.expand."""
+
+    def test_question_first_then_keywords_rarest_first(self):
+        """Test the question, the matched keywords, then rarest keyword expansions."""
+        queries = expander().expand("부대찌개 창업 비용이 궁금해요", max_queries=10)
+        assert queries == [
+            "부대찌개 창업 비용이 궁금해요",
+            "부대찌개 창업 비용",
+            "부대찌개 프랜차이즈 상권",
+            "비용 인테리어 보증금",
+            "창업 상권 인테리어",
+        ]
+
+    def test_capped_at_five(self):
+        """Test at most five queries are returned by default."""
+        many = {f"키워드{i}": i + 1 for i in range(8)}
+        links = {keyword: [f"이웃{keyword}"] for keyword in many}
+        question = " ".join(many)
+        queries = KeywordExpander(many, links, source="s").expand(question)
+        assert len(queries) == 5
+        # Rarest keywords are expanded first
+        assert queries[2:] == ["키워드0 이웃키워드0", "키워드1 이웃키워드1", "키워드2 이웃키워드2"]
+
+    def test_unmatched_question(self):
+        """Test a question without vocabulary keywords yields only itself."""
+        assert expander().expand("  안녕\n하세요 ") == ["안녕 하세요"]
+
+    def test_long_question_is_truncated(self):
+        """Test the question query is capped at MAX_QUESTION_CHARS."""
+        queries = expander().expand("가" * (MAX_QUESTION_CHARS + 50))
+        assert queries == ["가" * MAX_QUESTION_CHARS]
+
+
+class FakeSnapshot:
+    """Snapshot stand-in whose published file can be swapped."""
+
+    def __init__(self, file: str | None, graph: tuple):
+        self.file = file
+        self.graph = graph
+        self.reads = 0
+
+    def refresh(self) -> bool:
+        return False
+
+    def keyword_graph(self):
+        self.reads += 1
+        return self.graph
+
+
+@pytest.fixture(autouse=True)
+def fresh_expander(monkeypatch):
+    """Start every test without a cached expander."""
+    monkeypatch.setattr(keyword_expander, "_expander", None)
+    monkeypatch.setattr(keyword_expander, "_empty_source", None)
+
+
+class TestGetKeywordExpander:
+    """Tests for the process-wide expander."""
+
+    def test_rebuilt_when_snapshot_changes(self):
+        """Test the expander is reused per snapshot file and rebuilt on a new one."""
+        snapshot = FakeSnapshot("posts-1.sqlite3", (DOC_FREQ, NEIGHBORS))
+        first = get_keyword_expander(snapshot)
+        assert get_keyword_expander(snapshot) is first
+        assert snapshot.reads == 1
+
+        snapshot.file = "posts-2.sqlite3"
+        second = get_keyword_expander(snapshot)
+        assert second is not first and second.source == "posts-2.sqlite3"
+
+    def test_snapshot_without_keywords(self):
+        """Test a snapshot without a keyword graph is read once and gives None."""
+        snapshot = FakeSnapshot("posts-1.sqlite3", ({}, {}))
+        assert get_keyword_expander(snapshot) is None
+        assert get_keyword_expander(snapshot) is None
+        assert snapshot.reads == 1
+        assert get_keyword_expander(None) is None
@@ -0,0 +1,142 @@
+"""
+Tests for memoization of structured-output LLM calls.
+"""
+
+import json
+import sys
+from typing import Literal
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from src.graph import memo, prompts
+from src.graph.memo import StructuredOutputMemo, memo_key, memoized, prompt_version
+from src.graph.state import DocJudgment, DocRelevance, Router
+
+
+class ExtendedRouter(BaseModel):
+    """Router with an added route, as after a schema change."""
+
+    type: Literal["retrieval_required", "just_respond", "clarify"]
+
+
+PARAMS = {"model": "gemini-2.5-flash", "temperature": 0}
+PROMPT = [SystemMessage(content="시스템"), HumanMessage(content="상권 분석 방법")]
+
+
+def key(**overrides) -> str:
+    args = {"node": "route_query", "params": PARAMS, "schema": Router, "prompt": PROMPT}
+    args.update(overrides)
+    return memo_key(**args)
+
+
+class TestMemoKey:
+    """Tests for memo_key."""
+
+    def test_stable(self):
+        """Test equal inputs give equal keys, for messages and role dicts alike."""
+        as_dicts = [
+            {"role": "system", "content": "시스템"},
+            {"role": "human", "content": "상권 분석 방법"},
+        ]
+        assert key() == key()
+        assert key(prompt=as_dicts) == key()
+
+    def test_changes_with_inputs(self):
+        """Test node, params, schema and prompt each change the key."""
+        variants = [
+            key(node="generate_queries"),
+            key(params={**PARAMS, "temperature": 1}),
+            key(params={**PARAMS, "model": "gemini-2.0-flash"}),
+            key(schema=ExtendedRouter),
+            key(prompt=PROMPT[:1] + [HumanMessage(content="메뉴 구성")]),
+        ]
+        assert len({key(), *variants}) == len(variants) + 1
+
+    def test_changes_with_prompt_version(self, monkeypatch):
+        """Test editing a prompt template invalidates earlier keys."""
+        before = key()
+        prompt_version.cache_clear()
+        monkeypatch.setattr(prompts, "ROUTER_SYSTEM_PROMPT", prompts.ROUTER_SYSTEM_PROMPT + "!")
+        try:
+            assert key() != before
+            assert key().split(":")[2] == prompt_version()
+        finally:
+            monkeypatch.undo()
+            prompt_version.cache_clear()
+        assert key() == before
+
+
+@pytest.fixture
+def enabled_memo(fake_redis):
+    """A memo enabled for route_query only, installed process-wide."""
+    store = StructuredOutputMemo(fake_redis, ttl=600, nodes={"route_query"})
+    memo.set_llm_memo(store)
+    yield store
+    memo.set_llm_memo(None)
+
+
+class Calls:
+    """Counts live calls and returns a fixed result."""
+
+    def __init__(self, result):
+        self.result = result
+        self.count = 0
+
+    async def __call__(self):
+        self.count += 1
+        return self.result
+
+
+class TestMemoized:
+    """Tests for memoized."""
+
+    async def test_miss_then_hit(self, enabled_memo, fake_redis):
+        """Test the first call is stored with the TTL and the second served from Redis."""
+        call = Calls(Router(type="just_respond"))
+
+        first = await memoized("route_query", PARAMS, Router, PROMPT, call)
+        second = await memoized("route_query", PARAMS, Router, PROMPT, call)
+
+        assert call.count == 1
+        assert first == second == Router(type="just_respond")
+        assert isinstance(second, Router)
+        assert fake_redis.ttls[key()] == 600
+        assert json.loads(fake_redis.data[key()]) == {"type": "just_respond"}
+
+    # pydantic only accepts typing.TypedDict (used by src.graph.state) from 3.12
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason="requires Python 3.12")
+    async def test_typed_dict_results(self, enabled_memo):
+        """Test dict results round-trip as dicts."""
+        call = Calls({"helpful_docs": [1, 3]})
+        for _ in range(2):
+            result = await memoized("route_query", PARAMS, DocRelevance, PROMPT, call)
+        assert result == {"helpful_docs": [1, 3]}
+        assert call.count == 1
+
+    async def test_disabled_node_calls_live(self, enabled_memo, fake_redis):
+        """Test nodes without the flag never touch Redis."""
+        call = Calls({"helpful": True})
+        for _ in range(2):
+            await memoized("documents_handler", PARAMS, DocJudgment, PROMPT, call)
+        assert call.count == 2
+        assert fake_redis.data == {}
+
+    async def test_none_result_is_not_stored(self, enabled_memo, fake_redis):
+        """Test a failed structured parse (None) is not memoized."""
+        call = Calls(None)
+        assert await memoized("route_query", PARAMS, Router, PROMPT, call) is None
+        assert fake_redis.data == {}
+
+    async def test_redis_errors_fall_through(self, broken_redis):
+        """Test Redis failures neither raise nor skip the live call."""
+        memo.set_llm_memo(StructuredOutputMemo(broken_redis, ttl=600, nodes={"route_query"}))
+        try:
+            call = Calls(Router(type="retrieval_required"))
+            for _ in range(2):
+                result = await memoized("route_query", PARAMS, Router, PROMPT, call)
+        finally:
+            memo.set_llm_memo(None)
+        assert result == Router(type="retrieval_required")
+        assert call.count == 2
@@ -0,0 +1,143 @@
+"""
+Tests for the post content cache.
+"""
+
+import json
+
+import httpx
+
+from src.services.core_client import CoreClient
+from src.services.post_cache import PostContentCache
+
+
+def post(content: str) -> dict:
+    return {"title": "", "content": content, "url": ""}
+
+
+class TestLocalLRU:
+    """Tests for the byte-bounded in-process LRU."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently read entry is evicted first."""
+        cache = PostContentCache(max_bytes=30)
+        cache.put(1, 0, post("a" * 10))
+        cache.put(2, 0, post("b" * 10))
+        cache.put(3, 0, post("c" * 10))
+        assert cache.get(1, 0) is not None  # 1 is now the most recent
+
+        cache.put(4, 0, post("d" * 10))
+        assert cache.get(2, 0) is None
+        assert [cache.get(i, 0) is not None for i in (1, 3, 4)] == [True, True, True]
+        assert cache.size_bytes == 30
+
+    def test_size_counts_utf8_bytes(self):
+        """Test Korean text is sized in UTF-8 bytes, not characters."""
+        cache = PostContentCache(max_bytes=100)
+        cache.put(1, 0, post("창업"))
+        assert cache.size_bytes == 6
+
+    def test_oversized_entry_is_not_stored(self):
+        """Test an entry larger than the whole budget is skipped."""
+        cache = PostContentCache(max_bytes=5)
+        cache.put(1, 0, post("a" * 6))
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_replacing_entry_updates_size(self):
+        """Test re-putting a key replaces its size instead of adding to it."""
+        cache = PostContentCache(max_bytes=100)
+        cache.put(1, 0, post("a" * 10))
+        cache.put(1, 0, post("a" * 20))
+        assert len(cache) == 1
+        assert cache.size_bytes == 20
+
+    def test_generation_bump_invalidates(self):
+        """Test entries of an earlier ingest generation are unreachable."""
+        cache = PostContentCache(max_bytes=100)
+        cache.put(1, 3, post("old"))
+        assert cache.get(1, 3)["content"] == "old"
+        assert cache.get(1, 4) is None
+
+
+class TestRedisBacking:
+    """Tests for the shared Redis layer."""
+
+    async def test_aset_writes_redis_with_ttl(self, fake_redis):
+        """Test entries are written under a generation-scoped key with the TTL."""
+        cache = PostContentCache(max_bytes=100, redis_client=fake_redis, redis_ttl=60)
+        await cache.aset(7, 2, post("본문"))
+        assert json.loads(fake_redis.data["agent:post:2:7"])["content"] == "본문"
+        assert fake_redis.ttls["agent:post:2:7"] == 60
+
+    async def test_aget_falls_back_to_redis(self, fake_redis):
+        """Test a local miss is served from Redis and then kept locally."""
+        fake_redis.data["agent:post:2:7"] = json.dumps(post("본문"))
+        cache = PostContentCache(max_bytes=100, redis_client=fake_redis)
+
+        assert (await cache.aget(7, 2))["content"] == "본문"
+        assert cache.get(7, 2)["content"] == "본문"
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    async def test_aget_miss_on_other_generation(self, fake_redis):
+        """Test Redis entries of another generation are not returned."""
+        fake_redis.data["agent:post:2:7"] = json.dumps(post("본문"))
+        cache = PostContentCache(max_bytes=100, redis_client=fake_redis)
+        assert await cache.aget(7, 3) is None
+        assert cache.misses == 1
+
+    async def test_redis_errors_degrade_to_local(self, broken_redis):
+        """Test Redis failures neither raise nor lose the local entry."""
+        cache = PostContentCache(max_bytes=100, redis_client=broken_redis)
+        await cache.aset(7, 2, post("본문"))
+        assert (await cache.aget(7, 2))["content"] == "본문"
+        assert await cache.aget(8, 2) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_unknown_generation_bypasses(self, fake_redis):
+        """Test a None generation neither reads nor writes any entry."""
+        cache = PostContentCache(max_bytes=100, redis_client=fake_redis)
+        await cache.aset(7, None, post("본문"))
+        assert len(cache) == 0
+        assert fake_redis.data == {}
+        assert await cache.aget(7, None) is None
+        assert (cache.hits, cache.misses) == (0, 0)
+
+
+class TestCoreClientPostCache:
+    """Tests for CoreClient.get_post_content with a post cache."""
+
+    def client(self, ingest_generation, fetched: list[str]) -> CoreClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            fetched.append(request.url.path)
+            if request.url.path.endswith("/generation/"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "ingest_generation": ingest_generation,
+                        "index_generation": ingest_generation,
+                        "index_namespace": "",
+                    },
+                )
+            return httpx.Response(200, json={"post_id": 7, **post("본문")})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://core")
+        return CoreClient(http, post_cache=PostContentCache(max_bytes=1000))
+
+    async def test_known_generation_is_cached(self):
+        """Test a post is fetched from Core once per generation."""
+        fetched: list[str] = []
+        core_client = self.client(3, fetched)
+        await core_client.get_post_content(7)
+        assert (await core_client.get_post_content(7))["content"] == "본문"
+        assert fetched.count("/api/v1/scraper/internal/posts/7/") == 1
+
+    async def test_unknown_generation_is_not_cached(self):
+        """Test null generations from Core (Redis down) bypass the cache."""
+        fetched: list[str] = []
+        core_client = self.client(None, fetched)
+        assert await core_client.get_ingest_generation() is None
+        assert await core_client.get_index_generation() is None
+        await core_client.get_post_content(7)
+        await core_client.get_post_content(7)
+        assert fetched.count("/api/v1/scraper/internal/posts/7/") == 2
+        assert len(core_client.post_cache) == 0
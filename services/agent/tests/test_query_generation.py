@@ -0,0 +1,96 @@
+"""
+Tests for incremental query generation (retrieval while queries stream).
+"""
+
+import json
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+
+from src.config import get_settings
+from src.graph import nodes
+from src.graph.state import QueryResponse
+from src.providers.fake import ChatLatency, FakeChatModel
+from src.providers.models import clear_model_cache
+
+
+class FakeCoreClient:
+    snapshot = None
+
+    async def get_brands(self):
+        return []
+
+    async def get_allowed_authors(self):
+        return ["창플"]
+
+
+@pytest.fixture
+def fake_provider(monkeypatch, tmp_path):
+    """Fake chat models with a short structured-output latency."""
+    profile = tmp_path / "profile.json"
+    profile.write_text(json.dumps({"default": {"structured_ms": 50}}))
+    monkeypatch.setenv("LLM_PROVIDER", "fake")
+    monkeypatch.setenv("FAKE_LATENCY_PROFILE", str(profile))
+    get_settings.cache_clear()
+    clear_model_cache()
+    yield
+    get_settings.cache_clear()
+    clear_model_cache()
+
+
+class TestFakeStructuredStream:
+    """Tests for the fake's structured-output stream."""
+
+    async def partials(self, disable_streaming: bool) -> list:
+        model = FakeChatModel(
+            model="fake",
+            latency=ChatLatency(structured_ms=10),
+            disable_streaming=disable_streaming,
+        )
+        runnable = model.with_structured_output(QueryResponse)
+        return [partial async for partial in runnable.astream("창업 상담")]
+
+    async def test_streaming_reveals_items_one_at_a_time(self):
+        """Test a streaming model yields a growing list of queries."""
+        partials = await self.partials(disable_streaming=False)
+        assert [len(p["maximum_five_queries"]) for p in partials] == [1, 2, 3, 4, 5]
+
+    async def test_disable_streaming_yields_the_final_result(self):
+        """Test disable_streaming yields one complete result, like a real provider."""
+        partials = await self.partials(disable_streaming=True)
+        assert [len(p["maximum_five_queries"]) for p in partials] == [5]
+
+
+class TestIncrementalRetrieval:
+    """Tests for generate_queries in incremental mode."""
+
+    async def test_retrieval_starts_before_the_last_query(self, fake_provider, monkeypatch):
+        """Test the first search starts while later queries are still being generated."""
+        assert get_settings().incremental_query_retrieval
+        events: list[tuple[str, int]] = []
+        stream_partials = nodes.astream_structured
+
+        async def recording_stream(model, schema, value, **kwargs):
+            async for partial in stream_partials(model, schema, value, **kwargs):
+                events.append(("partial", len(partial["maximum_five_queries"])))
+                yield partial
+
+        class Retriever:
+            async def ainvoke(self, query):
+                events.append(("retrieve", len(events)))
+                return [Document(page_content=query, id=query)]
+
+        monkeypatch.setattr(nodes, "astream_structured", recording_stream)
+        monkeypatch.setattr(nodes, "get_vector_store_retriever", lambda authors: Retriever())
+        monkeypatch.setattr(nodes, "emit_status", lambda status: None)
+
+        state = {"messages": [HumanMessage(content="치킨집 상권 분석은 어떻게 하나요?")]}
+        update = await nodes.generate_queries(state, FakeCoreClient())
+
+        kinds = [kind for kind, _ in events]
+        last_partial = len(kinds) - 1 - kinds[::-1].index("partial")
+        assert kinds.index("retrieve") < last_partial
+        assert kinds.count("retrieve") == len(update["retrieve_queries"]) == 5
+        assert update["retrieval_done"] is True
+        assert len(update["documents"]) == 5
@@ -0,0 +1,132 @@
+"""
+Tests for the score-based relevance policy.
+"""
+
+from langchain_core.documents import Document
+
+from src.graph.relevance import (
+    CandidateStats,
+    RelevancePolicy,
+    candidate_stats,
+    plan_relevance,
+)
+
+
+def doc(doc_id: str, score: float | None = None, rank: int | None = None) -> Document:
+    metadata = {}
+    if score is not None:
+        metadata["score"] = score
+    if rank is not None:
+        metadata["rank"] = rank
+    return Document(page_content=doc_id, id=doc_id, metadata=metadata)
+
+
+def stats(*scores: float | None, hits: int = 2) -> list[CandidateStats]:
+    return [
+        CandidateStats(doc=doc(str(i)), score=score, hits=hits) for i, score in enumerate(scores)
+    ]
+
+
+class TestCandidateStats:
+    """Tests for candidate_stats."""
+
+    def test_aggregates_duplicates(self):
+        """Test duplicates keep the best score and rank and count their hits."""
+        result = candidate_stats(
+            [doc("a", 0.4, 3), doc("b", 0.6, 0), doc("a", 0.7, 1), doc("a", 0.5, 2)]
+        )
+        assert [s.doc.id for s in result] == ["a", "b"]
+        assert (result[0].score, result[0].hits, result[0].best_rank) == (0.7, 3, 1)
+
+    def test_missing_scores(self):
+        """Test documents without scores or ranks keep None."""
+        result = candidate_stats([doc("a"), doc("a", 0.4)])
+        assert (result[0].score, result[0].hits, result[0].best_rank) == (0.4, 2, None)
+        assert candidate_stats([doc("b")])[0].score is None
+
+    def test_empty(self):
+        """Test no documents give no candidates."""
+        assert candidate_stats([]) == []
+
+
+class TestPlanRelevance:
+    """Tests for plan_relevance decisions."""
+
+    def test_empty_candidates(self):
+        """Test no candidates give an empty plan in every mode."""
+        for mode in ("llm", "skip", "band"):
+            plan = plan_relevance([], RelevancePolicy(mode=mode), query_count=3)
+            assert (plan.decision, plan.judge) == ("empty", [])
+
+    def test_skip_keeps_top_confident(self):
+        """Test enough confident candidates skip the LLM and keep the best top_n."""
+        policy = RelevancePolicy(mode="skip", top_n=2)
+        plan = plan_relevance(stats(0.6, 0.9, 0.7, 0.1), policy, query_count=3)
+        assert (plan.decision, plan.proposed) == ("skip", "skip")
+        assert plan.accepted == [1, 2]
+        assert plan.rejected == [0, 3]
+        assert plan.judge == []
+
+    def test_skip_with_fewer_candidates_than_top_n(self):
+        """Test all candidates being confident is enough when there are few."""
+        plan = plan_relevance(stats(0.8, 0.9), RelevancePolicy(mode="skip"), query_count=3)
+        assert plan.decision == "skip"
+        assert plan.accepted == [1, 0]
+
+    def test_skip_mode_judges_everything_without_skip(self):
+        """Test skip mode falls back to a full judgment when it cannot skip."""
+        plan = plan_relevance(stats(0.9, 0.4, 0.1), RelevancePolicy(mode="skip"), query_count=3)
+        assert (plan.decision, plan.proposed) == ("full", "band")
+        assert plan.judge == [0, 1, 2]
+
+    def test_band_judges_only_the_middle(self):
+        """Test band mode keeps confident, drops low and judges the rest."""
+        plan = plan_relevance(
+            stats(0.9, 0.4, 0.1, None), RelevancePolicy(mode="band"), query_count=3
+        )
+        assert plan.decision == "band"
+        assert (plan.accepted, plan.judge, plan.rejected) == ([0], [1, 3], [2])
+
+    def test_llm_mode_records_proposal_only(self):
+        """Test llm mode judges every candidate but reports the proposal."""
+        policy = RelevancePolicy(mode="llm", top_n=1)
+        plan = plan_relevance(stats(0.9, 0.1), policy, query_count=3)
+        assert (plan.decision, plan.proposed) == ("full", "skip")
+        assert (plan.accepted, plan.judge, plan.rejected) == ([], [0, 1], [])
+
+
+class TestBandBoundaries:
+    """Tests for the threshold and agreement boundaries."""
+
+    policy = RelevancePolicy(mode="band", high_score=0.55, low_score=0.3, top_n=10)
+
+    def test_high_threshold_is_inclusive(self):
+        """Test a score equal to the high threshold is confident."""
+        plan = plan_relevance(stats(0.55, 0.5499, 0.4), self.policy, query_count=3)
+        assert (plan.accepted, plan.judge) == ([0], [1, 2])
+
+    def test_low_threshold_is_exclusive(self):
+        """Test a score equal to the low threshold is judged, below it rejected."""
+        plan = plan_relevance(stats(0.3, 0.2999, 0.4), self.policy, query_count=3)
+        assert (plan.judge, plan.rejected) == ([0, 2], [1])
+
+    def test_agreement_required(self):
+        """Test a high score retrieved by too few queries is only judged."""
+        plan = plan_relevance(stats(0.9, 0.4, hits=1), self.policy, query_count=3)
+        assert (plan.accepted, plan.judge) == ([], [0, 1])
+
+    def test_single_query_needs_one_hit(self):
+        """Test agreement is capped by the number of queries."""
+        plan = plan_relevance(stats(0.9, 0.4, hits=1), self.policy, query_count=1)
+        assert (plan.accepted, plan.judge) == ([0], [1])
+
+
+class TestFromSettings:
+    """Tests for RelevancePolicy.from_settings."""
+
+    def test_unknown_mode_falls_back_to_llm(self, monkeypatch):
+        """Test an invalid RELEVANCE_POLICY never disables the LLM judge."""
+        from src.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "relevance_policy", "fast")
+        assert RelevancePolicy.from_settings().mode == "llm"
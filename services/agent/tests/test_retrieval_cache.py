@@ -0,0 +1,141 @@
+"""
+Tests for the Pinecone retrieval-result cache.
+"""
+
+import unicodedata
+
+import pytest
+from langchain_core.documents import Document
+
+from src.services import vectorstore
+from src.services.retrieval_cache import RetrievalCache, normalize_query, set_retrieval_cache
+from src.services.vectorstore import ScoredRetriever
+
+
+class FakeCoreClient:
+    def __init__(self, generation: int | None = 3):
+        self.generation = generation
+
+    async def get_index_generation(self) -> int | None:
+        return self.generation
+
+
+class FakeVectorStore:
+    """Counts searches and returns two scored documents."""
+
+    def __init__(self):
+        self.searches = 0
+
+    async def asimilarity_search_with_score(self, query, k, filter, namespace):
+        self.searches += 1
+        return [
+            (Document(page_content="상권", id="1", metadata={"title": "상권 분석"}), 0.9),
+            (Document(page_content="메뉴", id="2", metadata={"title": "메뉴 구성"}), 0.7),
+        ]
+
+
+AUTHORS = {"author": {"$in": ["창플", "운영자"]}}
+
+
+def cache(redis_client, generation: int | None = 3) -> RetrievalCache:
+    return RetrievalCache(redis_client, FakeCoreClient(generation), ttl=60)
+
+
+class TestNormalizeQuery:
+    """Tests for normalize_query."""
+
+    def test_case_whitespace_and_nfc(self):
+        """Test case, spacing and decomposed Hangul normalise to one query."""
+        decomposed = unicodedata.normalize("NFD", "창업 BBQ")
+        assert decomposed != "창업 BBQ"
+        assert normalize_query(f"  {decomposed}\n") == normalize_query("창업   bbq") == "창업 bbq"
+
+
+class TestKey:
+    """Tests for RetrievalCache.key."""
+
+    async def test_equivalent_searches_share_a_key(self, fake_redis):
+        """Test normalised queries and reordered authors give the same key."""
+        retrieval_cache = cache(fake_redis)
+        reordered = {"author": {"$in": ["운영자", "창플"]}}
+        assert await retrieval_cache.key("창업 비용", AUTHORS, 4) == await retrieval_cache.key(
+            " 창업  비용", reordered, 4
+        )
+
+    async def test_inputs_change_the_key(self, fake_redis):
+        """Test query, authors, k and index generation each change the key."""
+        base = await cache(fake_redis).key("창업 비용", AUTHORS, 4)
+        variants = [
+            await cache(fake_redis).key("창업 절차", AUTHORS, 4),
+            await cache(fake_redis).key("창업 비용", {"author": {"$in": ["창플"]}}, 4),
+            await cache(fake_redis).key("창업 비용", AUTHORS, 8),
+            await cache(fake_redis, generation=4).key("창업 비용", AUTHORS, 4),
+        ]
+        assert base not in variants and len(set(variants)) == 4
+
+    async def test_unknown_generation_bypasses(self, fake_redis):
+        """Test no key is produced while the index generation is unknown."""
+        assert await cache(fake_redis, generation=None).key("창업", AUTHORS, 4) is None
+
+
+class TestGetSet:
+    """Tests for storing and reading results."""
+
+    async def test_round_trip_keeps_scores(self, fake_redis):
+        """Test cached documents keep ids, content and score metadata."""
+        retrieval_cache = cache(fake_redis)
+        documents = [Document(page_content="상권", id="1", metadata={"score": 0.9, "rank": 0})]
+        await retrieval_cache.set("k", documents)
+
+        cached = await retrieval_cache.get("k")
+        assert cached == documents and cached[0] is not documents[0]
+        assert fake_redis.ttls["k"] == 60
+        assert await retrieval_cache.get("missing") is None
+
+    async def test_redis_errors_are_misses(self, broken_redis):
+        """Test Redis failures neither raise nor return results."""
+        retrieval_cache = cache(broken_redis)
+        await retrieval_cache.set("k", [Document(page_content="상권", id="1")])
+        assert await retrieval_cache.get("k") is None
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    """A ScoredRetriever over a counting fake store."""
+
+    async def get_index_namespace():
+        return None
+
+    monkeypatch.setattr(vectorstore, "get_index_namespace", get_index_namespace)
+    yield ScoredRetriever(vector_store=FakeVectorStore(), k=2, filter=AUTHORS)
+    set_retrieval_cache(None)
+
+
+class TestScoredRetriever:
+    """Tests for searches through the cache."""
+
+    async def test_repeated_search_is_cached(self, retriever, fake_redis):
+        """Test the second equivalent search does not reach the vector store."""
+        set_retrieval_cache(cache(fake_redis))
+        first = await retriever.ainvoke("창업 비용")
+        second = await retriever.ainvoke("창업  비용")
+
+        assert retriever.vector_store.searches == 1
+        assert [d.metadata["rank"] for d in second] == [0, 1]
+        assert second == first
+
+    async def test_unknown_generation_searches_without_caching(self, retriever, fake_redis):
+        """Test searches go to the store and nothing is written without a generation."""
+        set_retrieval_cache(cache(fake_redis, generation=None))
+        await retriever.ainvoke("창업 비용")
+        await retriever.ainvoke("창업 비용")
+
+        assert retriever.vector_store.searches == 2
+        assert fake_redis.data == {}
+
+    async def test_broken_redis_still_searches(self, retriever, broken_redis):
+        """Test a failing Redis degrades to live searches."""
+        set_retrieval_cache(cache(broken_redis))
+        documents = await retriever.ainvoke("창업 비용")
+        assert [d.id for d in documents] == ["1", "2"]
+        assert retriever.vector_store.searches == 1
@@ -0,0 +1,124 @@
+"""
+Tests for the read-only post snapshot and its use by CoreClient.
+"""
+
+import json
+import sqlite3
+
+import httpx
+
+from src.services.core_client import CoreClient
+from src.services.snapshot import POINTER_FILENAME, PostSnapshot
+
+
+def publish(directory, file: str, generation: int, posts: dict[int, str]) -> None:
+    """Write a snapshot file the way Core does and point CURRENT at it."""
+    conn = sqlite3.connect(directory / file)
+    conn.executescript(
+        """
+        CREATE TABLE posts (post_id INTEGER PRIMARY KEY, title TEXT, url TEXT,
+            content TEXT, summary TEXT, author TEXT, updated_at TEXT);
+        CREATE TABLE keywords (keyword TEXT PRIMARY KEY, doc_freq INTEGER);
+        CREATE TABLE keyword_neighbors (keyword TEXT, neighbor TEXT, npmi REAL,
+            count INTEGER);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO posts VALUES (?, ?, ?, ?, '', '창플', '')",
+        [(i, f"제목 {i}", f"https://cafe.naver.com/cjdckddus/{i}", c) for i, c in posts.items()],
+    )
+    conn.executemany("INSERT INTO keywords VALUES (?, ?)", [("창업", 3), ("상권", 2)])
+    conn.executemany(
+        "INSERT INTO keyword_neighbors VALUES (?, ?, ?, ?)",
+        [("창업", "상권", 0.4, 2), ("창업", "메뉴", 0.7, 2)],
+    )
+    conn.commit()
+    conn.close()
+    (directory / POINTER_FILENAME).write_text(
+        json.dumps({"file": file, "generation": generation, "post_count": len(posts)})
+    )
+
+
+class TestPostSnapshot:
+    """Tests for mapping and reading snapshots."""
+
+    def test_get_reads_mapped_snapshot(self, tmp_path):
+        """Test posts are read from the file the pointer names."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {7: "본문"})
+        snapshot = PostSnapshot(str(tmp_path), refresh_interval=0)
+
+        post = snapshot.get(7)
+        assert post["content"] == "본문"
+        assert post["url"] == "https://cafe.naver.com/cjdckddus/7"
+        assert snapshot.get(8) is None
+        assert snapshot.generation == 1
+
+    def test_generation_filter(self, tmp_path):
+        """Test a requested generation other than the snapshot's misses."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {7: "본문"})
+        snapshot = PostSnapshot(str(tmp_path), refresh_interval=0)
+        assert snapshot.get(7, generation=1) is not None
+        assert snapshot.get(7, generation=2) is None
+
+    def test_pointer_swap_maps_new_file(self, tmp_path):
+        """Test a new pointer is picked up on refresh."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {7: "이전 본문"})
+        snapshot = PostSnapshot(str(tmp_path), refresh_interval=0)
+        assert snapshot.get(7)["content"] == "이전 본문"
+
+        publish(tmp_path, "posts-2.sqlite3", 2, {7: "새 본문"})
+        assert snapshot.refresh(force=True) is True
+        assert snapshot.file == "posts-2.sqlite3"
+        assert snapshot.get(7)["content"] == "새 본문"
+
+    def test_missing_snapshot(self, tmp_path):
+        """Test a directory without a pointer maps nothing."""
+        snapshot = PostSnapshot(str(tmp_path), refresh_interval=0)
+        assert snapshot.get(7) is None
+        assert not snapshot.is_loaded
+
+    def test_keyword_graph(self, tmp_path):
+        """Test neighbours are returned strongest first."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {})
+        doc_freq, neighbors = PostSnapshot(str(tmp_path)).keyword_graph()
+        assert doc_freq == {"창업": 3, "상권": 2}
+        assert neighbors == {"창업": ["메뉴", "상권"]}
+
+
+class TestCoreClientSnapshot:
+    """Tests for post lookups through CoreClient."""
+
+    async def test_snapshot_hit_does_not_call_core(self, tmp_path):
+        """Test a post in the snapshot is served without any Core request."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {7: "본문"})
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            return httpx.Response(500)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://core"
+        ) as client:
+            core_client = CoreClient(client, snapshot=PostSnapshot(str(tmp_path)))
+            core_client.snapshot.refresh(force=True)
+            post = await core_client.get_post_content(7)
+
+        assert post["content"] == "본문"
+        assert requests == []
+
+    async def test_snapshot_miss_falls_back_to_core(self, tmp_path):
+        """Test posts missing from the snapshot are fetched from Core."""
+        publish(tmp_path, "posts-1.sqlite3", 1, {})
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/api/v1/scraper/internal/posts/9/"
+            return httpx.Response(200, json={"post_id": 9, "title": "", "content": "새 글"})
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://core"
+        ) as client:
+            core_client = CoreClient(client, snapshot=PostSnapshot(str(tmp_path)))
+            post = await core_client.get_post_content(9)
+
+        assert post["content"] == "새 글"
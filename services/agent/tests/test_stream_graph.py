@@ -0,0 +1,159 @@
+"""
+Tests for stream_graph: statuses, tokens and sources of one graph turn.
+"""
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.api.chat import stream_graph
+
+URL = "https://cafe.naver.com/cjdckddus/1"
+
+
+class ScriptedApp:
+    """Replays a fixed sequence of (stream mode, payload) items."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.stream_mode = None
+
+    async def astream(self, input_data, config, stream_mode):
+        self.stream_mode = stream_mode
+        for item in self.items:
+            yield item
+
+
+def token(node: str, content: str):
+    return "messages", (AIMessageChunk(content=content), {"langgraph_node": node})
+
+
+async def run(items: list, status: str | None = None) -> list:
+    return [event async for event in stream_graph(ScriptedApp(items), {}, {}, status)]
+
+
+class TestStatuses:
+    """Tests for status de-duplication."""
+
+    async def test_parallel_nodes_report_once(self):
+        """Test repeated statuses (one per parallel retrieval) collapse into one."""
+        events = await run(
+            [
+                ("custom", {"status": "generating_queries"}),
+                ("custom", {"status": "retrieving"}),
+                ("custom", {"status": "retrieving"}),
+                ("custom", {"status": "retrieving"}),
+                ("custom", {"status": "filtering"}),
+            ]
+        )
+        assert events == [
+            ("status", "generating_queries"),
+            ("status", "retrieving"),
+            ("status", "filtering"),
+        ]
+
+    async def test_status_already_shown_is_skipped(self):
+        """Test the status the client already shows is not repeated."""
+        events = await run(
+            [("custom", {"status": "analyzing"}), ("custom", {"status": "generating"})],
+            status="analyzing",
+        )
+        assert events == [("status", "generating")]
+
+    async def test_unknown_statuses_are_dropped(self):
+        """Test status keys without a message never reach the client."""
+        events = await run(
+            [("custom", {"status": "unknown"}), ("custom", {"status": "retrieving"})]
+        )
+        assert events == [("status", "retrieving")]
+
+    async def test_status_can_return(self):
+        """Test a status shown again after another one is reported again."""
+        events = await run(
+            [
+                ("custom", {"status": "retrieving"}),
+                ("custom", {"status": "filtering"}),
+                ("custom", {"status": "retrieving"}),
+            ]
+        )
+        assert [value for _, value in events] == ["retrieving", "filtering", "retrieving"]
+
+
+class TestChunks:
+    """Tests for token streaming across the stream modes."""
+
+    async def test_requests_all_three_modes(self):
+        """Test the graph is streamed with messages, custom and updates."""
+        app = ScriptedApp([])
+        assert [event async for event in stream_graph(app, {}, {})] == []
+        assert app.stream_mode == ["messages", "custom", "updates"]
+
+    async def test_only_response_node_tokens_are_streamed(self):
+        """Test tokens of other nodes, whole messages and empty chunks are skipped."""
+        events = await run(
+            [
+                token("generate_queries", '{"queries": ['),
+                ("messages", (AIMessage(content="전체"), {"langgraph_node": "respond_simple"})),
+                token("respond_simple", ""),
+                token("respond_simple", "안녕하세요"),
+            ]
+        )
+        assert events == [("chunk", "안녕하세요")]
+
+    async def test_citations_rewritten_across_modes(self):
+        """Test a marker split across tokens is rewritten and the tail flushed on update."""
+        events = await run(
+            [
+                ("custom", {"status": "generating"}),
+                ("custom", {"citations": {1: URL}}),
+                token("respond_with_docs", "상권 분석 ["),
+                token("respond_with_docs", "1"),
+                token("respond_with_docs", "] 참고 ["),
+                ("updates", {"respond_with_docs": {"source_documents": [{"id": 1}]}}),
+            ]
+        )
+        chunks = "".join(value for kind, value in events if kind == "chunk")
+        assert chunks == f"상권 분석 [\\[1\\]]({URL}) 참고 ["
+        assert events[0] == ("status", "generating")
+        # The held-back "[" is flushed before the sources
+        assert events[-2:] == [("chunk", "["), ("sources", [{"id": 1}])]
+
+    async def test_citations_only_apply_to_respond_with_docs(self):
+        """Test respond_simple tokens pass through unchanged."""
+        events = await run(
+            [
+                ("custom", {"citations": {1: URL}}),
+                token("respond_simple", "답변 [1]"),
+            ]
+        )
+        assert events == [("chunk", "답변 [1]")]
+
+    async def test_without_citations_tokens_pass_through(self):
+        """Test respond_with_docs tokens are not held back without a mapping."""
+        events = await run([token("respond_with_docs", "답변 [1")])
+        assert events == [("chunk", "답변 [1")]
+
+
+class TestSources:
+    """Tests for the final sources event."""
+
+    async def test_sources_from_response_node(self):
+        """Test the response node's source documents end the turn."""
+        sources = [{"id": 1, "title": "상권"}, {"id": 2, "title": "메뉴"}]
+        events = await run(
+            [
+                ("updates", {"documents_handler": {"source_documents": [{"id": 9}]}}),
+                token("respond_with_docs", "답변"),
+                ("updates", {"respond_with_docs": {"source_documents": sources}}),
+            ]
+        )
+        assert events == [("chunk", "답변"), ("sources", sources)]
+
+    async def test_no_sources_event_without_documents(self):
+        """Test a response without source documents yields no sources event."""
+        events = await run(
+            [
+                token("respond_simple", "답변"),
+                ("updates", {"respond_simple": {"messages": []}}),
+                ("updates", {"respond_simple": None}),
+            ]
+        )
+        assert events == [("chunk", "답변")]
@@ -0,0 +1,131 @@
+"""
+Tests for summary-first relevance judging in documents_handler.
+"""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+
+from src.config import Settings, get_settings
+from src.graph import nodes
+from src.graph.relevance import RelevancePlan
+
+
+def url(post_id: int) -> str:
+    return f"https://cafe.naver.com/cjdckddus/{post_id}"
+
+
+class FakeCoreClient:
+    """Serves post content and records which posts were fetched."""
+
+    snapshot = None
+
+    def __init__(self):
+        self.fetched: list[int] = []
+
+    async def get_post_content(self, post_id: int) -> dict:
+        self.fetched.append(post_id)
+        return {
+            "post_id": post_id,
+            "title": f"제목 {post_id}",
+            "content": f"post{post_id}",
+            "url": url(post_id),
+        }
+
+
+def candidate(post_id: int, summary: str | None = "요약") -> Document:
+    metadata = {
+        "score": 0.5,
+        "rank": post_id,
+        "source": url(post_id),
+        "title": f"제목 {post_id}",
+        "keywords": ["상권", "창업"],
+    }
+    if summary:
+        metadata["summary"] = f"{summary} {post_id}"
+    return Document(page_content=f"청크 {post_id}", id=str(post_id), metadata=metadata)
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """documents_handler judging every candidate with a scripted judge."""
+    judged: list[str] = []
+    helpful_sources: set[str] = set()
+
+    async def judge_relevance(docs, state, enough=None):
+        judged.extend(doc.page_content for doc in docs)
+        return [i for i, doc in enumerate(docs) if doc.metadata["source"] in helpful_sources]
+
+    def plan_relevance(stats, policy, query_count):
+        return RelevancePlan(decision="full", proposed="full", judge=list(range(len(stats))))
+
+    monkeypatch.setattr(nodes, "emit_status", lambda status: None)
+    monkeypatch.setattr(nodes, "judge_relevance", judge_relevance)
+    monkeypatch.setattr(nodes, "plan_relevance", plan_relevance)
+    return judged, helpful_sources
+
+
+def state(*documents: Document) -> dict:
+    return {
+        "messages": [HumanMessage(content="상권 분석은 어떻게 하나요?")],
+        "documents": list(documents),
+        "retrieve_queries": ["상권 분석"],
+    }
+
+
+async def run(monkeypatch, summary_first: bool, documents: list[Document]):
+    monkeypatch.setattr(get_settings(), "summary_first_relevance", summary_first)
+    core_client = FakeCoreClient()
+    update = await nodes.documents_handler(state(*documents), core_client)
+    return update, core_client
+
+
+class TestSummaryFirst:
+    """Tests for judging on metadata before fetching full content."""
+
+    def test_enabled_by_default(self):
+        """Test SUMMARY_FIRST_RELEVANCE defaults on."""
+        assert Settings.model_fields["summary_first_relevance"].default is True
+
+    async def test_only_kept_posts_are_fetched(self, handler, monkeypatch):
+        """Test summaries are judged and only the kept posts are fetched from Core."""
+        judged, helpful = handler
+        helpful.update({url(2), url(4)})
+
+        update, core_client = await run(monkeypatch, True, [candidate(i) for i in (1, 2, 3, 4)])
+
+        assert judged == [f"키워드: 상권, 창업\n요약: 요약 {i}" for i in (1, 2, 3, 4)]
+        assert sorted(core_client.fetched) == [2, 4]
+        documents = update["documents"]["documents"]
+        assert [doc.page_content for doc in documents] == ["post2", "post4"]
+        assert update["helpful_documents"] == [1, 2]
+
+    async def test_missing_summary_is_judged_on_full_content(self, handler, monkeypatch):
+        """Test candidates without a summary are judged on their post, fetched once."""
+        judged, helpful = handler
+        helpful.update({url(2), url(3)})
+
+        update, core_client = await run(
+            monkeypatch, True, [candidate(1), candidate(2, summary=None), candidate(3)]
+        )
+
+        assert judged == [
+            "키워드: 상권, 창업\n요약: 요약 1",
+            "post2",
+            "키워드: 상권, 창업\n요약: 요약 3",
+        ]
+        assert sorted(core_client.fetched) == [2, 3]
+        assert [doc.page_content for doc in update["documents"]["documents"]] == ["post2", "post3"]
+
+    @pytest.mark.parametrize("helpful_ids", [(), (1,), (1, 3, 4)])
+    async def test_same_documents_as_full_content_path(self, handler, monkeypatch, helpful_ids):
+        """Test both paths hand respond_with_docs the same documents."""
+        _, helpful = handler
+        helpful.update(url(i) for i in helpful_ids)
+        documents = [candidate(1), candidate(2, summary=None), candidate(3), candidate(4)]
+
+        summary_first, summary_client = await run(monkeypatch, True, documents)
+        full_content, full_client = await run(monkeypatch, False, documents)
+
+        assert summary_first == full_content
+        assert len(summary_client.fetched) <= len(full_client.fetched) == len(documents)
@@ -0,0 +1,52 @@
+"""
+Tests for the tracing helpers with tracing disabled.
+"""
+
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from src.tracing import TRACE_CONTEXT_KEY, open_span, run_in_context, traced_node
+
+
+class State(TypedDict):
+    value: int
+
+
+async def increment(state: State) -> dict:
+    """Add one."""
+    return {"value": state["value"] + 1}
+
+
+class TestTracedNode:
+    """Tests for wrapping graph nodes."""
+
+    async def test_node_runs_with_trace_context_in_config(self):
+        """Test a wrapped node receives the run config and still returns its update."""
+        builder = StateGraph(State)
+        builder.add_node("increment", traced_node("increment", increment))
+        builder.add_edge(START, "increment")
+        builder.add_edge("increment", END)
+
+        result = await builder.compile().ainvoke(
+            {"value": 1}, {"configurable": {TRACE_CONTEXT_KEY: object()}}
+        )
+        assert result == {"value": 2}
+
+    def test_wrapper_keeps_name_and_doc(self):
+        """Test the wrapper is identifiable as the node function."""
+        wrapped = traced_node("increment", increment)
+        assert wrapped.__name__ == "increment"
+        assert wrapped.__doc__ == "Add one."
+
+
+class TestDisabledHelpers:
+    """Tests for the no-op paths."""
+
+    def test_open_span_returns_nothing(self):
+        """Test no span or context is created when tracing is off."""
+        assert open_span("chat.turn") == (None, None)
+
+    async def test_run_in_context_without_context(self):
+        """Test the awaitable's result is returned unchanged."""
+        assert await run_in_context(None, increment({"value": 1})) == {"value": 2}
@@ -0,0 +1,102 @@
+"""
+Tests for the startup warm-up.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src import warmup
+
+
+class FakeGraph:
+    """Compiled-graph stand-in with a checkpointer."""
+
+    def __init__(self):
+        self.checkpointer = SimpleNamespace(aget=self.aget)
+
+    async def aget(self, config):
+        return None
+
+
+class FakeCoreClient:
+    async def get_allowed_authors(self):
+        return ["창플"]
+
+    async def get_brands(self):
+        return []
+
+    async def get_ingest_generation(self):
+        return 0
+
+
+class RecordingModel:
+    """Chat model or embeddings recording every provider call."""
+
+    def __init__(self, calls: list, name: str):
+        self.calls = calls
+        self.name = name
+
+    async def ainvoke(self, value, *args, **kwargs):
+        self.calls.append((self.name, value))
+
+    async def aembed_query(self, text):
+        self.calls.append(("embeddings", text))
+        return [0.0]
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """App whose graph, Postgres, Redis, Core and Pinecone are stand-ins."""
+    graph = FakeGraph()
+
+    async def get_app(pool, httpx, redis):
+        return graph
+
+    async def ping():
+        return True
+
+    monkeypatch.setattr(warmup, "get_app", get_app)
+    monkeypatch.setattr(warmup, "get_graph_core_client", FakeCoreClient)
+    monkeypatch.setattr(
+        warmup, "get_vector_store_retriever", lambda authors, k: RecordingModel([], "retriever")
+    )
+    return SimpleNamespace(
+        state=SimpleNamespace(pool=None, httpx=None, redis=SimpleNamespace(ping=ping))
+    )
+
+
+async def test_models_step_calls_every_provider_client(app, monkeypatch):
+    """Test each cached chat model and the embeddings make a real call."""
+    calls: list = []
+    monkeypatch.setattr(
+        warmup,
+        "get_chat_model",
+        lambda **kwargs: RecordingModel(calls, repr(sorted(kwargs.items()))),
+    )
+    monkeypatch.setattr(warmup, "get_embeddings", lambda: RecordingModel(calls, "embeddings"))
+    readiness = warmup.Readiness()
+
+    await warmup.warm_up(app, readiness)
+
+    assert readiness.ready and readiness.finished
+    assert readiness.resources["models"].ready
+    assert all(value == warmup.WARMUP_PING for _, value in calls)
+    assert len({name for name, _ in calls}) == len(warmup.warmup_models()) + 1
+
+
+async def test_failed_model_call_does_not_block_readiness(app, monkeypatch):
+    """Test a provider failing its warm-up call is reported but not required."""
+
+    class FailingModel(RecordingModel):
+        async def ainvoke(self, value, *args, **kwargs):
+            raise ConnectionError("provider unreachable")
+
+    monkeypatch.setattr(warmup, "get_chat_model", lambda **kwargs: FailingModel([], "chat"))
+    monkeypatch.setattr(warmup, "get_embeddings", lambda: RecordingModel([], "embeddings"))
+    readiness = warmup.Readiness()
+
+    await warmup.warm_up(app, readiness)
+
+    assert readiness.ready
+    assert "provider unreachable" in readiness.resources["models"].error
@@ -133,17 +133,8 @@ export function useChat(options: UseChatOptions = {}) {
               streamCompleted = true;
               if (!isMountedRef.current) return;
               const sources = data.source_documents as SourceDocument[];
-              // Convert [N] citation references to markdown hyperlinks
-              let finalContent = data.processed_content;
-              if (sources && sources.length > 0) {
-                finalContent = finalContent.replace(/\[(\d+)\]/g, (match, numStr) => {
-                  const num = parseInt(numStr, 10);
-                  if (num >= 1 && num <= sources.length) {
-                    return `[\\[${num}\\]](${sources[num - 1].source})`;
-                  }
-                  return match;
-                });
-              }
+              // Chunks arrive with citations already linked, so the streamed
+              // content is final; only the sources are attached here
               setMessages((prev) => {
                 const last = prev[prev.length - 1];
                 if (last?.role === 'assistant') {
@@ -151,7 +142,6 @@ export function useChat(options: UseChatOptions = {}) {
                     ...prev.slice(0, -1),
                     {
                       ...last,
-                      content: finalContent,
                       sources,
                       isStreaming: false,
                     },
@@ -11,6 +11,9 @@
 
 export interface SSEStatusEvent {
   message: string;
+  /** Set while the turn waits for admission */
+  queue_position?: number | null;
+  estimated_wait_seconds?: number | null;
 }
 
 export interface SSEChunkEvent {
@@ -6,6 +6,7 @@ import os
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src._changple.settings")
 
@@ -13,6 +14,15 @@ app = Celery("changple")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+
+@worker_process_init.connect
+def init_worker_tracing(**kwargs):
+    """Set up tracing in each prefork child (exporter threads do not survive fork)."""
+    from src.common.tracing import configure_tracing
+
+    configure_tracing("changple-celery")
+
+
 # Configure task routing for different queues
 app.conf.task_routes = {
     # Scraper tasks - resource intensive, can handle longer processing
@@ -25,6 +35,12 @@ app.conf.task_routes = {
     "src.scraper.tasks.submit_batch_jobs_task": {"queue": "scraper"},
     "src.scraper.tasks.poll_batch_status_task": {"queue": "scraper"},
     "src.scraper.tasks.ingest_completed_batches_task": {"queue": "scraper"},
+    "src.scraper.tasks.export_post_snapshot_task": {"queue": "scraper"},
+    # Blue-green index rebuilds
+    "src.scraper.tasks.start_index_build_task": {"queue": "scraper"},
+    "src.scraper.tasks.embed_index_chunk_task": {"queue": "scraper"},
+    "src.scraper.tasks.validate_index_build_task": {"queue": "scraper"},
+    "src.scraper.tasks.gc_index_builds_task": {"queue": "scraper"},
     # Default queue for other tasks
     "*": {"queue": "default"},
 }
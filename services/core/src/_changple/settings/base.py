@@ -148,6 +148,13 @@ STORAGES = {
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Read-only post snapshot shared with the Agent service
+POST_SNAPSHOT_DIR = os.environ.get("POST_SNAPSHOT_DIR", str(BASE_DIR / "snapshots"))
+
+# OpenTelemetry tracing ("otlp", "file" or empty to disable)
+TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "")
+TRACING_FILE_PATH = os.environ.get("TRACING_FILE_PATH", str(BASE_DIR / "traces.jsonl"))
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
@@ -257,3 +264,15 @@ GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY", "")
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", "")
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", "us-east-1")
 PINECONE_INDEX_NAME = os.environ.get("PINECONE_INDEX_NAME", "changple-index")
+
+# Blue-green index rebuilds (see src/scraper/index_builds.py)
+INDEX_BUILD_CHUNK_SIZE = int(os.environ.get("INDEX_BUILD_CHUNK_SIZE", "200"))
+INDEX_BUILD_MIN_RECALL = float(os.environ.get("INDEX_BUILD_MIN_RECALL", "0.8"))
+INDEX_BUILD_RECALL_SAMPLE = int(os.environ.get("INDEX_BUILD_RECALL_SAMPLE", "20"))
+INDEX_BUILD_AUTO_PUBLISH = (
+    os.environ.get("INDEX_BUILD_AUTO_PUBLISH", "false").lower() == "true"
+)
+
+# LLM provider for ingestion ("google", or "fake" for offline benchmarking)
+LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "google")
+FAKE_LATENCY_PROFILE = os.environ.get("FAKE_LATENCY_PROFILE", "")
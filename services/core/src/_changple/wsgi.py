@@ -11,6 +11,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from src.common.tracing import configure_tracing
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src._changple.settings")
 
+# Instrument before the handler loads middleware (each gunicorn worker imports this)
+configure_tracing("changple-core")
+
 application = get_wsgi_application()
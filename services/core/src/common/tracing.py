@@ -0,0 +1,117 @@
+"""
+OpenTelemetry tracing for Changple Core service.
+
+Optional: requires the `tracing` extra and settings.TRACING_EXPORTER set to
+"otlp" (endpoint from OTEL_EXPORTER_OTLP_* env vars) or "file" (JSON lines
+at settings.TRACING_FILE_PATH). Django views, psycopg queries and Celery
+tasks are instrumented; incoming W3C traceparent headers from the Agent are
+continued, and Celery task headers carry the context to the worker.
+"""
+
+import json
+import logging
+import threading
+from typing import Sequence
+
+from django.conf import settings
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+
+
+if OTEL_AVAILABLE:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """
+        Append finished spans to a file, one JSON object per line.
+
+        Duplicated in services/agent/src/tracing.py: the services are built
+        from separate Docker contexts and share no package, so keep both
+        copies in sync.
+        """
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+            lines = [
+                json.dumps(json.loads(span.to_json()), ensure_ascii=False)
+                for span in spans
+            ]
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                logger.warning(f"Failed to write spans to {self.path}: {e}")
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+def configure_tracing(service_name: str) -> bool:
+    """
+    Install the tracer provider and instrument Django, psycopg and Celery.
+
+    Must run before the WSGI handler loads middleware (web) or inside
+    worker_process_init (Celery prefork children).
+
+    Args:
+        service_name: Value of the service.name resource attribute
+
+    Returns:
+        bool: True if tracing was enabled
+    """
+    global _configured
+
+    exporter = settings.TRACING_EXPORTER
+    if _configured or not exporter:
+        return _configured
+    if not OTEL_AVAILABLE:
+        logger.warning("TRACING_EXPORTER is set but opentelemetry is not installed")
+        return False
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        span_exporter = OTLPSpanExporter()
+    elif exporter == "file":
+        span_exporter = JsonLinesSpanExporter(settings.TRACING_FILE_PATH)
+    else:
+        logger.warning(f"Unknown tracing exporter {exporter!r}, tracing disabled")
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.django import DjangoInstrumentor
+    from opentelemetry.instrumentation.psycopg import PsycopgInstrumentor
+
+    DjangoInstrumentor().instrument(excluded_urls="health")
+    PsycopgInstrumentor().instrument()
+    CeleryInstrumentor().instrument()
+
+    _configured = True
+    logger.info(f"Tracing enabled for {service_name} ({exporter} exporter)")
+    return True
@@ -21,7 +21,13 @@ class NotionContentAdmin(admin.ModelAdmin):
     list_filter = ["is_preferred", "uploaded_at"]
     search_fields = ["title", "description"]
     ordering = ["-uploaded_at"]
-    readonly_fields = ["html_path", "contents_img_path", "uploaded_at", "updated_at"]
+    readonly_fields = [
+        "html_path",
+        "contents_img_path",
+        "text_hash",
+        "uploaded_at",
+        "updated_at",
+    ]
 
 
 @admin.register(ContentViewHistory)
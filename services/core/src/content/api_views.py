@@ -4,13 +4,18 @@ API views for content app.
 
 import logging
 
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from src.common.pagination import StandardResultsSetPagination
-from src.content.models import ContentViewHistory, NotionContent
+from src.content.models import (
+    ContentViewHistory,
+    NotionContent,
+    NotionContentPassage,
+)
 from src.content.serializers import (
     ContentTextSerializer,
     ContentViewHistorySerializer,
@@ -18,7 +23,7 @@ from src.content.serializers import (
     NotionContentListSerializer,
     RecordViewSerializer,
 )
-from src.content.utils import extract_text_from_notion_content
+from src.content.utils import get_attachment_texts
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +182,36 @@ class RecordContentViewView(APIView):
         )
 
 
+def build_attachment_contents(
+    content_ids: list[int], not_found_message: str
+) -> list[dict]:
+    """
+    Build the attachment text payload, in request order.
+
+    Args:
+        content_ids: Requested NotionContent IDs
+        not_found_message: Error message for IDs that do not exist
+
+    Returns:
+        List of {"id", "title", "text", "text_hash"} or error entries
+    """
+    texts = get_attachment_texts(content_ids)
+    results = []
+    for content_id in content_ids:
+        entry = texts.get(content_id)
+        if entry is None:
+            entry = {"id": content_id, "error": not_found_message}
+        if "error" in entry:
+            entry = {
+                "id": content_id,
+                "title": None,
+                "text": None,
+                "error": entry["error"],
+            }
+        results.append(entry)
+    return results
+
+
 class ContentAttachmentTextView(APIView):
     """
     Get text content from NotionContent for chat attachment.
@@ -191,40 +226,9 @@ class ContentAttachmentTextView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         content_ids = serializer.validated_data["content_ids"]
-        results = []
-
-        for content_id in content_ids:
-            try:
-                text = extract_text_from_notion_content(content_id)
-                content = NotionContent.objects.get(pk=content_id)
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": content.title,
-                        "text": text,
-                    }
-                )
-            except NotionContent.DoesNotExist:
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": None,
-                        "text": None,
-                        "error": "콘텐츠를 찾을 수 없습니다.",
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Error extracting text from content {content_id}: {e}")
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": None,
-                        "text": None,
-                        "error": str(e),
-                    }
-                )
-
-        return Response({"contents": results})
+        return Response(
+            {"contents": build_attachment_contents(content_ids, "콘텐츠를 찾을 수 없습니다.")}
+        )
 
 
 # ============================================================================
@@ -248,37 +252,79 @@ class InternalContentAttachmentTextView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         content_ids = serializer.validated_data["content_ids"]
-        results = []
+        return Response(
+            {"contents": build_attachment_contents(content_ids, "Content not found")}
+        )
 
-        for content_id in content_ids:
-            try:
-                text = extract_text_from_notion_content(content_id)
-                content = NotionContent.objects.get(pk=content_id)
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": content.title,
-                        "text": text,
-                    }
-                )
-            except NotionContent.DoesNotExist:
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": None,
-                        "text": None,
-                        "error": "Content not found",
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Error extracting text from content {content_id}: {e}")
-                results.append(
-                    {
-                        "id": content_id,
-                        "title": None,
-                        "text": None,
-                        "error": str(e),
-                    }
+
+class InternalContentAttachmentContextView(APIView):
+    """
+    Get attachment retrieval context from NotionContent (for Agent service).
+
+    Returns each content's summary, summary embedding and passages with
+    their embeddings. Contents not summarised/embedded yet fall back to
+    their full extracted text.
+    """
+
+    permission_classes = []  # TODO: Add service auth
+
+    def post(self, request):
+        """Return summaries and passages for specified content IDs."""
+        serializer = ContentTextSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        content_ids = serializer.validated_data["content_ids"]
+        contents = {
+            content.id: content
+            for content in NotionContent.objects.filter(pk__in=content_ids)
+            .only(
+                "id",
+                "title",
+                "summary",
+                "summary_embedding",
+                "embedded_hash",
+                "text_hash",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "passages",
+                    queryset=NotionContentPassage.objects.only(
+                        "content", "index", "text", "embedding"
+                    ),
                 )
+            )
+        }
+
+        results = []
+        texts = None
+        for content_id in content_ids:
+            content = contents.get(content_id)
+            if content is None:
+                results.append({"id": content_id, "error": "Content not found"})
+                continue
+
+            processed = (
+                bool(content.text_hash) and content.embedded_hash == content.text_hash
+            )
+            entry = {
+                "id": content.id,
+                "title": content.title,
+                "summary": content.summary if processed else "",
+                "summary_embedding": content.summary_embedding if processed else None,
+                "passages": [
+                    {"index": p.index, "text": p.text, "embedding": p.embedding}
+                    for p in content.passages.all()
+                ]
+                if processed
+                else [],
+                "text": None,
+            }
+            if not processed:
+                # Not processed yet: serve the full text like the attachment endpoint
+                if texts is None:
+                    texts = get_attachment_texts(content_ids)
+                entry["text"] = texts.get(content_id, {}).get("text")
+            results.append(entry)
 
         return Response({"contents": results})
@@ -0,0 +1,121 @@
+"""
+Summaries, passages and embeddings of NotionContent for chat attachments.
+
+The Agent selects the passages of an attached column that are relevant to
+the current question and seeds post retrieval with the column's summary
+vector, instead of pushing the whole column text through every prompt.
+Embeddings use the same model and text format as the post vectors in
+Pinecone, so the summary vector can be searched against the post index.
+"""
+
+import logging
+import re
+
+from django.db import transaction
+
+from src.content.models import NotionContent, NotionContentPassage
+
+logger = logging.getLogger(__name__)
+
+# Passage size in characters (split on paragraph boundaries where possible)
+PASSAGE_MAX_CHARS = 800
+
+# Leading part of the text used for the summary
+SUMMARY_INPUT_CHARS = 20000
+
+
+def split_passages(text: str, max_chars: int = PASSAGE_MAX_CHARS) -> list[str]:
+    """
+    Split text into passages of at most `max_chars` characters.
+
+    Paragraphs are packed together up to the limit; longer paragraphs are
+    split on sentence boundaries, and hard-cut as a last resort.
+
+    Args:
+        text: Extracted plain text
+        max_chars: Maximum passage length
+
+    Returns:
+        Non-empty passages in document order
+    """
+    pieces: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r"(?<=[.!?。])\s+", paragraph):
+            for start in range(0, len(sentence), max_chars):
+                pieces.append(sentence[start : start + max_chars])
+
+    passages: list[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        passages.append(current)
+    return passages
+
+
+def process_content_attachment(content_id: int) -> dict:
+    """
+    Summarise, split and embed a NotionContent's extracted text.
+
+    Skips contents whose current text was already processed (embedded_hash
+    matches text_hash).
+
+    Args:
+        content_id: NotionContent ID
+
+    Returns:
+        Dict with the number of passages, or the reason it was skipped
+    """
+    from src.scraper.ingest.content_evaluator import summary_and_keywords
+    from src.scraper.ingest.ingest import get_embeddings_model
+
+    content = NotionContent.objects.get(pk=content_id)
+    if content.html_path and not content.text_hash:
+        content.update_extracted_text()
+    if not content.extracted_text:
+        return {"content_id": content_id, "skipped": "no text"}
+    if content.embedded_hash == content.text_hash:
+        return {"content_id": content_id, "skipped": "up to date"}
+
+    text_hash = content.text_hash
+    summary, keywords, _ = summary_and_keywords(
+        f"제목:{content.title}\n{content.extracted_text[:SUMMARY_INPUT_CHARS]}"
+    )
+    passages = split_passages(content.extracted_text)
+
+    # Same text format as the post vectors, so it can be searched against them
+    keywords_str = ",".join(keywords)
+    summary_text = f"제목:'{content.title}',키워드:'{keywords_str}',요약:'{summary}'"
+    embeddings = get_embeddings_model().embed_documents([summary_text] + passages)
+
+    with transaction.atomic():
+        # Skip the write if the text changed while we were processing
+        current = NotionContent.objects.select_for_update().get(pk=content_id)
+        if current.text_hash != text_hash:
+            logger.info(f"Content {content_id} changed during processing; skipping")
+            return {"content_id": content_id, "skipped": "text changed"}
+
+        NotionContentPassage.objects.filter(content_id=content_id).delete()
+        NotionContentPassage.objects.bulk_create(
+            NotionContentPassage(
+                content_id=content_id, index=i, text=text, embedding=vector
+            )
+            for i, (text, vector) in enumerate(zip(passages, embeddings[1:], strict=True))
+        )
+        NotionContent.objects.filter(pk=content_id).update(
+            summary=summary,
+            summary_embedding=embeddings[0],
+            embedded_hash=text_hash,
+        )
+
+    logger.info(f"Processed content {content_id}: {len(passages)} passages")
+    return {"content_id": content_id, "passages": len(passages)}
@@ -0,0 +1,38 @@
+"""
+Summarise and embed NotionContents for attachment-aware retrieval.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from src.content.models import NotionContent
+from src.content.tasks import process_content_attachment_task
+
+
+class Command(BaseCommand):
+    help = "Queue summary and passage embedding for contents not processed yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Process in this process instead of queueing Celery tasks",
+        )
+
+    def handle(self, *args, **options):
+        content_ids = list(
+            NotionContent.objects.exclude(html_path="")
+            .exclude(embedded_hash=F("text_hash"), text_hash__gt="")
+            .values_list("id", flat=True)
+        )
+
+        for content_id in content_ids:
+            if options["sync"]:
+                result = process_content_attachment_task.apply(args=[content_id]).get()
+                self.stdout.write(f"{result}")
+            else:
+                process_content_attachment_task.delay(content_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(content_ids)} contents processed or queued")
+        )
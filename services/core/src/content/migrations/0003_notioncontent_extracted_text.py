@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notioncontent',
+            name='extracted_text',
+            field=models.TextField(blank=True, editable=False, help_text='채팅 첨부용으로 HTML에서 추출한 텍스트입니다.'),
+        ),
+        migrations.AddField(
+            model_name='notioncontent',
+            name='text_hash',
+            field=models.CharField(blank=True, editable=False, help_text='추출된 텍스트의 SHA-256 해시입니다.', max_length=64),
+        ),
+    ]
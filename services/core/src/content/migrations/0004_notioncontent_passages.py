@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0003_notioncontent_extracted_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notioncontent',
+            name='summary',
+            field=models.TextField(blank=True, editable=False, help_text='채팅 첨부 검색용 요약입니다.'),
+        ),
+        migrations.AddField(
+            model_name='notioncontent',
+            name='summary_embedding',
+            field=models.JSONField(blank=True, editable=False, help_text='요약의 임베딩 벡터입니다.', null=True),
+        ),
+        migrations.AddField(
+            model_name='notioncontent',
+            name='embedded_hash',
+            field=models.CharField(blank=True, editable=False, help_text='요약/임베딩이 생성된 텍스트의 해시입니다.', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='NotionContentPassage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(help_text='본문 내 구간 순서')),
+                ('text', models.TextField(help_text='구간 텍스트')),
+                ('embedding', models.JSONField(help_text='구간 임베딩 벡터')),
+                ('content', models.ForeignKey(help_text='구간이 속한 콘텐츠', on_delete=django.db.models.deletion.CASCADE, related_name='passages', to='content.notioncontent')),
+            ],
+            options={
+                'verbose_name': '콘텐츠 구간',
+                'verbose_name_plural': '콘텐츠 구간',
+                'ordering': ['content', 'index'],
+                'constraints': [models.UniqueConstraint(fields=('content', 'index'), name='content_passage_unique_index')],
+            },
+        ),
+    ]
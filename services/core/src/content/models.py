@@ -9,10 +9,15 @@ import zipfile
 
 from bs4 import BeautifulSoup
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from urllib.parse import unquote
 
-from src.content.utils import convert_images_in_directory
+from src.content.utils import (
+    compute_text_hash,
+    convert_images_in_directory,
+    extract_text_from_html_file,
+    invalidate_attachment_text,
+)
 
 
 class NotionContent(models.Model):
@@ -64,6 +69,34 @@ class NotionContent(models.Model):
         editable=False,
         help_text="콘텐츠에 포함된 이미지들이 저장된 디렉토리의 상대 경로입니다.",
     )
+    extracted_text = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="채팅 첨부용으로 HTML에서 추출한 텍스트입니다.",
+    )
+    text_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="추출된 텍스트의 SHA-256 해시입니다.",
+    )
+    summary = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="채팅 첨부 검색용 요약입니다.",
+    )
+    summary_embedding = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="요약의 임베딩 벡터입니다.",
+    )
+    embedded_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="요약/임베딩이 생성된 텍스트의 해시입니다.",
+    )
 
     uploaded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -145,7 +178,20 @@ class NotionContent(models.Model):
                 self.zip_file.delete(save=False)
 
             self.zip_file = None
-            super().save(update_fields=["html_path", "zip_file", "contents_img_path"])
+            self.update_extracted_text(save=False)
+            super().save(
+                update_fields=[
+                    "html_path",
+                    "zip_file",
+                    "contents_img_path",
+                    "extracted_text",
+                    "text_hash",
+                ]
+            )
+
+        invalidate_attachment_text(self.id)
+        if self.text_hash and self.text_hash != self.embedded_hash:
+            self.schedule_attachment_processing()
 
         # Move thumbnail to final location
         if self.thumbnail_img_path and not self.thumbnail_img_path.name.startswith(
@@ -333,6 +379,30 @@ class NotionContent(models.Model):
 
         return filename_mapping
 
+    def update_extracted_text(self, save: bool = True) -> str:
+        """
+        Extract plain text from the processed HTML file and store it with its hash.
+
+        Args:
+            save: Persist the extracted_text and text_hash fields
+
+        Returns:
+            Extracted text (empty if there is no HTML file)
+        """
+        text = extract_text_from_html_file(self.html_path) if self.html_path else ""
+        self.extracted_text = text
+        self.text_hash = compute_text_hash(text) if text else ""
+        if save:
+            super().save(update_fields=["extracted_text", "text_hash"])
+        return text
+
+    def schedule_attachment_processing(self):
+        """Summarise and embed the extracted text in Celery after the commit."""
+        from src.content.tasks import process_content_attachment_task
+
+        content_id = self.id
+        transaction.on_commit(lambda: process_content_attachment_task.delay(content_id))
+
     def get_html_url(self) -> str | None:
         """Return the web URL for the HTML content."""
         if self.html_path:
@@ -351,9 +421,39 @@ class NotionContent(models.Model):
         if os.path.isdir(thumbnail_dir):
             shutil.rmtree(thumbnail_dir)
 
+        invalidate_attachment_text(self.id)
         super().delete(*args, **kwargs)
 
 
+class NotionContentPassage(models.Model):
+    """
+    채팅 첨부 검색을 위해 NotionContent 본문을 나눈 구간과 임베딩입니다.
+    """
+
+    content = models.ForeignKey(
+        NotionContent,
+        on_delete=models.CASCADE,
+        related_name="passages",
+        help_text="구간이 속한 콘텐츠",
+    )
+    index = models.PositiveIntegerField(help_text="본문 내 구간 순서")
+    text = models.TextField(help_text="구간 텍스트")
+    embedding = models.JSONField(help_text="구간 임베딩 벡터")
+
+    class Meta:
+        ordering = ["content", "index"]
+        verbose_name = "콘텐츠 구간"
+        verbose_name_plural = "콘텐츠 구간"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content", "index"], name="content_passage_unique_index"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_id}#{self.index}"
+
+
 class ContentViewHistory(models.Model):
     """
     사용자가 NotionContent를 조회한 이력을 기록하는 모델입니다.
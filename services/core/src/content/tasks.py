@@ -0,0 +1,27 @@
+"""
+Celery tasks for content app.
+
+Thin wrappers that delegate to src.content.attachments.
+"""
+
+import logging
+
+from celery import shared_task
+
+from src.content.attachments import process_content_attachment
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="src.content.tasks.process_content_attachment_task",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 2, "countdown": 60},
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def process_content_attachment_task(self, content_id: int):
+    """Summarise and embed a NotionContent for attachment-aware retrieval."""
+    logger.info(f"Processing attachment passages for content {content_id}")
+    return process_content_attachment(content_id)
@@ -9,6 +9,7 @@ from src.content.api_views import (
     ContentDetailView,
     ContentListView,
     ContentViewHistoryListView,
+    InternalContentAttachmentContextView,
     InternalContentAttachmentTextView,
     PreferredContentListView,
     RecommendedContentView,
@@ -29,4 +30,9 @@ urlpatterns = [
     path("attachment/", ContentAttachmentTextView.as_view(), name="content-attachment"),
     # Internal endpoint for Agent service
     path("internal/attachment/", InternalContentAttachmentTextView.as_view(), name="content-internal-attachment"),
+    path(
+        "internal/attachment/context/",
+        InternalContentAttachmentContextView.as_view(),
+        name="content-internal-attachment-context",
+    ),
 ]
@@ -2,6 +2,7 @@
 Content utility functions for Changple Core service.
 """
 
+import hashlib
 import logging
 import os
 import re
@@ -24,6 +25,10 @@ logger = logging.getLogger(__name__)
 # Image formats that need conversion
 CONVERT_EXTENSIONS = {".heic", ".heif", ".webp", ".avif"}
 
+# Attachment text cache (Django cache); entries are dropped when content changes
+ATTACHMENT_TEXT_CACHE_PREFIX = "content:attachment_text:"
+ATTACHMENT_TEXT_CACHE_TTL = 60 * 60 * 24
+
 
 def extract_meaningful_text_from_html(html_content: str) -> str:
     """
@@ -49,26 +54,19 @@ def extract_meaningful_text_from_html(html_content: str) -> str:
     return markdown_text
 
 
-def extract_text_from_notion_content(content_id: int) -> str:
+def extract_text_from_html_file(html_path: str) -> str:
     """
-    Extract text from a NotionContent's HTML file.
+    Extract text from a processed NotionContent HTML file.
 
     Args:
-        content_id: NotionContent model ID
+        html_path: HTML file path relative to MEDIA_ROOT
 
     Returns:
-        Extracted text or empty string
+        Extracted text
     """
     from django.conf import settings
 
-    from src.content.models import NotionContent
-
-    content = NotionContent.objects.get(pk=content_id)
-
-    if not content.html_path:
-        return ""
-
-    file_path = os.path.join(settings.MEDIA_ROOT, content.html_path)
+    file_path = os.path.join(settings.MEDIA_ROOT, html_path)
 
     with open(file_path, "r", encoding="utf-8") as f:
         html_content = f.read()
@@ -76,6 +74,93 @@ def extract_text_from_notion_content(content_id: int) -> str:
     return extract_meaningful_text_from_html(html_content)
 
 
+def compute_text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of extracted text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Attachment text cache
+# =============================================================================
+
+
+def _attachment_cache_key(content_id: int) -> str:
+    return f"{ATTACHMENT_TEXT_CACHE_PREFIX}{content_id}"
+
+
+def invalidate_attachment_text(content_id: int | None) -> None:
+    """Drop a content's cached attachment text (after it changed or was deleted)."""
+    if content_id is None:
+        return
+    from django.core.cache import cache
+
+    try:
+        cache.delete(_attachment_cache_key(content_id))
+    except Exception as e:
+        logger.error(f"Failed to invalidate attachment text cache ({content_id}): {e}")
+
+
+def get_attachment_texts(content_ids: list[int]) -> dict[int, dict]:
+    """
+    Get the attachment text of several NotionContents.
+
+    Entries are served from the cache; misses are loaded with a single
+    query. Contents uploaded before text extraction was stored are
+    extracted once here and saved.
+
+    Args:
+        content_ids: NotionContent IDs
+
+    Returns:
+        Dict of content ID to {"id", "title", "text", "text_hash"}, or
+        {"id", "error"} if extraction failed; missing contents are absent
+    """
+    from django.core.cache import cache
+
+    from src.content.models import NotionContent
+
+    keys = {_attachment_cache_key(content_id): content_id for content_id in content_ids}
+    try:
+        cached = cache.get_many(list(keys))
+    except Exception as e:
+        logger.error(f"Failed to read attachment text cache: {e}")
+        cached = {}
+    results = {keys[key]: entry for key, entry in cached.items()}
+
+    missing = [content_id for content_id in content_ids if content_id not in results]
+    if not missing:
+        return results
+
+    to_cache = {}
+    rows = NotionContent.objects.filter(pk__in=missing).only(
+        "id", "title", "html_path", "extracted_text", "text_hash"
+    )
+    for content in rows:
+        try:
+            if content.html_path and not content.text_hash:
+                content.update_extracted_text()
+        except Exception as e:
+            logger.error(f"Error extracting text from content {content.id}: {e}")
+            results[content.id] = {"id": content.id, "error": str(e)}
+            continue
+
+        entry = {
+            "id": content.id,
+            "title": content.title,
+            "text": content.extracted_text,
+            "text_hash": content.text_hash,
+        }
+        results[content.id] = entry
+        to_cache[_attachment_cache_key(content.id)] = entry
+
+    if to_cache:
+        try:
+            cache.set_many(to_cache, ATTACHMENT_TEXT_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Failed to write attachment text cache: {e}")
+    return results
+
+
 def should_convert_image(file_path: str) -> bool:
     """Check if file needs image conversion."""
     ext = os.path.splitext(file_path)[1].lower()
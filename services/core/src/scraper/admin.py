@@ -4,7 +4,14 @@ Admin configuration for scraper app.
 
 from django.contrib import admin
 
-from src.scraper.models import AllowedAuthor, BatchJob, GoodtoKnowBrands, NaverCafeData, PostStatus
+from src.scraper.models import (
+    AllowedAuthor,
+    BatchJob,
+    GoodtoKnowBrands,
+    IndexBuild,
+    NaverCafeData,
+    PostStatus,
+)
 
 
 @admin.register(NaverCafeData)
@@ -78,3 +85,22 @@ class BatchJobAdmin(admin.ModelAdmin):
         return len(obj.post_ids) if obj.post_ids else 0
 
     post_count.short_description = "Posts"
+
+
+@admin.register(IndexBuild)
+class IndexBuildAdmin(admin.ModelAdmin):
+    """Admin for IndexBuild (publish via the index_build command)."""
+
+    list_display = [
+        "namespace",
+        "status",
+        "chunks_done",
+        "chunks_total",
+        "vector_count",
+        "expected_count",
+        "recall",
+        "published_at",
+    ]
+    list_filter = ["status"]
+    ordering = ["-created_at"]
+    readonly_fields = ["created_at", "updated_at", "published_at"]
@@ -10,6 +10,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from src.common.pagination import StandardResultsSetPagination
+from src.scraper.generation import get_index_generation, get_ingest_generation
+from src.scraper.index_builds import get_live_namespace
 from src.scraper.models import AllowedAuthor, BatchJob, NaverCafeData, PostStatus
 from src.scraper.serializers import (
     AllowedAuthorSerializer,
@@ -274,7 +276,8 @@ class InternalBrandsView(APIView):
     """
     Get list of GoodtoKnow brands (for Agent service).
 
-    Returns brand names and descriptions for query generation prompts.
+    Returns brand names, aliases and descriptions; the Agent matches names
+    and aliases against the conversation to pick brands for its prompts.
     """
 
     permission_classes = []  # TODO: Add service auth
@@ -284,7 +287,7 @@ class InternalBrandsView(APIView):
         from src.scraper.models import GoodtoKnowBrands
 
         brands = GoodtoKnowBrands.objects.filter(is_goodto_know=True).values(
-            "name", "description"
+            "name", "description", "aliases"
         )
         return Response({"brands": list(brands)})
 
@@ -308,6 +311,7 @@ class InternalPostContentView(APIView):
                     "title": post.title,
                     "content": post.content,
                     "url": post.get_url(),
+                    "updated_at": post.updated_at.isoformat(),
                 }
             )
         except NaverCafeData.DoesNotExist:
@@ -315,3 +319,26 @@ class InternalPostContentView(APIView):
                 {"error": "게시글을 찾을 수 없습니다."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+
+class InternalIngestGenerationView(APIView):
+    """
+    Get the current ingest and index generations (for Agent service).
+
+    The Agent keys its post-content cache by the ingest generation and its
+    retrieval-result cache by the index generation, so bumping them
+    invalidates every cached entry at once. index_namespace is the Pinecone
+    namespace of the published index build.
+    """
+
+    permission_classes = []  # TODO: Add service auth
+
+    def get(self, request):
+        """Return current ingest and index generations."""
+        return Response(
+            {
+                "ingest_generation": get_ingest_generation(),
+                "index_generation": get_index_generation(),
+                "index_namespace": get_live_namespace(),
+            }
+        )
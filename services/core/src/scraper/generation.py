@@ -0,0 +1,104 @@
+"""
+Generation counters shared with the Agent service.
+
+The Agent caches post content locally and keys every entry by the current
+ingest generation. Bumping the counter whenever post content is (re)ingested
+makes all previously cached entries unreachable without any explicit purge.
+Every bump also queues a post snapshot export, so the Agent's read-only
+snapshot follows the new generation without asking Core for it.
+
+The index generation works the same way for the Agent's retrieval-result
+cache: it is bumped whenever vectors are upserted into or deleted from the
+Pinecone index.
+"""
+
+import logging
+
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Raw Redis key (not a Django cache key) so other services can read it too
+INGEST_GENERATION_KEY = "changple:ingest_generation"
+INDEX_GENERATION_KEY = "changple:index_generation"
+
+
+def get_ingest_generation() -> int | None:
+    """
+    Get the current ingest generation.
+
+    Returns:
+        Current generation number (0 if never bumped), or None if Redis is
+        unavailable so that callers bypass generation-keyed caches
+    """
+    try:
+        value = get_redis_connection("default").get(INGEST_GENERATION_KEY)
+        return int(value) if value is not None else 0
+    except Exception as e:
+        logger.error(f"Failed to read ingest generation: {e}")
+        return None
+
+
+def bump_ingest_generation(export_snapshot: bool = True) -> int | None:
+    """
+    Increment the ingest generation after post content changed.
+
+    Args:
+        export_snapshot: Queue a post snapshot export for the new generation
+
+    Returns:
+        New generation number, or None if Redis is unavailable
+    """
+    try:
+        generation = int(get_redis_connection("default").incr(INGEST_GENERATION_KEY))
+        logger.info(f"Ingest generation bumped to {generation}")
+    except Exception as e:
+        logger.error(f"Failed to bump ingest generation: {e}")
+        return None
+
+    if export_snapshot:
+        schedule_snapshot_export()
+    return generation
+
+
+def schedule_snapshot_export() -> None:
+    """Queue export_post_snapshot_task (an unchanged generation is not re-exported)."""
+    # Imported lazily: tasks imports the snapshot exporter, which imports this
+    from src.scraper.tasks import SNAPSHOT_EXPORT_COUNTDOWN, export_post_snapshot_task
+
+    try:
+        export_post_snapshot_task.apply_async(countdown=SNAPSHOT_EXPORT_COUNTDOWN)
+    except Exception as e:
+        logger.error(f"Failed to schedule post snapshot export: {e}")
+
+
+def get_index_generation() -> int | None:
+    """
+    Get the current Pinecone index generation.
+
+    Returns:
+        Current generation number (0 if never bumped), or None if Redis is
+        unavailable so that callers bypass generation-keyed caches
+    """
+    try:
+        value = get_redis_connection("default").get(INDEX_GENERATION_KEY)
+        return int(value) if value is not None else 0
+    except Exception as e:
+        logger.error(f"Failed to read index generation: {e}")
+        return None
+
+
+def bump_index_generation() -> int | None:
+    """
+    Increment the index generation after the Pinecone index was mutated.
+
+    Returns:
+        New generation number, or None if Redis is unavailable
+    """
+    try:
+        generation = int(get_redis_connection("default").incr(INDEX_GENERATION_KEY))
+        logger.info(f"Index generation bumped to {generation}")
+        return generation
+    except Exception as e:
+        logger.error(f"Failed to bump index generation: {e}")
+        return None
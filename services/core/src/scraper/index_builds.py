@@ -0,0 +1,317 @@
+"""
+Blue-green rebuilds of the Pinecone index.
+
+A full re-embed (e.g. after an embedding-text template change) is built
+into a fresh Pinecone namespace while the Agent keeps searching the
+published one:
+
+1. start_index_build: create an IndexBuild with a new namespace and split
+   the indexable posts into chunks (embedded in parallel by Celery)
+2. embed_index_chunk: embed and upsert one chunk into the build namespace
+3. validate_index_build: catch up with posts ingested meanwhile, then check
+   the vector count and the recall of sampled post titles
+4. publish_index_build: atomically make a ready build the published one;
+   the previously published build is retired and can be published again
+   (rollback_index_build) until gc_index_builds deletes its namespace
+
+Incremental ingestion (PineconeStore) always writes to the published
+namespace, see get_live_namespace. Publishing bumps the index generation,
+so the Agent picks up the new namespace and drops cached search results.
+Before the first publish the default namespace ("") is live.
+"""
+
+import logging
+import random
+import secrets
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from src.scraper.generation import bump_index_generation
+from src.scraper.models import AllowedAuthor, IndexBuild, NaverCafeData
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000
+RECALL_TOP_K = 5
+
+
+class IndexBuildError(Exception):
+    """An index build cannot be moved to the requested state."""
+
+
+def get_live_namespace() -> str:
+    """Namespace of the published build ("" before the first publish)."""
+    build = IndexBuild.objects.filter(status="published").first()
+    return build.namespace if build else ""
+
+
+def _get_index():
+    from pinecone import Pinecone
+
+    pc = Pinecone(api_key=settings.PINECONE_API_KEY, transport="http")
+    return pc.Index(settings.PINECONE_INDEX_NAME)
+
+
+def _get_embeddings_model():
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(model="text-embedding-3-large", chunk_size=200)
+
+
+def _indexable_posts():
+    """Posts that belong in the index (same filter as PineconeStore.cleanup)."""
+    allowed_authors = list(AllowedAuthor.objects.values_list("name", flat=True))
+    if not allowed_authors:
+        allowed_authors = ["창플"]
+    return NaverCafeData.objects.annotate(content_length=Length("content")).filter(
+        author__in=allowed_authors, content_length__gt=1000
+    )
+
+
+def _embedding_text(post: NaverCafeData) -> str:
+    keywords_str = ",".join(post.keywords or [])
+    questions_str = ",".join(post.possible_questions or [])
+    return (
+        f"제목:'{post.title}',키워드:'{keywords_str}',"
+        f"요약:'{post.summary}',질문:'{questions_str}'"
+    )
+
+
+def _vector(post: NaverCafeData, embedding: List[float]) -> dict:
+    """Pinecone vector of a post, with the metadata the Agent reads."""
+    return {
+        "id": str(post.post_id),
+        "values": embedding,
+        "metadata": {
+            "post_id": post.post_id,
+            "title": post.title,
+            "author": post.author,
+            "summary": post.summary or "",
+            "keywords": ",".join(post.keywords or []),
+            "questions": ",".join(post.possible_questions or []),
+            "text": _embedding_text(post),
+        },
+    }
+
+
+def _namespace_ids(index, namespace: str) -> set:
+    ids = set()
+    for page in index.list(namespace=namespace):
+        ids.update(page)
+    return ids
+
+
+def start_index_build(chunk_size: int | None = None) -> tuple[IndexBuild, list]:
+    """
+    Create a build in a new namespace and split its posts into chunks.
+
+    Args:
+        chunk_size: Posts per chunk (defaults to settings.INDEX_BUILD_CHUNK_SIZE)
+
+    Returns:
+        Tuple of (IndexBuild, list of post_id chunks to embed)
+    """
+    chunk_size = chunk_size or settings.INDEX_BUILD_CHUNK_SIZE
+    post_ids = list(
+        _indexable_posts().order_by("post_id").values_list("post_id", flat=True)
+    )
+    chunks = [
+        post_ids[i : i + chunk_size] for i in range(0, len(post_ids), chunk_size)
+    ]
+    # Random suffix: builds started within the same second must not collide
+    stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    build = IndexBuild.objects.create(
+        namespace=f"gen-{stamp}-{secrets.token_hex(3)}",
+        expected_count=len(post_ids),
+        chunks_total=len(chunks),
+    )
+    logger.info(
+        f"Started index build {build.namespace}: "
+        f"{len(post_ids)} posts in {len(chunks)} chunks"
+    )
+    return build, chunks
+
+
+def _upsert_posts(index, namespace: str, post_ids: List[int]) -> int:
+    """Embed posts and upsert them into a namespace."""
+    posts = list(NaverCafeData.objects.filter(post_id__in=post_ids))
+    if not posts:
+        return 0
+    embeddings = _get_embeddings_model().embed_documents(
+        [_embedding_text(post) for post in posts]
+    )
+    vectors = [_vector(post, emb) for post, emb in zip(posts, embeddings, strict=True)]
+    for i in range(0, len(vectors), UPSERT_BATCH_SIZE):
+        index.upsert(vectors=vectors[i : i + UPSERT_BATCH_SIZE], namespace=namespace)
+    return len(vectors)
+
+
+def embed_index_chunk(build: IndexBuild, post_ids: List[int]) -> int:
+    """
+    Embed posts and upsert them into the build namespace.
+
+    Returns:
+        Number of vectors upserted
+    """
+    upserted = _upsert_posts(_get_index(), build.namespace, post_ids)
+    IndexBuild.objects.filter(pk=build.pk).update(chunks_done=F("chunks_done") + 1)
+    logger.info(f"Index build {build.namespace}: upserted {upserted} vectors")
+    return upserted
+
+
+def _catch_up(build: IndexBuild, index) -> dict:
+    """Embed posts added and delete posts removed since the build started."""
+    indexable = set(
+        str(post_id) for post_id in _indexable_posts().values_list("post_id", flat=True)
+    )
+    existing = _namespace_ids(index, build.namespace)
+
+    missing = [int(post_id) for post_id in indexable - existing]
+    chunk_size = settings.INDEX_BUILD_CHUNK_SIZE
+    for i in range(0, len(missing), chunk_size):
+        _upsert_posts(index, build.namespace, missing[i : i + chunk_size])
+
+    orphaned = list(existing - indexable)
+    for i in range(0, len(orphaned), DELETE_BATCH_SIZE):
+        index.delete(ids=orphaned[i : i + DELETE_BATCH_SIZE], namespace=build.namespace)
+
+    return {"expected": len(indexable), "added": len(missing), "removed": len(orphaned)}
+
+
+def _sample_recall(build: IndexBuild, index, sample_size: int) -> float:
+    """Share of sampled posts returned in the top results for their title."""
+    post_ids = list(_indexable_posts().values_list("post_id", flat=True))
+    sample = random.sample(post_ids, min(sample_size, len(post_ids)))
+    posts = list(NaverCafeData.objects.filter(post_id__in=sample))
+    if not posts:
+        return 0.0
+
+    vectors = _get_embeddings_model().embed_documents([post.title for post in posts])
+    found = 0
+    for post, vector in zip(posts, vectors, strict=True):
+        response = index.query(
+            vector=vector, top_k=RECALL_TOP_K, namespace=build.namespace
+        )
+        if str(post.post_id) in {match["id"] for match in response["matches"]}:
+            found += 1
+    return found / len(posts)
+
+
+def validate_index_build(build: IndexBuild) -> IndexBuild:
+    """
+    Validate a finished build; it becomes ready or failed.
+
+    The build is valid when the namespace holds one vector per indexable
+    post and at least INDEX_BUILD_MIN_RECALL of the sampled post titles find
+    their post among the top results. Valid builds are published right away
+    when INDEX_BUILD_AUTO_PUBLISH is set.
+    """
+    build.status = "validating"
+    build.save(update_fields=["status", "updated_at"])
+    index = _get_index()
+
+    catch_up = _catch_up(build, index)
+    stats = index.describe_index_stats()
+    namespace_stats = stats.namespaces.get(build.namespace)
+    build.vector_count = namespace_stats.vector_count if namespace_stats else 0
+    build.expected_count = catch_up["expected"]
+    build.recall = _sample_recall(build, index, settings.INDEX_BUILD_RECALL_SAMPLE)
+
+    errors = []
+    # Serverless index stats are eventually consistent; allow a small lag
+    if build.vector_count < build.expected_count * 0.99:
+        errors.append(f"{build.vector_count}/{build.expected_count} vectors")
+    if build.recall < settings.INDEX_BUILD_MIN_RECALL:
+        errors.append(f"recall {build.recall:.2f} < {settings.INDEX_BUILD_MIN_RECALL}")
+
+    build.status = "failed" if errors else "ready"
+    build.error_message = "; ".join(errors)
+    build.save()
+    logger.info(
+        f"Validated index build {build.namespace}: {build.status} "
+        f"({build.vector_count} vectors, recall {build.recall:.2f}, "
+        f"catch-up {catch_up})"
+    )
+
+    if build.status == "ready" and settings.INDEX_BUILD_AUTO_PUBLISH:
+        build = publish_index_build(build)
+    return build
+
+
+def publish_index_build(build: IndexBuild) -> IndexBuild:
+    """
+    Atomically make a ready (or retired) build the published one.
+
+    Raises:
+        IndexBuildError: If the build was not validated or was deleted
+    """
+    with transaction.atomic():
+        build = IndexBuild.objects.select_for_update().get(pk=build.pk)
+        if build.status not in ("ready", "retired"):
+            raise IndexBuildError(
+                f"Cannot publish {build.namespace} in status {build.status}"
+            )
+        # Lock the published build so concurrent publishes serialise
+        list(IndexBuild.objects.select_for_update().filter(status="published"))
+        IndexBuild.objects.filter(status="published").update(
+            status="retired", updated_at=timezone.now()
+        )
+        build.status = "published"
+        build.published_at = timezone.now()
+        build.save(update_fields=["status", "published_at", "updated_at"])
+        transaction.on_commit(bump_index_generation)
+
+    logger.info(f"Published index build {build.namespace}")
+    return build
+
+
+def rollback_index_build() -> IndexBuild:
+    """
+    Re-publish the most recently retired build.
+
+    Raises:
+        IndexBuildError: If there is no retired build left
+    """
+    previous = (
+        IndexBuild.objects.filter(status="retired").order_by("-published_at").first()
+    )
+    if previous is None:
+        raise IndexBuildError("No retired index build to roll back to")
+    return publish_index_build(previous)
+
+
+def gc_index_builds(keep: int = 1) -> list[str]:
+    """
+    Delete the namespaces of failed builds and of all but the newest `keep`
+    retired builds.
+
+    Returns:
+        Deleted namespaces
+    """
+    retired = list(
+        IndexBuild.objects.filter(status="retired").order_by("-published_at")
+    )
+    doomed = retired[keep:] + list(IndexBuild.objects.filter(status="failed"))
+    if not doomed:
+        return []
+
+    index = _get_index()
+    deleted = []
+    for build in doomed:
+        try:
+            index.delete(delete_all=True, namespace=build.namespace)
+        except Exception as e:
+            # Namespaces that were never written to do not exist
+            logger.warning(f"Failed to delete namespace {build.namespace}: {e}")
+        build.status = "deleted"
+        build.save(update_fields=["status", "updated_at"])
+        deleted.append(build.namespace)
+
+    logger.info(f"Garbage-collected index builds: {deleted}")
+    return deleted
@@ -13,6 +13,8 @@ from typing import List, Optional
 from django.conf import settings
 from django.utils import timezone
 
+from src.scraper.generation import bump_index_generation, bump_ingest_generation
+
 logger = logging.getLogger(__name__)
 
 
@@ -149,10 +151,12 @@ def ingest_embeddings_to_pinecone(batch_job, embeddings: dict) -> int:
     """
     from pinecone import Pinecone
 
+    from src.scraper.index_builds import get_live_namespace
     from src.scraper.models import NaverCafeData
 
     pc = Pinecone(api_key=settings.PINECONE_API_KEY, transport="http")
     index = pc.Index(settings.PINECONE_INDEX_NAME)
+    namespace = get_live_namespace()
 
     # Prepare vectors for upsert
     vectors_to_upsert = []
@@ -193,12 +197,15 @@ def ingest_embeddings_to_pinecone(batch_job, embeddings: dict) -> int:
     for i in range(0, len(vectors_to_upsert), batch_size):
         batch = vectors_to_upsert[i : i + batch_size]
         try:
-            index.upsert(vectors=batch)
+            index.upsert(vectors=batch, namespace=namespace)
             ingested_count += len(batch)
             logger.info(f"Upserted {len(batch)} vectors to Pinecone")
         except Exception as e:
             logger.error(f"Failed to upsert batch to Pinecone: {e}")
 
+    if ingested_count:
+        bump_index_generation()
+
     # Mark posts as ingested
     if post_ids_to_mark:
         from django.db import transaction
@@ -209,6 +216,8 @@ def ingest_embeddings_to_pinecone(batch_job, embeddings: dict) -> int:
             )
             logger.info(f"Marked {len(post_ids_to_mark)} posts as ingested")
 
+        bump_ingest_generation()
+
     # Update batch job status
     batch_job.status = "completed"
     batch_job.completed_at = timezone.now()
@@ -7,18 +7,16 @@ import time
 from typing import List, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 
+from src.scraper.ingest.providers import load_chat_model
+
 logger = logging.getLogger(__name__)
 
 
 def load_llm(model_name: str = "gemini-2.5-flash", temperature: float = 0.0):
-    """Load Google Gemini LLM with specified model and temperature."""
-    return ChatGoogleGenerativeAI(
-        model=model_name,
-        temperature=temperature,
-    )
+    """Load the configured chat model (Gemini, or the fake when LLM_PROVIDER=fake)."""
+    return load_chat_model(model_name=model_name, temperature=temperature)
 
 
 # Initialize LLM models
@@ -17,6 +17,8 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone, ServerlessSpec
 
+from src.scraper.generation import bump_index_generation, bump_ingest_generation
+from src.scraper.index_builds import get_live_namespace
 from src.scraper.ingest.content_evaluator import summary_and_keywords
 from src.scraper.models import AllowedAuthor, NaverCafeData
 
@@ -214,15 +216,18 @@ def update_ingested_status(post_ids: List[int]) -> int:
                 ingested=True
             )
             logger.info(f"Marked {updated_count} documents as ingested=True")
-            return updated_count
     except Exception as e:
         logger.error(f"Error updating ingested status: {e}")
         raise
 
+    if updated_count:
+        bump_ingest_generation()
+    return updated_count
 
-def get_all_pinecone_ids(index) -> set:
-    """Get all existing IDs from a Pinecone index."""
-    response = list(index.list())
+
+def get_all_pinecone_ids(index, namespace: str = "") -> set:
+    """Get all existing IDs from a Pinecone index namespace."""
+    response = list(index.list(namespace=namespace))
     temp_list = []
     for i in response:
         temp_list += i
@@ -231,7 +236,7 @@ def get_all_pinecone_ids(index) -> set:
 
 def cleanup_pinecone_vectors() -> dict:
     """
-    Clean up Pinecone vectors before ingestion.
+    Clean up Pinecone vectors of the published index build before ingestion.
 
     - Delete vectors for posts that changed (ingested=False)
     - Delete orphaned vectors (exist in Pinecone but not in DB)
@@ -256,9 +261,10 @@ def cleanup_pinecone_vectors() -> dict:
         )
 
     index = pc.Index(settings.PINECONE_INDEX_NAME)
+    namespace = get_live_namespace()
 
     # Get all vectors currently in Pinecone
-    existing_pinecone_ids = get_all_pinecone_ids(index)
+    existing_pinecone_ids = get_all_pinecone_ids(index, namespace)
     logger.info(f"Found {len(existing_pinecone_ids)} existing vectors in Pinecone")
 
     # Get all posts from database
@@ -304,8 +310,9 @@ def cleanup_pinecone_vectors() -> dict:
         batch_size = 1000
         for i in range(0, len(ids_to_delete), batch_size):
             batch = ids_to_delete[i : i + batch_size]
-            index.delete(ids=batch)
+            index.delete(ids=batch, namespace=namespace)
             deleted_count += len(batch)
+        bump_index_generation()
 
         logger.info(f"Successfully deleted {deleted_count} vectors")
 
@@ -334,7 +341,8 @@ def ingest_docs_chunk_sync(
     post_ids: Optional[List[int]] = None,
 ):
     """
-    Synchronous function to process a chunk of documents for ingestion.
+    Synchronous function to process a chunk of documents for ingestion into
+    the published index build.
 
     Args:
         offset: Starting position for this chunk
@@ -343,11 +351,11 @@ def ingest_docs_chunk_sync(
     """
     embedding = get_embeddings_model()
 
-    pc = Pinecone(api_key=settings.PINECONE_API_KEY, transport="http")
-    index = pc.Index(settings.PINECONE_INDEX_NAME)
-
     vector_store = PineconeVectorStore(
-        index_name=settings.PINECONE_INDEX_NAME, embedding=embedding, text_key="text"
+        index_name=settings.PINECONE_INDEX_NAME,
+        embedding=embedding,
+        text_key="text",
+        namespace=get_live_namespace(),
     )
 
     # Load posts
@@ -415,6 +423,7 @@ def ingest_docs_chunk_sync(
         )
 
         vector_store.add_documents(documents=docs_to_embed, ids=batch_ids)
+        bump_index_generation()
 
         successfully_ingested_post_ids = [
             doc.metadata["post_id"] for doc in processed_docs
@@ -0,0 +1,140 @@
+"""
+Chat model provider for ingestion.
+
+settings.LLM_PROVIDER selects Google Gemini ("google") or a deterministic
+fake ("fake") for offline benchmarking of the ingestion pipeline. The fake
+reads the same latency profile format as the Agent's fake provider
+(settings.FAKE_LATENCY_PROFILE): per-call structured-output delay, jitter
+and error rate, with per-model overrides.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import random
+import time
+import typing
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger(__name__)
+
+FILLER = "창업 초기에는 상권 분석과 메뉴 구성이 가장 중요합니다. "
+
+_calls = itertools.count()
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure (stands in for 429/5xx responses)."""
+
+
+@lru_cache
+def _load_profile(path: str) -> dict:
+    """Load a latency profile JSON file (empty path → no delays)."""
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _latency_for(model_name: str) -> dict:
+    """Merged default + per-model latency parameters."""
+    profile = _load_profile(settings.FAKE_LATENCY_PROFILE)
+    latency = dict(profile.get("default", {}))
+    latency.update(profile.get("models", {}).get(model_name, {}))
+    latency["seed"] = profile.get("seed", 0)
+    return latency
+
+
+def _rng(*parts: Any) -> random.Random:
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _fill_schema(schema: Any, rng: random.Random) -> Any:
+    """Build a plausible instance of a structured-output schema."""
+    values = {}
+    for name, annotation in typing.get_type_hints(schema).items():
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Literal:
+            values[name] = args[0]
+        elif origin in (list, typing.List) and args and args[0] is int:
+            values[name] = sorted(rng.sample(range(1, 6), 3))
+        elif origin in (list, typing.List):
+            count = 10 if "ten" in name else 5 if "five" in name else 3
+            values[name] = [f"상권 분석 메뉴 {rng.randint(1, 99)}" for _ in range(count)]
+        else:
+            values[name] = FILLER * 5
+
+    if hasattr(schema, "model_validate"):
+        return schema.model_validate(values)
+    return values
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model honouring structured-output schemas."""
+
+    model: str = "fake"
+    latency: dict = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _draw_delay(self) -> float:
+        """Draw the call delay in seconds, raising injected errors."""
+        rng = _rng(self.latency.get("seed", 0), self.model, next(_calls))
+        if rng.random() < self.latency.get("error_rate", 0.0):
+            raise FakeProviderError(f"{self.model}: 429 Resource exhausted (injected)")
+        mean = self.latency.get("structured_ms", 0.0)
+        jitter = self.latency.get("structured_jitter_ms", 0.0)
+        delay = rng.gauss(mean, jitter) if jitter > 0 else mean
+        return max(0.0, delay / 1000)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._draw_delay())
+        message = AIMessage(content=FILLER * 10)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def with_structured_output(self, schema: Any, *, include_raw: bool = False, **kwargs):
+        """Return a runnable producing a schema instance after the profile delay."""
+
+        def invoke(value: Any) -> Any:
+            time.sleep(self._draw_delay())
+            parsed = _fill_schema(schema, _rng(self.model, str(value)))
+            if not include_raw:
+                return parsed
+            raw = AIMessage(content=parsed.model_dump_json())
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        return RunnableLambda(invoke, name=f"{self.model}_structured")
+
+
+def load_chat_model(model_name: str, temperature: float = 0.0) -> BaseChatModel:
+    """
+    Create a chat model for the configured provider.
+
+    Args:
+        model_name: Gemini model name (also keys per-model fake latency)
+        temperature: Randomness in generation
+
+    Returns:
+        BaseChatModel: Gemini or fake chat model
+
+    Raises:
+        ValueError: If settings.LLM_PROVIDER is unknown
+    """
+    if settings.LLM_PROVIDER == "fake":
+        return FakeChatModel(model=model_name, latency=_latency_for(model_name))
+    if settings.LLM_PROVIDER == "google":
+        return ChatGoogleGenerativeAI(model=model_name, temperature=temperature)
+    raise ValueError(f"Unknown LLM provider: {settings.LLM_PROVIDER}")
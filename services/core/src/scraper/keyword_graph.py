@@ -0,0 +1,93 @@
+"""
+Keyword co-occurrence graph over NaverCafeData.keywords.
+
+The per-post keywords extracted at ingestion form the cafe's domain
+vocabulary. Two keywords co-occur when they were extracted from the same
+post; each pair is scored with normalised PMI (NPMI, -1..1):
+
+    npmi(a, b) = log(p(a, b) / (p(a) p(b))) / -log(p(a, b))
+
+Only the strongest positive neighbours of each keyword are kept, so the
+graph stays small enough to ship inside the post snapshot, where the Agent
+uses it to expand questions into search queries without an LLM call.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Iterable
+
+
+@dataclass
+class KeywordGraph:
+    """Keyword document frequencies and top co-occurring neighbours."""
+
+    post_count: int = 0
+    doc_freq: dict[str, int] = field(default_factory=dict)
+    # (keyword, neighbour, npmi, co-occurrence count), strongest first per keyword
+    neighbors: list[tuple[str, str, float, int]] = field(default_factory=list)
+
+
+def clean_keywords(keywords) -> list[str]:
+    """Deduplicated, stripped keywords of one post (ignores malformed values)."""
+    if not isinstance(keywords, list):
+        return []
+    seen: dict[str, None] = {}
+    for keyword in keywords:
+        if isinstance(keyword, str) and keyword.strip():
+            seen.setdefault(" ".join(keyword.split()))
+    return list(seen)
+
+
+def build_keyword_graph(
+    keyword_lists: Iterable[list[str]],
+    min_doc_freq: int = 2,
+    min_pair_count: int = 2,
+    max_neighbors: int = 10,
+) -> KeywordGraph:
+    """
+    Build the co-occurrence graph from per-post keyword lists.
+
+    Args:
+        keyword_lists: Cleaned keywords of each post (see clean_keywords)
+        min_doc_freq: Keywords in fewer posts are dropped
+        min_pair_count: Pairs co-occurring in fewer posts are dropped
+        max_neighbors: Neighbours kept per keyword
+
+    Returns:
+        KeywordGraph
+    """
+    posts = [keywords for keywords in keyword_lists if keywords]
+    doc_freq = Counter(keyword for keywords in posts for keyword in keywords)
+    vocabulary = {k for k, count in doc_freq.items() if count >= min_doc_freq}
+
+    pair_counts: Counter = Counter()
+    for keywords in posts:
+        kept = sorted(k for k in keywords if k in vocabulary)
+        pair_counts.update(combinations(kept, 2))
+
+    total = len(posts)
+    ranked: dict[str, list[tuple[float, str, int]]] = {}
+    for (a, b), count in pair_counts.items():
+        if count < min_pair_count or count == total:
+            continue
+        p_ab = count / total
+        pmi = math.log(p_ab / ((doc_freq[a] / total) * (doc_freq[b] / total)))
+        npmi = pmi / -math.log(p_ab)
+        if npmi <= 0:
+            continue
+        ranked.setdefault(a, []).append((npmi, b, count))
+        ranked.setdefault(b, []).append((npmi, a, count))
+
+    neighbors = []
+    for keyword in sorted(ranked):
+        top = sorted(ranked[keyword], key=lambda item: (-item[0], -item[2]))
+        for npmi, neighbor, count in top[:max_neighbors]:
+            neighbors.append((keyword, neighbor, round(npmi, 4), count))
+
+    return KeywordGraph(
+        post_count=total,
+        doc_freq={k: doc_freq[k] for k in sorted(vocabulary)},
+        neighbors=neighbors,
+    )
@@ -0,0 +1,53 @@
+"""
+Export eligible posts into a read-only SQLite snapshot for the Agent service.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.scraper.snapshot import SnapshotExportError, export_post_snapshot
+
+
+class Command(BaseCommand):
+    help = "Export eligible NaverCafeData posts into a read-only snapshot for the Agent"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            type=str,
+            help="Snapshot directory (defaults to settings.POST_SNAPSHOT_DIR)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Export even if a snapshot for the current generation exists",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=3,
+            help="Number of snapshot files to keep (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = export_post_snapshot(
+                snapshot_dir=options["output_dir"],
+                force=options["force"],
+                keep=options["keep"],
+            )
+        except SnapshotExportError as e:
+            raise CommandError(str(e)) from e
+
+        if result["skipped"]:
+            self.stdout.write(
+                f"Snapshot for generation {result['generation']} already published: "
+                f"{result['file']}"
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Published {result['file']} with {result['post_count']} posts "
+                f"(generation {result['generation']})"
+            )
+        )
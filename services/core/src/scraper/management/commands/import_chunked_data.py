@@ -12,6 +12,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.dateparse import parse_datetime
 
+from src.scraper.generation import bump_ingest_generation
 from src.scraper.models import AllowedAuthor, GoodtoKnowBrands, NaverCafeData, PostStatus
 
 
@@ -283,6 +284,10 @@ class Command(BaseCommand):
             )
         )
 
+        # Existing posts may have been rewritten; invalidate Agent post caches
+        if totals["updated"]:
+            bump_ingest_generation()
+
     def _import_navercafe_chunk(self, chunk_data, update_existing, batch_size):
         created, updated, skipped, errors = 0, 0, 0, 0
 
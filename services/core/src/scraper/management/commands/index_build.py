@@ -0,0 +1,76 @@
+"""
+Manage blue-green rebuilds of the Pinecone index.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.scraper.index_builds import (
+    IndexBuildError,
+    gc_index_builds,
+    publish_index_build,
+    rollback_index_build,
+)
+from src.scraper.models import IndexBuild
+
+
+class Command(BaseCommand):
+    help = "Start, inspect, publish, roll back or garbage-collect Pinecone index builds"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["start", "status", "publish", "rollback", "gc"],
+            help="start: queue a rebuild; publish: switch the Agent to a build",
+        )
+        parser.add_argument(
+            "namespace",
+            nargs="?",
+            help="Build namespace (publish only)",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=1,
+            help="Retired builds kept for rollback by gc (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        action = options["action"]
+        try:
+            if action == "start":
+                from src.scraper.tasks import start_index_build_task
+
+                task = start_index_build_task.delay()
+                self.stdout.write(f"Queued index build (task {task.id})")
+            elif action == "status":
+                self._status()
+            elif action == "publish":
+                if not options["namespace"]:
+                    raise CommandError("publish needs a build namespace")
+                build = IndexBuild.objects.filter(
+                    namespace=options["namespace"]
+                ).first()
+                if build is None:
+                    raise CommandError(f"No index build {options['namespace']}")
+                build = publish_index_build(build)
+                self.stdout.write(self.style.SUCCESS(f"Published {build.namespace}"))
+            elif action == "rollback":
+                build = rollback_index_build()
+                self.stdout.write(
+                    self.style.SUCCESS(f"Rolled back to {build.namespace}")
+                )
+            else:
+                deleted = gc_index_builds(keep=options["keep"])
+                self.stdout.write(f"Deleted {len(deleted)} namespaces: {deleted}")
+        except IndexBuildError as e:
+            raise CommandError(str(e)) from e
+
+    def _status(self):
+        for build in IndexBuild.objects.exclude(status="deleted")[:10]:
+            recall = f"{build.recall:.2f}" if build.recall is not None else "-"
+            self.stdout.write(
+                f"{build.namespace:<26} {build.status:<11} "
+                f"chunks {build.chunks_done}/{build.chunks_total}  "
+                f"vectors {build.vector_count or '-'}/{build.expected_count}  "
+                f"recall {recall}  {build.error_message}"
+            )
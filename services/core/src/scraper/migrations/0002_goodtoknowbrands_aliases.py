@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goodtoknowbrands',
+            name='aliases',
+            field=models.JSONField(blank=True, default=list, help_text='브랜드를 가리키는 다른 이름 목록 (예: 약칭, 영문명)'),
+        ),
+    ]
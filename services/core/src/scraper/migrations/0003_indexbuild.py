@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0002_goodtoknowbrands_aliases'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexBuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('namespace', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(choices=[('building', 'Building'), ('validating', 'Validating'), ('ready', 'Ready'), ('failed', 'Failed'), ('published', 'Published'), ('retired', 'Retired'), ('deleted', 'Deleted')], default='building', max_length=20)),
+                ('expected_count', models.IntegerField(default=0, help_text='Number of posts the build should contain')),
+                ('chunks_total', models.IntegerField(default=0)),
+                ('chunks_done', models.IntegerField(default=0)),
+                ('vector_count', models.IntegerField(blank=True, null=True)),
+                ('recall', models.FloatField(blank=True, help_text='Share of sampled posts found by a search for their title', null=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Index Build',
+                'verbose_name_plural': 'Index Builds',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status'], name='scraper_ind_status_79e3c2_idx')],
+            },
+        ),
+    ]
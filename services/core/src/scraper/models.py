@@ -105,6 +105,11 @@ class GoodtoKnowBrands(models.Model):
 
     name = models.CharField(max_length=200, unique=True)
     description = models.TextField(null=True, blank=True)
+    aliases = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="브랜드를 가리키는 다른 이름 목록 (예: 약칭, 영문명)",
+    )
     is_goodto_know = models.BooleanField(default=True)
 
     class Meta:
@@ -175,3 +180,56 @@ class BatchJob(CommonModel):
 
     def __str__(self):
         return f"{self.get_job_type_display()} ({self.provider}) - {self.status}"
+
+
+class IndexBuild(CommonModel):
+    """
+    A generation of the Pinecone index, built into its own namespace.
+
+    Exactly one build is published at a time; the Agent searches its
+    namespace. Builds are validated before they can be published, and
+    retired builds can be published again (rollback) until they are
+    garbage-collected.
+    """
+
+    STATUS_CHOICES = [
+        ("building", "Building"),
+        ("validating", "Validating"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+        ("published", "Published"),
+        ("retired", "Retired"),
+        ("deleted", "Deleted"),
+    ]
+
+    namespace = models.CharField(max_length=64, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="building",
+    )
+    expected_count = models.IntegerField(
+        default=0,
+        help_text="Number of posts the build should contain",
+    )
+    chunks_total = models.IntegerField(default=0)
+    chunks_done = models.IntegerField(default=0)
+    vector_count = models.IntegerField(null=True, blank=True)
+    recall = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Share of sampled posts found by a search for their title",
+    )
+    error_message = models.TextField(blank=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Index Build"
+        verbose_name_plural = "Index Builds"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.namespace} - {self.status}"
@@ -16,6 +16,8 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone, ServerlessSpec
 
+from src.scraper.generation import bump_index_generation, bump_ingest_generation
+from src.scraper.index_builds import get_live_namespace
 from src.scraper.ingest.batch_embed import ingest_embeddings_to_pinecone
 from src.scraper.models import AllowedAuthor, NaverCafeData
 from src.scraper.pipeline.base import BaseVectorStore, ProcessedItem
@@ -24,7 +26,12 @@ logger = logging.getLogger(__name__)
 
 
 class PineconeStore(BaseVectorStore):
-    """Pinecone vector store for document storage and retrieval."""
+    """
+    Pinecone vector store for document storage and retrieval.
+
+    Reads and writes the published namespace (see index_builds), so
+    incremental ingestion never touches a build in progress.
+    """
 
     def _get_embeddings_model(self) -> OpenAIEmbeddings:
         """Returns an embedding model instance."""
@@ -49,9 +56,9 @@ class PineconeStore(BaseVectorStore):
 
         return pc.Index(settings.PINECONE_INDEX_NAME)
 
-    def _get_all_pinecone_ids(self, index) -> set:
-        """Get all existing IDs from a Pinecone index."""
-        response = list(index.list())
+    def _get_all_pinecone_ids(self, index, namespace: str = "") -> set:
+        """Get all existing IDs from a Pinecone index namespace."""
+        response = list(index.list(namespace=namespace))
         temp_list = []
         for i in response:
             temp_list += i
@@ -65,8 +72,9 @@ class PineconeStore(BaseVectorStore):
         - Delete orphaned vectors (exist in Pinecone but not in DB)
         """
         index = self._get_pinecone_index()
+        namespace = get_live_namespace()
 
-        existing_pinecone_ids = self._get_all_pinecone_ids(index)
+        existing_pinecone_ids = self._get_all_pinecone_ids(index, namespace)
         logger.info(f"Found {len(existing_pinecone_ids)} existing vectors in Pinecone")
 
         allowed_authors = list(AllowedAuthor.objects.values_list("name", flat=True))
@@ -101,8 +109,9 @@ class PineconeStore(BaseVectorStore):
             batch_size = 1000
             for i in range(0, len(ids_to_delete), batch_size):
                 batch = ids_to_delete[i : i + batch_size]
-                index.delete(ids=batch)
+                index.delete(ids=batch, namespace=namespace)
                 deleted_count += len(batch)
+            bump_index_generation()
 
         try:
             stats = index.describe_index_stats()
@@ -134,6 +143,7 @@ class PineconeStore(BaseVectorStore):
             index_name=settings.PINECONE_INDEX_NAME,
             embedding=embedding_model,
             text_key="text",
+            namespace=get_live_namespace(),
         )
 
         docs_to_embed = []
@@ -165,6 +175,7 @@ class PineconeStore(BaseVectorStore):
 
         if docs_to_embed:
             vector_store.add_documents(documents=docs_to_embed, ids=batch_ids)
+            bump_index_generation()
             logger.info(f"Ingested {len(docs_to_embed)} documents to Pinecone")
 
             # Mark as ingested
@@ -184,4 +195,7 @@ class PineconeStore(BaseVectorStore):
                 ingested=True
             )
             logger.info(f"Marked {updated} documents as ingested=True")
-            return updated
+
+        if updated:
+            bump_ingest_generation()
+        return updated
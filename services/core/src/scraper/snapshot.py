@@ -0,0 +1,236 @@
+"""
+Read-only post snapshot export for the Agent service.
+
+Exports eligible NaverCafeData posts into a compact SQLite file that the
+Agent maps read-only, so documents_handler never has to call Core for post
+text. Snapshots are published atomically: the database is written to a
+temporary file, renamed into place, and only then is the CURRENT pointer
+replaced.
+
+The snapshot also carries the keyword co-occurrence graph of the exported
+posts (see keyword_graph), which the Agent uses for local query expansion.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from src.scraper.generation import get_ingest_generation
+from src.scraper.keyword_graph import build_keyword_graph, clean_keywords
+from src.scraper.models import AllowedAuthor, NaverCafeData
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILENAME = "CURRENT"
+SNAPSHOT_PREFIX = "posts-"
+SNAPSHOT_SUFFIX = ".sqlite3"
+
+
+class SnapshotExportError(Exception):
+    """The snapshot cannot be exported."""
+
+
+SCHEMA = """
+CREATE TABLE posts (
+    post_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content TEXT NOT NULL,
+    summary TEXT,
+    author TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE keywords (
+    keyword TEXT PRIMARY KEY,
+    doc_freq INTEGER NOT NULL
+);
+CREATE TABLE keyword_neighbors (
+    keyword TEXT NOT NULL,
+    neighbor TEXT NOT NULL,
+    npmi REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX keyword_neighbors_keyword ON keyword_neighbors (keyword);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def read_pointer(snapshot_dir: str | Path) -> dict | None:
+    """
+    Read the CURRENT pointer of a snapshot directory.
+
+    Returns:
+        Pointer dict with 'file', 'generation', 'post_count' keys, or None
+    """
+    pointer_path = Path(snapshot_dir) / POINTER_FILENAME
+    try:
+        with open(pointer_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_pointer(snapshot_dir: Path, pointer: dict) -> None:
+    """Atomically replace the CURRENT pointer."""
+    tmp_path = snapshot_dir / f".{POINTER_FILENAME}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, snapshot_dir / POINTER_FILENAME)
+
+
+def _eligible_posts(min_content_length: int = 1000):
+    """Posts that can be retrieved by the Agent (same filter as ingestion)."""
+    active_authors = list(
+        AllowedAuthor.objects.filter(is_active=True).values_list("name", flat=True)
+    )
+    if not active_authors:
+        active_authors = ["창플"]
+
+    return (
+        NaverCafeData.objects.annotate(content_length=Length("content"))
+        .filter(author__in=active_authors, content_length__gt=min_content_length)
+        .order_by("post_id")
+    )
+
+
+def _prune_old_snapshots(snapshot_dir: Path, keep: int) -> None:
+    """Delete all but the newest `keep` snapshot files."""
+    snapshots = sorted(
+        snapshot_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in snapshots[keep:]:
+        try:
+            old.unlink()
+            logger.info(f"Removed old post snapshot {old.name}")
+        except OSError as e:
+            logger.warning(f"Failed to remove old snapshot {old.name}: {e}")
+
+
+def export_post_snapshot(
+    snapshot_dir: str | Path | None = None,
+    force: bool = False,
+    keep: int = 3,
+) -> dict:
+    """
+    Export eligible posts into a new SQLite snapshot and publish it.
+
+    Args:
+        snapshot_dir: Output directory (defaults to settings.POST_SNAPSHOT_DIR)
+        force: Export even if the published snapshot is already current
+        keep: Number of snapshot files to keep on disk
+
+    Returns:
+        dict: Summary of the export
+
+    Raises:
+        SnapshotExportError: If the ingest generation cannot be read
+    """
+    snapshot_dir = Path(snapshot_dir or settings.POST_SNAPSHOT_DIR)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    generation = get_ingest_generation()
+    if generation is None:
+        # A snapshot labelled with the wrong generation would be trusted by
+        # the Agent until the next bump
+        raise SnapshotExportError("Ingest generation unavailable (Redis unreachable)")
+    current = read_pointer(snapshot_dir)
+    if not force and current and current.get("generation") == generation:
+        logger.info(f"Post snapshot for generation {generation} already published")
+        return {"skipped": True, "generation": generation, "file": current["file"]}
+
+    created_at = timezone.now()
+    filename = (
+        f"{SNAPSHOT_PREFIX}{generation}-{created_at.strftime('%Y%m%d%H%M%S%f')}"
+        f"{SNAPSHOT_SUFFIX}"
+    )
+    tmp_path = snapshot_dir / f".{filename}.tmp"
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    post_count = 0
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(SCHEMA)
+
+        rows = []
+        keyword_lists = []
+        for post in _eligible_posts().iterator(chunk_size=1000):
+            keyword_lists.append(clean_keywords(post.keywords))
+            rows.append(
+                (
+                    post.post_id,
+                    post.title,
+                    post.get_url(),
+                    post.content,
+                    post.summary,
+                    post.author,
+                    post.updated_at.isoformat(),
+                )
+            )
+            if len(rows) >= 1000:
+                conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                post_count += len(rows)
+                rows = []
+        if rows:
+            conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            post_count += len(rows)
+
+        graph = build_keyword_graph(keyword_lists)
+        conn.executemany("INSERT INTO keywords VALUES (?, ?)", graph.doc_freq.items())
+        conn.executemany(
+            "INSERT INTO keyword_neighbors VALUES (?, ?, ?, ?)", graph.neighbors
+        )
+
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("generation", str(generation)),
+                ("created_at", created_at.isoformat()),
+                ("post_count", str(post_count)),
+                ("keyword_count", str(len(graph.doc_freq))),
+            ],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, snapshot_dir / filename)
+    _write_pointer(
+        snapshot_dir,
+        {
+            "file": filename,
+            "generation": generation,
+            "post_count": post_count,
+            "created_at": created_at.isoformat(),
+        },
+    )
+    logger.info(
+        f"Published post snapshot {filename} ({post_count} posts, "
+        f"{len(graph.doc_freq)} keywords, generation {generation})"
+    )
+
+    _prune_old_snapshots(snapshot_dir, keep)
+
+    return {
+        "skipped": False,
+        "generation": generation,
+        "file": filename,
+        "post_count": post_count,
+        "keyword_count": len(graph.doc_freq),
+    }
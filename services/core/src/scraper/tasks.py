@@ -7,11 +7,13 @@ Thin wrappers that delegate to the pipeline orchestrator.
 import logging
 from typing import Optional
 
-from celery import group, shared_task
+from celery import chord, group, shared_task
 from django.utils import timezone
 
-from src.scraper.models import AllowedAuthor, BatchJob, NaverCafeData
+from src.scraper import index_builds
+from src.scraper.models import AllowedAuthor, BatchJob, IndexBuild, NaverCafeData
 from src.scraper.pipeline import get_default_pipeline
+from src.scraper.snapshot import export_post_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,10 @@ logger = logging.getLogger(__name__)
 CHUNK_SIZE = 1000
 MAX_BATCH_SIZE = 100
 
+# Delay before exporting a post snapshot so parallel chunk tasks coalesce
+# (scheduled by bump_ingest_generation)
+SNAPSHOT_EXPORT_COUNTDOWN = 60
+
 
 @shared_task(
     bind=True,
@@ -328,6 +334,82 @@ def poll_batch_status_task(self):
     }
 
 
+@shared_task(
+    bind=True,
+    name="src.scraper.tasks.export_post_snapshot_task",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 2, "countdown": 60},
+)
+def export_post_snapshot_task(self, force: bool = False):
+    """
+    Export eligible posts into the Agent's read-only snapshot.
+
+    Skips the export when the published snapshot already matches the
+    current ingest generation, so repeated triggers are cheap.
+    """
+    result = export_post_snapshot(force=force)
+    logger.info(f"Post snapshot export result: {result}")
+    return result
+
+
+@shared_task(bind=True, name="src.scraper.tasks.start_index_build_task")
+def start_index_build_task(self, chunk_size: Optional[int] = None):
+    """
+    Start a blue-green rebuild of the Pinecone index.
+
+    Embeds every indexable post into a new namespace with one task per
+    chunk, then validates the build once all chunks are done.
+    """
+    build, chunks = index_builds.start_index_build(chunk_size)
+    chord([embed_index_chunk_task.s(build.id, post_ids) for post_ids in chunks])(
+        validate_index_build_task.si(build.id)
+    )
+    return {
+        "build_id": build.id,
+        "namespace": build.namespace,
+        "posts": build.expected_count,
+        "chunks": len(chunks),
+    }
+
+
+@shared_task(
+    bind=True,
+    name="src.scraper.tasks.embed_index_chunk_task",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 3, "countdown": 60},
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def embed_index_chunk_task(self, build_id: int, post_ids: list):
+    """Embed one chunk of posts into an index build's namespace."""
+    build = IndexBuild.objects.get(pk=build_id)
+    return index_builds.embed_index_chunk(build, post_ids)
+
+
+@shared_task(
+    bind=True,
+    name="src.scraper.tasks.validate_index_build_task",
+    autoretry_for=(Exception,),
+    retry_kwargs={"max_retries": 2, "countdown": 120},
+)
+def validate_index_build_task(self, build_id: int):
+    """Validate (and, if configured, publish) a finished index build."""
+    build = index_builds.validate_index_build(IndexBuild.objects.get(pk=build_id))
+    return {
+        "namespace": build.namespace,
+        "status": build.status,
+        "vector_count": build.vector_count,
+        "recall": build.recall,
+        "error": build.error_message,
+    }
+
+
+@shared_task(bind=True, name="src.scraper.tasks.gc_index_builds_task")
+def gc_index_builds_task(self, keep: int = 1):
+    """Delete the namespaces of failed and old retired index builds."""
+    return {"deleted": index_builds.gc_index_builds(keep=keep)}
+
+
 @shared_task(
     bind=True,
     name="src.scraper.tasks.full_rescan_task",
@@ -10,6 +10,7 @@ from src.scraper.api_views import (
     IngestRunView,
     InternalAllowedAuthorsView,
     InternalBrandsView,
+    InternalIngestGenerationView,
     InternalPostContentView,
     NaverCafeDataDetailView,
     NaverCafeDataListView,
@@ -32,4 +33,5 @@ urlpatterns = [
     path("internal/allowed-authors/", InternalAllowedAuthorsView.as_view(), name="scraper-internal-allowed-authors"),
     path("internal/brands/", InternalBrandsView.as_view(), name="scraper-internal-brands"),
     path("internal/posts/<int:post_id>/", InternalPostContentView.as_view(), name="scraper-internal-post-content"),
+    path("internal/generation/", InternalIngestGenerationView.as_view(), name="scraper-internal-generation"),
 ]
@@ -55,3 +55,28 @@ def admin_client(api_client, admin_user):
     """Create an admin authenticated API client."""
     api_client.force_authenticate(user=admin_user)
     return api_client
+
+
+class FakeRedis:
+    """In-memory stand-in for the raw Redis connection used by counters."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Route the generation counters to an in-memory Redis."""
+    redis = FakeRedis()
+    monkeypatch.setattr(
+        "src.scraper.generation.get_redis_connection", lambda alias="default": redis
+    )
+    return redis
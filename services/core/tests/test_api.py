@@ -56,6 +56,65 @@ class TestContentAPI:
         response = api_client.get("/api/v1/content/preferred/")
         assert response.status_code == status.HTTP_200_OK
 
+    def test_internal_attachment_text(self, api_client, django_assert_num_queries):
+        """Test attachment text is served from stored text in one query."""
+        from src.content.models import NotionContent
+
+        first = NotionContent.objects.create(
+            title="상권 분석", extracted_text="본문 1", text_hash="a" * 64
+        )
+        second = NotionContent.objects.create(
+            title="메뉴 구성", extracted_text="본문 2", text_hash="b" * 64
+        )
+
+        with django_assert_num_queries(1):
+            response = api_client.post(
+                "/api/v1/content/internal/attachment/",
+                {"content_ids": [second.id, first.id, 999999]},
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        contents = response.data["contents"]
+        assert [c["id"] for c in contents] == [second.id, first.id, 999999]
+        assert contents[0]["text"] == "본문 2"
+        assert contents[1]["title"] == "상권 분석"
+        assert contents[2]["text"] is None
+        assert "error" in contents[2]
+
+    def test_internal_attachment_context(self, api_client):
+        """Test attachment context serves passages, or full text if unprocessed."""
+        from src.content.models import NotionContent, NotionContentPassage
+
+        processed = NotionContent.objects.create(
+            title="상권 분석",
+            extracted_text="본문 1",
+            text_hash="a" * 64,
+            embedded_hash="a" * 64,
+            summary="요약 1",
+            summary_embedding=[0.1, 0.2],
+        )
+        NotionContentPassage.objects.create(
+            content=processed, index=0, text="구간 1", embedding=[0.3, 0.4]
+        )
+        pending = NotionContent.objects.create(
+            title="메뉴 구성", extracted_text="본문 2", text_hash="b" * 64
+        )
+
+        response = api_client.post(
+            "/api/v1/content/internal/attachment/context/",
+            {"content_ids": [processed.id, pending.id]},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        first, second = response.data["contents"]
+        assert first["summary"] == "요약 1"
+        assert first["passages"] == [
+            {"index": 0, "text": "구간 1", "embedding": [0.3, 0.4]}
+        ]
+        assert first["text"] is None
+        assert second["passages"] == []
+        assert second["text"] == "본문 2"
+
 
 @pytest.mark.django_db
 class TestScraperAPI:
@@ -77,3 +136,16 @@ class TestScraperAPI:
         response = admin_client.post("/api/v1/scraper/run/", {})
         assert response.status_code == status.HTTP_200_OK
         assert "task_id" in response.data
+
+    def test_internal_generation_index_namespace(self, api_client):
+        """Test the generation endpoint reports the published index namespace."""
+        from src.scraper.models import IndexBuild
+
+        response = api_client.get("/api/v1/scraper/internal/generation/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["index_namespace"] == ""
+
+        IndexBuild.objects.create(namespace="gen-1", status="retired")
+        IndexBuild.objects.create(namespace="gen-2", status="published")
+        response = api_client.get("/api/v1/scraper/internal/generation/")
+        assert response.data["index_namespace"] == "gen-2"
@@ -0,0 +1,79 @@
+"""
+Tests for the ingest/index generation counters shared with the Agent.
+"""
+
+import pytest
+from rest_framework import status
+
+from src.scraper import generation
+
+
+@pytest.fixture(autouse=True)
+def exports(monkeypatch):
+    """Record snapshot exports scheduled by generation bumps."""
+    scheduled = []
+    monkeypatch.setattr(
+        generation, "schedule_snapshot_export", lambda: scheduled.append(True)
+    )
+    return scheduled
+
+
+class TestGenerationCounters:
+    """Tests for reading and bumping the Redis counters."""
+
+    def test_generations_start_at_zero(self, fake_redis):
+        """Test counters that were never bumped read as 0."""
+        assert generation.get_ingest_generation() == 0
+        assert generation.get_index_generation() == 0
+
+    def test_bump_ingest_generation(self, fake_redis):
+        """Test bumping increments only the ingest counter."""
+        assert generation.bump_ingest_generation() == 1
+        assert generation.bump_ingest_generation() == 2
+        assert generation.get_ingest_generation() == 2
+        assert generation.get_index_generation() == 0
+
+    def test_ingest_bump_schedules_snapshot_export(self, fake_redis, exports):
+        """Test every ingest bump queues a snapshot export unless disabled."""
+        generation.bump_ingest_generation()
+        generation.bump_ingest_generation(export_snapshot=False)
+        generation.bump_index_generation()
+        assert len(exports) == 1
+
+    def test_bump_index_generation(self, fake_redis):
+        """Test bumping increments only the index counter."""
+        assert generation.bump_index_generation() == 1
+        assert generation.get_index_generation() == 1
+        assert generation.get_ingest_generation() == 0
+
+    def test_redis_unavailable(self, monkeypatch, exports):
+        """Test Redis failures read and bump as None so caches are bypassed."""
+
+        def unavailable(alias="default"):
+            raise ConnectionError("Redis unavailable")
+
+        monkeypatch.setattr(generation, "get_redis_connection", unavailable)
+        assert generation.get_ingest_generation() is None
+        assert generation.get_index_generation() is None
+        assert generation.bump_ingest_generation() is None
+        assert generation.bump_index_generation() is None
+        assert exports == []
+
+
+@pytest.mark.django_db
+class TestInternalGenerationView:
+    """Tests for the generation endpoint polled by the Agent."""
+
+    def test_reports_current_generations(self, api_client, fake_redis):
+        """Test the endpoint reflects bumps of both counters."""
+        response = api_client.get("/api/v1/scraper/internal/generation/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["ingest_generation"] == 0
+        assert response.data["index_generation"] == 0
+
+        generation.bump_ingest_generation()
+        generation.bump_ingest_generation()
+        generation.bump_index_generation()
+        response = api_client.get("/api/v1/scraper/internal/generation/")
+        assert response.data["ingest_generation"] == 2
+        assert response.data["index_generation"] == 1
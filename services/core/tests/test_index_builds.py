@@ -0,0 +1,164 @@
+"""
+Tests for blue-green Pinecone index builds.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper import generation, index_builds
+from src.scraper.index_builds import (
+    IndexBuildError,
+    gc_index_builds,
+    publish_index_build,
+    rollback_index_build,
+    start_index_build,
+)
+from src.scraper.models import IndexBuild
+
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def make_build(namespace, status, minutes=None):
+    """Create a build, published `minutes` after EPOCH if given."""
+    published_at = EPOCH + timedelta(minutes=minutes) if minutes is not None else None
+    return IndexBuild.objects.create(
+        namespace=namespace, status=status, published_at=published_at
+    )
+
+
+def statuses():
+    return dict(IndexBuild.objects.values_list("namespace", "status"))
+
+
+class FakeIndex:
+    """Records namespace deletions; `missing` namespaces raise like Pinecone."""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.deleted = []
+
+    def delete(self, delete_all, namespace):
+        if namespace in self.missing:
+            raise RuntimeError("Namespace not found")
+        self.deleted.append(namespace)
+
+
+@pytest.mark.django_db
+class TestStartIndexBuild:
+    """Tests for start_index_build."""
+
+    def test_namespaces_do_not_collide_within_a_second(self, monkeypatch):
+        """Test builds started at the same instant get distinct namespaces."""
+        monkeypatch.setattr(
+            index_builds, "timezone", SimpleNamespace(now=lambda: EPOCH)
+        )
+        first, _ = start_index_build(chunk_size=10)
+        second, _ = start_index_build(chunk_size=10)
+        assert first.namespace != second.namespace
+        assert first.namespace.startswith("gen-20260101000000-")
+
+
+@pytest.mark.django_db
+class TestPublishIndexBuild:
+    """Tests for publishing and rolling back builds."""
+
+    def test_publish_ready_build(self, fake_redis, django_capture_on_commit_callbacks):
+        """Test publishing retires the live build and bumps the generation on commit."""
+        make_build("gen-a", "published", minutes=0)
+        ready = make_build("gen-b", "ready")
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            published = publish_index_build(ready)
+            # The Agent must not see the new generation before the commit
+            assert generation.get_index_generation() == 0
+
+        assert published.status == "published" and published.published_at
+        assert statuses() == {"gen-a": "retired", "gen-b": "published"}
+        assert index_builds.get_live_namespace() == "gen-b"
+
+        assert len(callbacks) == 1
+        callbacks[0]()
+        assert generation.get_index_generation() == 1
+
+    @pytest.mark.parametrize("status", ["building", "validating", "failed", "deleted"])
+    def test_publish_unvalidated_build_fails(
+        self, status, fake_redis, django_capture_on_commit_callbacks
+    ):
+        """Test only ready or retired builds can be published."""
+        make_build("gen-a", "published", minutes=0)
+        build = make_build("gen-b", status)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with pytest.raises(IndexBuildError):
+                publish_index_build(build)
+
+        assert callbacks == []
+        assert statuses() == {"gen-a": "published", "gen-b": status}
+        assert generation.get_index_generation() == 0
+
+    def test_rollback_republishes_most_recent_retired(
+        self, fake_redis, django_capture_on_commit_callbacks
+    ):
+        """Test rollback picks the build retired last, not the oldest one."""
+        make_build("gen-a", "retired", minutes=0)
+        make_build("gen-b", "retired", minutes=10)
+        make_build("gen-c", "published", minutes=20)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert rollback_index_build().namespace == "gen-b"
+        assert statuses() == {
+            "gen-a": "retired",
+            "gen-b": "published",
+            "gen-c": "retired",
+        }
+        assert generation.get_index_generation() == 1
+
+    def test_rollback_without_retired_build(self):
+        """Test rollback fails when nothing is left to roll back to."""
+        make_build("gen-a", "published", minutes=0)
+        with pytest.raises(IndexBuildError):
+            rollback_index_build()
+
+    def test_default_namespace_before_first_publish(self):
+        """Test the default namespace is live until a build is published."""
+        make_build("gen-a", "ready")
+        assert index_builds.get_live_namespace() == ""
+
+
+@pytest.mark.django_db
+class TestGcIndexBuilds:
+    """Tests for gc_index_builds."""
+
+    def test_keeps_newest_retired_builds(self, monkeypatch):
+        """Test the `keep` newest retired builds survive, older and failed ones go."""
+        index = FakeIndex(missing={"gen-failed"})
+        monkeypatch.setattr(index_builds, "_get_index", lambda: index)
+        for minutes, namespace in enumerate(["gen-a", "gen-b", "gen-c"]):
+            make_build(namespace, "retired", minutes=minutes)
+        make_build("gen-live", "published", minutes=10)
+        make_build("gen-failed", "failed")
+        make_build("gen-ready", "ready")
+
+        deleted = gc_index_builds(keep=2)
+
+        assert sorted(deleted) == ["gen-a", "gen-failed"]
+        # A namespace that was never written is still marked deleted
+        assert index.deleted == ["gen-a"]
+        assert statuses() == {
+            "gen-a": "deleted",
+            "gen-b": "retired",
+            "gen-c": "retired",
+            "gen-live": "published",
+            "gen-failed": "deleted",
+            "gen-ready": "ready",
+        }
+
+    def test_nothing_to_collect(self, monkeypatch):
+        """Test Pinecone is not contacted when no build is doomed."""
+        monkeypatch.setattr(
+            index_builds, "_get_index", lambda: pytest.fail("Pinecone contacted")
+        )
+        make_build("gen-a", "retired", minutes=0)
+        assert gc_index_builds(keep=1) == []
@@ -0,0 +1,67 @@
+"""
+Tests for the legacy ingest helpers in src.scraper.ingest.ingest.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper.ingest import ingest
+from src.scraper.models import IndexBuild
+
+
+def publish(namespace):
+    IndexBuild.objects.create(namespace=namespace, status="published")
+
+
+class FakeLegacyIndex:
+    """Pinecone index listing and deleting vector ids per namespace."""
+
+    def __init__(self, ids_by_namespace):
+        self.ids_by_namespace = ids_by_namespace
+        self.deleted = []
+
+    def list(self, namespace=""):
+        return iter([self.ids_by_namespace.get(namespace, [])])
+
+    def delete(self, ids, namespace=""):
+        self.deleted.append((namespace, sorted(ids)))
+
+    def describe_index_stats(self):
+        return SimpleNamespace(total_vector_count=0)
+
+
+@pytest.mark.django_db
+class TestLegacyIngestNamespace:
+    """Tests that the legacy ingest helpers write to the published build."""
+
+    def test_cleanup_uses_live_namespace(self, monkeypatch, fake_redis):
+        """Test orphaned vectors are listed and deleted in the live namespace."""
+        index = FakeLegacyIndex({"": ["1", "2"], "gen-live": ["3"]})
+        pc = SimpleNamespace(
+            list_indexes=lambda: SimpleNamespace(
+                names=lambda: [ingest.settings.PINECONE_INDEX_NAME]
+            ),
+            Index=lambda name: index,
+        )
+        monkeypatch.setattr(ingest, "Pinecone", lambda **kwargs: pc)
+        publish("gen-live")
+
+        result = ingest.cleanup_pinecone_vectors()
+
+        assert index.deleted == [("gen-live", ["3"])]
+        assert result["orphaned_deletions"] == 1
+
+    def test_chunk_ingest_uses_live_namespace(self, monkeypatch):
+        """Test the vector store of a chunk ingest targets the live namespace."""
+        stores = []
+        monkeypatch.setattr(ingest, "get_embeddings_model", lambda: None)
+        monkeypatch.setattr(
+            ingest, "PineconeVectorStore", lambda **kwargs: stores.append(kwargs)
+        )
+        monkeypatch.setattr(ingest, "load_posts_from_database", lambda **kwargs: [])
+        publish("gen-live")
+
+        ingest.ingest_docs_chunk_sync(offset=0, limit=10)
+
+        assert stores[0]["namespace"] == "gen-live"
@@ -0,0 +1,84 @@
+"""
+Tests for the keyword co-occurrence graph.
+"""
+
+import math
+
+from src.scraper.keyword_graph import build_keyword_graph, clean_keywords
+
+
+def npmi(count, freq_a, freq_b, total):
+    p_ab = count / total
+    return round(
+        math.log(p_ab / ((freq_a / total) * (freq_b / total))) / -math.log(p_ab), 4
+    )
+
+
+def neighbours_of(graph, keyword):
+    return [(n, score, count) for k, n, score, count in graph.neighbors if k == keyword]
+
+
+class TestCleanKeywords:
+    """Tests for clean_keywords."""
+
+    def test_strips_and_deduplicates(self):
+        """Test whitespace is collapsed and duplicates dropped, keeping order."""
+        assert clean_keywords([" 창업 ", "상권  분석", "창업", "", 3]) == [
+            "창업",
+            "상권 분석",
+        ]
+
+    def test_malformed_value(self):
+        """Test a non-list keywords field gives no keywords."""
+        assert clean_keywords("창업,상권") == []
+        assert clean_keywords(None) == []
+
+
+class TestBuildKeywordGraph:
+    """Tests for build_keyword_graph."""
+
+    def test_npmi_scores(self):
+        """Test each pair is scored with normalised PMI over posts."""
+        graph = build_keyword_graph(
+            [["창업", "상권"], ["창업", "상권"], ["창업", "메뉴"], ["메뉴", "배달"]],
+            min_doc_freq=1,
+            min_pair_count=1,
+        )
+        assert graph.post_count == 4
+        assert graph.doc_freq["창업"] == 3
+        assert neighbours_of(graph, "상권") == [("창업", npmi(2, 3, 2, 4), 2)]
+        assert neighbours_of(graph, "배달") == [("메뉴", npmi(1, 2, 1, 4), 1)]
+
+    def test_neighbours_strongest_first_and_capped(self):
+        """Test neighbours are ordered by NPMI and cut to max_neighbors."""
+        posts = [["창업", "상권"]] * 2 + [["창업", "메뉴"]] * 2 + [["메뉴"]] * 3
+        posts += [["상권", "배달"]] * 2 + [["배달"]] * 4 + [["기타"]]
+        graph = build_keyword_graph(posts, max_neighbors=1)
+        assert [n for n, _, _ in neighbours_of(graph, "창업")] == ["상권"]
+
+        uncapped = build_keyword_graph(posts)
+        scores = [score for _, score, _ in neighbours_of(uncapped, "창업")]
+        assert scores == sorted(scores, reverse=True) and len(scores) == 2
+
+    def test_thresholds(self):
+        """Test rare keywords and rare pairs are dropped."""
+        posts = [["창업", "상권", "희귀"], ["창업", "메뉴"], ["상권", "메뉴"], ["기타"]]
+        graph = build_keyword_graph(posts)
+        assert "희귀" not in graph.doc_freq
+        # Every pair co-occurs once, below min_pair_count
+        assert graph.neighbors == []
+
+    def test_uninformative_pairs_are_dropped(self):
+        """Test pairs in every post and negatively associated pairs are skipped."""
+        always = build_keyword_graph([["창업", "상권"]] * 3)
+        assert always.neighbors == []
+
+        posts = [["창업", "상권"]] * 2 + [["창업"]] * 4 + [["상권"]] * 4
+        assert build_keyword_graph(posts).neighbors == []
+
+    def test_empty_posts(self):
+        """Test posts without keywords are not counted."""
+        graph = build_keyword_graph(
+            [[], [], ["창업", "상권"], ["창업", "상권"], ["기타"]]
+        )
+        assert graph.post_count == 3
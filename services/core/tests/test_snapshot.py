@@ -0,0 +1,151 @@
+"""
+Tests for the Agent's read-only post snapshot export.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper import generation, snapshot
+
+
+class FakePosts:
+    """Stand-in for the eligible-posts queryset."""
+
+    def __init__(self, posts):
+        self.posts = posts
+
+    def iterator(self, chunk_size):
+        return iter(self.posts)
+
+
+def make_post(post_id, keywords):
+    return SimpleNamespace(
+        post_id=post_id,
+        title=f"제목 {post_id}",
+        get_url=lambda: f"https://cafe.naver.com/cjdckddus/{post_id}",
+        content="본문 " * 600,
+        summary=f"요약 {post_id}",
+        author="창플",
+        updated_at=datetime(2026, 1, 1),
+        keywords=keywords,
+    )
+
+
+@pytest.fixture
+def posts(monkeypatch, fake_redis):
+    """Export three posts whose keywords co-occur."""
+    monkeypatch.setattr(generation, "schedule_snapshot_export", lambda: None)
+    exported = FakePosts(
+        [
+            make_post(1, ["창업", "상권"]),
+            make_post(2, ["창업", "상권", "메뉴"]),
+            make_post(3, ["메뉴"]),
+        ]
+    )
+    monkeypatch.setattr(snapshot, "_eligible_posts", lambda: exported)
+    return exported
+
+
+def read_table(path, query):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+class TestExportPostSnapshot:
+    """Tests for export_post_snapshot."""
+
+    def test_export_publishes_posts_and_pointer(self, tmp_path, posts):
+        """Test the export writes posts, keywords and meta, then the pointer."""
+        result = snapshot.export_post_snapshot(tmp_path)
+
+        assert result["skipped"] is False
+        assert result["post_count"] == 3
+        pointer = snapshot.read_pointer(tmp_path)
+        assert pointer["file"] == result["file"]
+        assert pointer["generation"] == 0
+
+        path = tmp_path / result["file"]
+        assert read_table(path, "SELECT post_id FROM posts ORDER BY post_id") == [
+            (1,),
+            (2,),
+            (3,),
+        ]
+        assert ("창업", 2) in read_table(path, "SELECT keyword, doc_freq FROM keywords")
+        meta = dict(read_table(path, "SELECT key, value FROM meta"))
+        assert meta["generation"] == "0"
+        assert meta["post_count"] == "3"
+
+        # Only the published file and the pointer remain (no temp files)
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+            [result["file"], snapshot.POINTER_FILENAME]
+        )
+
+    def test_current_generation_is_skipped(self, tmp_path, posts):
+        """Test an unchanged generation is not exported again unless forced."""
+        first = snapshot.export_post_snapshot(tmp_path)
+        skipped = snapshot.export_post_snapshot(tmp_path)
+        assert skipped["skipped"] is True
+        assert skipped["file"] == first["file"]
+        forced = snapshot.export_post_snapshot(tmp_path, force=True)
+        assert forced["skipped"] is False
+        # A forced re-export never overwrites the published file in place
+        assert forced["file"] != first["file"]
+
+    def test_new_generation_swaps_pointer(self, tmp_path, posts):
+        """Test a bump publishes a new file while the old one stays readable."""
+        first = snapshot.export_post_snapshot(tmp_path)
+        generation.bump_ingest_generation()
+        second = snapshot.export_post_snapshot(tmp_path)
+
+        assert second["file"] != first["file"]
+        pointer = snapshot.read_pointer(tmp_path)
+        assert (pointer["file"], pointer["generation"]) == (second["file"], 1)
+        # Agents that mapped the previous file can finish reading it
+        assert read_table(tmp_path / first["file"], "SELECT COUNT(*) FROM posts") == [
+            (3,)
+        ]
+        assert not (tmp_path / f".{snapshot.POINTER_FILENAME}.tmp").exists()
+
+    def test_unknown_generation_is_not_exported(self, tmp_path, posts, monkeypatch):
+        """Test nothing is published when Redis cannot report the generation."""
+        monkeypatch.setattr(snapshot, "get_ingest_generation", lambda: None)
+        with pytest.raises(snapshot.SnapshotExportError):
+            snapshot.export_post_snapshot(tmp_path)
+        assert snapshot.read_pointer(tmp_path) is None
+
+    def test_unreadable_pointer(self, tmp_path):
+        """Test a missing or corrupt pointer reads as None."""
+        assert snapshot.read_pointer(tmp_path) is None
+        (tmp_path / snapshot.POINTER_FILENAME).write_text("{not json")
+        assert snapshot.read_pointer(tmp_path) is None
+
+
+class TestPruneOldSnapshots:
+    """Tests for pruning old snapshot files."""
+
+    def test_keeps_newest_files(self, tmp_path):
+        """Test only the `keep` most recently written snapshots survive."""
+        names = [
+            f"{snapshot.SNAPSHOT_PREFIX}{i}{snapshot.SNAPSHOT_SUFFIX}" for i in range(4)
+        ]
+        for age, name in enumerate(reversed(names)):
+            path = tmp_path / name
+            path.write_text("")
+            mtime = 1_700_000_000 - age * 60
+            os.utime(path, (mtime, mtime))
+        (tmp_path / snapshot.POINTER_FILENAME).write_text(
+            json.dumps({"file": names[3]})
+        )
+
+        snapshot._prune_old_snapshots(tmp_path, keep=2)
+
+        remaining = sorted(p.name for p in tmp_path.iterdir())
+        assert remaining == sorted([names[2], names[3], snapshot.POINTER_FILENAME])